@@ -69,7 +69,7 @@ func (md *LoggingMiddleware) LogData(auth *types.Authenticator) error {
 		return fmt.Errorf("failed to push data to central access management")
 	}
 	defer resp.Body.Close()
-	if resp.StatusCode != http.StatusOK && resp.StatusCode != http.StatusCreated {
+	if resp.StatusCode != http.StatusOK && resp.StatusCode != http.StatusCreated && resp.StatusCode != http.StatusAccepted {
 		return fmt.Errorf("failed to push log: server side")
 	}
 	return nil
@@ -20,23 +20,30 @@ type Server struct {
 }
 
 func (srv *Server) FetchServices() *[]types.PublicService {
-	req, err := http.NewRequest("GET", types.CentralDomain+"manager/service/", nil)
-	if err != nil {
-		log.Fatal("ServerStartUp::\n Failed to generate request(fetchServices)")
-	}
-	req.Header.Set("Authorization", "Bearer "+srv.Credentials.Access)
-	resp, err := http.DefaultClient.Do(req)
-	if err != nil {
-		log.Fatal("ServerStartUp::\n Failed to execute request(fetchServices)")
-	}
-	defer resp.Body.Close()
-	body, err := io.ReadAll(resp.Body)
-	if err != nil {
-		log.Fatal("Failed to decode boby (fetchServices)")
-	}
 	var services []types.PublicService
-	if err := json.Unmarshal(body, &services); err != nil {
-		log.Fatal("ServerStartUp::\n Failed to decode response(fetchServices)\n" + err.Error())
+	// the list is paginated, each response names the next page in its Link header
+	next := types.CentralDomain + "manager/service/?page_size=1000"
+	for next != "" {
+		req, err := http.NewRequest("GET", next, nil)
+		if err != nil {
+			log.Fatal("ServerStartUp::\n Failed to generate request(fetchServices)")
+		}
+		req.Header.Set("Authorization", "Bearer "+srv.Credentials.Access)
+		resp, err := http.DefaultClient.Do(req)
+		if err != nil {
+			log.Fatal("ServerStartUp::\n Failed to execute request(fetchServices)")
+		}
+		body, err := io.ReadAll(resp.Body)
+		resp.Body.Close()
+		if err != nil {
+			log.Fatal("Failed to decode boby (fetchServices)")
+		}
+		var page []types.PublicService
+		if err := json.Unmarshal(body, &page); err != nil {
+			log.Fatal("ServerStartUp::\n Failed to decode response(fetchServices)\n" + err.Error())
+		}
+		services = append(services, page...)
+		next = types.NextPage(resp)
 	}
 	return &services
 }
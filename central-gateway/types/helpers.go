@@ -6,6 +6,7 @@ import (
 	"io"
 	"log"
 	"net/http"
+	"strings"
 	"time"
 )
 
@@ -100,3 +101,15 @@ func (c *ManagerLogInCredentials) StartCredentials() {
 	}()
 
 }
+
+// NextPage returns the next page URL named by a list response's Link header, or "" on the last page.
+func NextPage(resp *http.Response) string {
+	for _, link := range strings.Split(resp.Header.Get("Link"), ",") {
+		parts := strings.Split(link, ";")
+		if len(parts) < 2 || strings.TrimSpace(parts[1]) != `rel="next"` {
+			continue
+		}
+		return strings.Trim(strings.TrimSpace(parts[0]), "<>")
+	}
+	return ""
+}
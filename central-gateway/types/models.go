@@ -46,8 +46,13 @@ type ServiceSession struct {
 	EnforceExpiry bool                  `json:"EnforceExpiry"`
 	Expired       bool                  `json:"Expired"`
 }
-type ServiceSessionRequest struct {
+type AuthorizeRequest struct {
+	Service   string `json:"Service"`
+	IpAddress string `json:"IpAddress,omitempty"`
+}
+type AuthorizeResponse struct {
 	Citizen   string `json:"Citizen"`
 	Service   string `json:"Service"`
 	IpAddress string `json:"IpAddress"`
+	Allowed   bool   `json:"Allowed"`
 }
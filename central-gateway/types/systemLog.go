@@ -3,6 +3,7 @@ package types
 import (
 	"bytes"
 	"encoding/json"
+	"errors"
 	"fmt"
 	"io"
 	"log"
@@ -12,11 +13,16 @@ import (
 	"github.com/A3R0-01/Final-Year-Project--Centralized-Access-Management-Gateway/central-gateway/verify"
 )
 
+var (
+	errServiceUnauthorized  = errors.New("service unauthorized")
+	errAuthenticationFailed = errors.New("authentication failed")
+)
+
 type SystemLogInterface interface {
 	Populate(request *http.Request, service map[string]string, managerCredentials *ManagerLogInCredentials) error
 	getCitizen(request *http.Request, managerCredentials *ManagerLogInCredentials) error
 	CheckSessions(managerCredentials *ManagerLogInCredentials, authenticationHeader string) error
-	VerifyService(authenticationHeader string, managerCredentials *ManagerLogInCredentials) error
+	VerifyService(authenticationHeader string) error
 	getSpecialUserId(authenticationHeader string) error
 	SetStatusCode(statusCode int)
 	SetRecordId(id string)
@@ -119,13 +125,17 @@ func (sl *SystemLog) Populate(request *http.Request, service map[string]string,
 	if !isExemptModel(strings.ToLower(sl.Object)) {
 		authenticationHeader := request.Header.Get("Authorization")
 		if sl.Object == "Service" {
-			if err := sl.CheckSessions(managerCredentials, authenticationHeader); err != nil {
-				log.Println("There was an error:\n" + err.Error())
-				err := sl.getCitizen(request, managerCredentials)
-				if err != nil {
-					log.Println(err)
-					return err
-				}
+			// a bearer is authorized in one exchange; without a usable one fall back to the caller's live session
+			err := errAuthenticationFailed
+			if authenticationHeader != "" {
+				err = sl.VerifyService(authenticationHeader)
+			}
+			if err != nil && err != errServiceUnauthorized {
+				err = sl.CheckSessions(managerCredentials, authenticationHeader)
+			}
+			if err != nil {
+				log.Println(err)
+				return err
 			}
 		} else {
 			err := sl.getCitizen(request, managerCredentials)
@@ -183,9 +193,6 @@ func (sl *SystemLog) getCitizen(request *http.Request, managerCredentials *Manag
 		return err
 	}
 	sl.Citizen = user.PublicId
-	if sl.Object == "Service" {
-		return sl.VerifyService(authenticationHeader, managerCredentials)
-	}
 	return nil
 }
 
@@ -216,19 +223,23 @@ func (sl *SystemLog) getSpecialUserId(authenticationHeader string) error {
 	sl.SpecialUserId = user.PublicId
 	return nil
 }
-func (sl *SystemLog) VerifyService(authenticationHeader string, managerCredentials *ManagerLogInCredentials) error {
+
+// VerifyService asks the central server to authorize the bearer for the service in a single
+// POST authorize/, which also resolves the citizen and opens or refreshes their session.
+func (sl *SystemLog) VerifyService(authenticationHeader string) error {
 	if sl.RecordId == "" {
 		return fmt.Errorf("service error")
 	}
 
-	session := ServiceSessionRequest{
-		Citizen:   sl.Citizen,
-		Service:   sl.RecordId,
-		IpAddress: sl.IpAddress,
-	}
-	// fmt.Println(session)
-	// fmt.Println("log: " + CentralDomain + "service/" + sl.RecordId)
-	req, err := http.NewRequest("GET", CentralDomain+"service/"+sl.RecordId+"/", nil)
+	authorize := AuthorizeRequest{Service: sl.RecordId}
+	if sl.IpAddress != "unknown" {
+		authorize.IpAddress = sl.IpAddress
+	}
+	authorizeJson, err := json.Marshal(authorize)
+	if err != nil {
+		return fmt.Errorf("failed to create authorize request")
+	}
+	req, err := http.NewRequest("POST", CentralDomain+"authorize/", bytes.NewBuffer(authorizeJson))
 	if err != nil {
 		return err
 	}
@@ -239,32 +250,21 @@ func (sl *SystemLog) VerifyService(authenticationHeader string, managerCredentia
 		return err
 	}
 	defer resp.Body.Close()
-	if resp.StatusCode == http.StatusNotFound {
-		return fmt.Errorf("service unauthorized")
+	if resp.StatusCode == http.StatusForbidden {
+		_, _ = io.Copy(io.Discard, resp.Body)
+		return errServiceUnauthorized
 	} else if resp.StatusCode != http.StatusOK {
-		return fmt.Errorf("authentication failed")
-	}
-	sessionJson, err := json.Marshal(session)
-	if err != nil {
-		return fmt.Errorf("Failed to create Session: 0")
+		_, _ = io.Copy(io.Discard, resp.Body)
+		return errAuthenticationFailed
 	}
-	sessionReq, err := http.NewRequest("POST", CentralDomain+"manager/session/", bytes.NewBuffer(sessionJson))
-	if err != nil {
-		return fmt.Errorf("Failed to create Session: 1")
+	var decision AuthorizeResponse
+	if err := json.NewDecoder(resp.Body).Decode(&decision); err != nil {
+		return fmt.Errorf("authorize decoding failed")
 	}
-	sessionReq.Header.Set("Content-Type", "application/json")
-	sessionReq.Header.Set("Authorization", "Bearer "+managerCredentials.Access)
-	resp, err = http.DefaultClient.Do(sessionReq)
-	if err != nil {
-		log.Println("Failed To Create Session: 2")
-		return fmt.Errorf("Failed To Create Session: 2")
-	}
-	defer resp.Body.Close()
-	_, _ = io.Copy(io.Discard, resp.Body) // important!
-	if resp.StatusCode != http.StatusOK && resp.StatusCode != http.StatusCreated {
-		log.Println("Failed To Create Session: 2 service unauthorised: " + managerCredentials.Access)
-		return fmt.Errorf("service unauthorized")
+	if !decision.Allowed {
+		return errServiceUnauthorized
 	}
+	sl.Citizen = decision.Citizen
 	return nil
 }
 
@@ -274,22 +274,6 @@ func (sl *SystemLog) CheckSessions(managerCredentials *ManagerLogInCredentials,
 		return fmt.Errorf("service error")
 	}
 
-	req, err := http.NewRequest("GET", CentralDomain+"service/"+sl.RecordId+"/", nil)
-	if err != nil {
-		return err
-	}
-	req.Header.Set("Content-Type", "application/json")
-	req.Header.Set("Authorization", authenticationHeader)
-	resp1, err := http.DefaultClient.Do(req)
-	if err != nil {
-		return err
-	}
-	defer resp1.Body.Close()
-	if resp1.StatusCode == http.StatusOK || resp1.StatusCode == http.StatusFound {
-		return nil
-	} else if resp1.StatusCode == http.StatusNotFound {
-		return fmt.Errorf("Authentication failed")
-	}
 	if sl.IpAddress == "unknown" || sl.IpAddress == "" {
 		return fmt.Errorf("Authentication Failed")
 	}
@@ -0,0 +1,206 @@
+import uuid
+from datetime import datetime, time
+from decimal import Decimal, InvalidOperation
+from django.db import models
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework.exceptions import ValidationError
+
+COMPARISONS = ('gt', 'gte', 'lt', 'lte')
+TEXT_SEARCHES = ('iexact', 'icontains', 'istartswith')
+
+def parse_unquoted_list(value: str) -> list[str]:
+    """`[a, b]` or `a,b` as ['a', 'b']."""
+    value = value.strip('[]').strip()
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+def parse_uuid(value: str) -> uuid.UUID:
+    try:
+        return uuid.UUID(value)
+    except (ValueError, AttributeError):
+        raise ValueError('Expected a UUID')
+
+def parse_boolean(value: str) -> bool:
+    lowered = value.strip().lower()
+    if lowered in ('true', '1'):
+        return True
+    if lowered in ('false', '0'):
+        return False
+    raise ValueError('Expected true or false')
+
+def parse_integer(value: str) -> int:
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError('Expected an integer')
+
+def parse_number(value: str) -> float:
+    try:
+        return float(value)
+    except ValueError:
+        raise ValueError('Expected a number')
+
+def parse_decimal(value: str) -> Decimal:
+    try:
+        return Decimal(value)
+    except InvalidOperation:
+        raise ValueError('Expected a number')
+
+def parse_moment(value: str) -> datetime:
+    """An ISO 8601 datetime, or a date standing for its midnight, made aware in the current timezone."""
+    moment = parse_datetime(value)
+    if moment is None:
+        day = parse_date(value)
+        if day is None:
+            raise ValueError('Expected an ISO 8601 date or datetime')
+        moment = datetime.combine(day, time.min)
+    return timezone.make_aware(moment) if timezone.is_naive(moment) else moment
+
+def parse_day(value: str):
+    day = parse_date(value)
+    if day is None:
+        raise ValueError('Expected an ISO 8601 date')
+    return day
+
+def parse_text(value: str) -> str:
+    return value
+
+def parse_many(parse):
+    def parse_list(value: str) -> list:
+        return [parse(item) for item in parse_unquoted_list(value)]
+    return parse_list
+
+def parse_choice(parse, choices: set):
+    def parse_choice_value(value: str):
+        parsed = parse(value)
+        if parsed not in choices:
+            raise ValueError(f'Expected one of {", ".join(sorted(str(choice) for choice in choices))}')
+        return parsed
+    return parse_choice_value
+
+def field_parser(field: models.Field):
+    """The parser for values of `field` and whether it orders (takes gt/lt), or (None, False) when it is not filterable."""
+    if isinstance(field, models.UUIDField):
+        return parse_uuid, False
+    if isinstance(field, models.BooleanField):
+        return parse_boolean, False
+    if isinstance(field, models.DateTimeField):
+        return parse_moment, True
+    if isinstance(field, models.DateField):
+        return parse_day, True
+    if isinstance(field, models.IntegerField):
+        return parse_integer, True
+    if isinstance(field, models.FloatField):
+        return parse_number, True
+    if isinstance(field, models.DecimalField):
+        return parse_decimal, True
+    if isinstance(field, (models.CharField, models.TextField)):
+        return parse_text, False
+    return None, False
+
+def indexed_fields(model) -> set[str]:
+    """Fields a btree lookup can start from: keys, db_index fields and the leading field of every index or unique constraint."""
+    names = {field.name for field in model._meta.concrete_fields if field.primary_key or field.unique or field.db_index}
+    for index in model._meta.indexes:
+        if index.fields:
+            names.add(index.fields[0].lstrip('-'))
+    for constraint in model._meta.constraints:
+        if isinstance(constraint, models.UniqueConstraint) and constraint.fields:
+            names.add(constraint.fields[0])
+    return names
+
+class FilterPlan:
+    """The query parameters a viewset filters on, compiled once from its model.
+
+    Every accepted parameter maps straight to an ORM lookup and a parser, so a
+    request costs one dict lookup per parameter. Relations filter by the related
+    PublicId only (`Citizen=<uuid>` or `Citizen__PublicId=<uuid>`), plus the
+    multi-hop paths listed in `relations` (`Association__Department=<uuid>`);
+    `exclude`d fields and the internal id not at all. With `indexed_only` (the
+    big log tables) text filters by exact value only, and a field that leads no
+    index only next to a filter on one that does, so no filter scans every row.
+
+    A parameter naming a field with anything else is rejected with a 400;
+    parameters naming no field (cursor, page_size, q) are left to the view.
+    """
+
+    def __init__(self, model, indexed_only: bool = False, exclude: tuple = (), relations: tuple = ()):
+        self.model = model
+        self.indexed_only = indexed_only
+        # parameter -> (ORM lookup, parser, whether the lookup starts from an index)
+        self.filters : dict[str, tuple[str, callable, bool]] = {}
+        self.unsupported : dict[str, str] = {}
+        indexed = indexed_fields(model) if indexed_only else None
+        for field in [*model._meta.concrete_fields, *model._meta.many_to_many]:
+            if field.primary_key or field.name in exclude:
+                self.unsupported[field.name] = f'Filtering on {field.name} is not supported'
+                continue
+            self.unsupported[field.name] = f'Unsupported lookup on {field.name}'
+            isIndexed = indexed is None or field.name in indexed
+            if field.is_relation:
+                self.add_relation(field.name, field.related_model, isIndexed)
+            else:
+                self.add_field(field, isIndexed)
+            if field.null:
+                self.add(f'{field.name}__isnull', f'{field.name}__isnull', parse_boolean, isIndexed)
+        for path in relations:
+            self.add_relation(path, self.related_model(path), indexed is None or path.partition('__')[0] in indexed)
+
+    def related_model(self, path: str):
+        model = self.model
+        for name in path.split('__'):
+            model = model._meta.get_field(name).related_model
+        return model
+
+    def add(self, key: str, lookup: str, parse, isIndexed: bool = True):
+        self.filters[key] = (lookup, parse, isIndexed)
+
+    def add_relation(self, path: str, relatedModel, isIndexed: bool):
+        if not any(related.name == 'PublicId' for related in relatedModel._meta.concrete_fields):
+            return
+        for key in (path, f'{path}__PublicId'):
+            self.add(key, f'{path}__PublicId', parse_uuid, isIndexed)
+            self.add(f'{key}__in', f'{path}__PublicId__in', parse_many(parse_uuid), isIndexed)
+
+    def add_field(self, field, isIndexed: bool):
+        parse, ordered = field_parser(field)
+        if parse is None:
+            return
+        if field.choices:
+            parse = parse_choice(parse, {value for value, _ in field.flatchoices})
+        self.add(field.name, field.name, parse, isIndexed)
+        if parse is not parse_boolean:
+            self.add(f'{field.name}__in', f'{field.name}__in', parse_many(parse), isIndexed)
+        if ordered:
+            for lookup in COMPARISONS:
+                self.add(f'{field.name}__{lookup}', f'{field.name}__{lookup}', parse, isIndexed)
+        if not self.indexed_only and parse is parse_text:
+            for lookup in TEXT_SEARCHES:
+                self.add(f'{field.name}__{lookup}', f'{field.name}__{lookup}', parse, isIndexed)
+
+    def queries(self, params) -> dict:
+        """ORM filter kwargs for the filtering parameters among `params`; raises a ValidationError listing bad ones."""
+        queries, errors, unindexed = {}, {}, []
+        anyIndexed = False
+        for key, value in params.items():
+            compiled = self.filters.get(key)
+            if compiled is None:
+                field = key.partition('__')[0]
+                if field in self.unsupported:
+                    errors[key] = self.unsupported[field]
+                continue
+            lookup, parse, isIndexed = compiled
+            try:
+                queries[lookup] = parse(value)
+            except ValueError as error:
+                errors[key] = str(error)
+            if isIndexed:
+                anyIndexed = True
+            else:
+                unindexed.append(key)
+        if unindexed and not anyIndexed:
+            for key in unindexed:
+                errors[key] = f'{key} is not indexed, combine it with a filter on an indexed field such as Created'
+        if errors:
+            raise ValidationError(errors)
+        return queries
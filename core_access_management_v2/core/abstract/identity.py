@@ -0,0 +1,159 @@
+from collections import OrderedDict
+from threading import Lock
+import time
+import uuid
+from django.apps import apps
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save
+from prometheus_client import Counter, Gauge
+from rest_framework.serializers import SlugRelatedField
+
+identity_cache_hits = Counter('core_access_identity_cache_hits_total', 'PublicIds resolved from the in-process identity cache', ['model'])
+identity_cache_misses = Counter('core_access_identity_cache_misses_total', 'PublicIds resolved against the database', ['model'])
+identity_cache_size = Gauge('core_access_identity_cache_size', 'Entries held by the identity cache', ['model'])
+
+# models resolved by PublicId, with the fields their nested response serializers read
+IDENTITY_FIELDS = {
+    'citizen.Citizen': ('UserName', 'Email', 'FirstName', 'SecondName', 'NationalId'),
+    'publicService.PublicService': ('Title', 'MachineName', 'URL'),
+    'grantee.Grantee': (),
+    'administrator.Administrator': (),
+}
+
+class IdentityCache:
+    """Bounded TTL + LRU map of PublicId -> (pk, a few display fields) for one model.
+
+    PublicIds never change, so an entry only goes stale when its row is saved
+    or deleted; both signals drop it here and the TTL bounds how long another
+    process can keep serving it. Lookups hand out fresh instances holding just
+    the cached fields, anything else loads on access like a deferred field.
+    """
+
+    def __init__(self, label: str, fields: tuple = (), maxsize: int = 50000, ttl: float = 300.0, clock=time.monotonic):
+        self.label = label
+        self.fields = fields
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.clock = clock
+        self.entries : OrderedDict = OrderedDict()
+        self.by_pk : dict = {}
+        self.lock = Lock()
+        # bumped by every invalidation so a row read before it is not stored after it
+        self.generation = 0
+
+    @property
+    def model(self):
+        return apps.get_model(self.label)
+
+    @property
+    def enabled(self) -> bool:
+        return self.maxsize > 0 and self.ttl > 0
+
+    def instance(self, publicId: uuid.UUID, values: tuple):
+        model = self.model
+        known = dict(zip(('id', 'PublicId', *self.fields), (values[0], publicId, *values[1:])))
+        # from_db wants the values in model field order
+        names = [field.attname for field in model._meta.concrete_fields if field.attname in known]
+        return model.from_db(model._default_manager.db, names, [known[name] for name in names])
+
+    def resolve(self, publicId):
+        """The instance with this PublicId, or None when there is none."""
+        publicId = publicId if isinstance(publicId, uuid.UUID) else uuid.UUID(str(publicId))
+        return self.resolve_many([publicId]).get(publicId)
+
+    def resolve_many(self, publicIds, confirm: bool = False) -> dict:
+        """{PublicId: instance} for the PublicIds that exist, with one query for all misses.
+
+        With `confirm` the hits are checked against the table in one more query,
+        for callers that write the pks and cannot afford one another process deleted.
+        """
+        wanted = set(publicIds)
+        found, missing = {}, []
+        now = self.clock()
+        with self.lock:
+            generation = self.generation
+            for publicId in wanted:
+                entry = self.entries.get(publicId)
+                if entry is not None and entry[0] > now:
+                    self.entries.move_to_end(publicId)
+                    found[publicId] = self.instance(publicId, entry[1])
+                else:
+                    missing.append(publicId)
+        identity_cache_hits.labels(self.label).inc(len(found))
+        if confirm and found:
+            self.confirm(found)
+        if not missing:
+            return found
+        identity_cache_misses.labels(self.label).inc(len(missing))
+        rows = self.model._default_manager.filter(PublicId__in=missing).values_list('PublicId', 'id', *self.fields)
+        loaded = {row[0]: row[1:] for row in rows}
+        for publicId, values in loaded.items():
+            found[publicId] = self.instance(publicId, values)
+        if self.enabled:
+            self.store(loaded, now, generation)
+        return found
+
+    def confirm(self, found: dict):
+        """Drop from `found`, and from the cache, the entries whose row no longer exists."""
+        existing = set(self.model._default_manager.filter(pk__in=[instance.pk for instance in found.values()]).values_list('id', flat=True))
+        for publicId, instance in list(found.items()):
+            if instance.pk not in existing:
+                del found[publicId]
+                self.invalidate(instance.pk)
+
+    def store(self, loaded: dict, now: float, generation: int):
+        with self.lock:
+            if generation != self.generation:
+                return
+            for publicId, values in loaded.items():
+                self.entries[publicId] = (now + self.ttl, values)
+                self.entries.move_to_end(publicId)
+                self.by_pk[values[0]] = publicId
+            while len(self.entries) > self.maxsize:
+                publicId, (_, values) = self.entries.popitem(last=False)
+                self.by_pk.pop(values[0], None)
+            identity_cache_size.labels(self.label).set(len(self.entries))
+
+    def invalidate(self, pk):
+        with self.lock:
+            self.generation += 1
+            publicId = self.by_pk.pop(pk, None)
+            if publicId is not None:
+                self.entries.pop(publicId, None)
+            identity_cache_size.labels(self.label).set(len(self.entries))
+
+    def clear(self):
+        with self.lock:
+            self.generation += 1
+            self.entries.clear()
+            self.by_pk.clear()
+            identity_cache_size.labels(self.label).set(0)
+
+identities = {label: IdentityCache(label, fields, **getattr(settings, 'IDENTITY_CACHE', {})) for label, fields in IDENTITY_FIELDS.items()}
+
+def identity(model) -> IdentityCache:
+    return identities[model._meta.label]
+
+def drop_identity(sender, instance, **kwargs):
+    identity(sender).invalidate(instance.pk)
+
+for label in IDENTITY_FIELDS:
+    post_save.connect(drop_identity, sender=label, dispatch_uid=f'identity-save-{label}')
+    post_delete.connect(drop_identity, sender=label, dispatch_uid=f'identity-delete-{label}')
+
+class IdentityRelatedField(SlugRelatedField):
+    """A PublicId SlugRelatedField resolved through the identity cache. The queryset
+    is only used for the model, so it must be the unfiltered default one."""
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault('slug_field', 'PublicId')
+        super().__init__(**kwargs)
+
+    def to_internal_value(self, data):
+        try:
+            instance = identity(self.get_queryset().model).resolve(data)
+        except (TypeError, ValueError):
+            self.fail('invalid')
+        if instance is None:
+            self.fail('does_not_exist', slug_name=self.slug_field, value=str(data))
+        return instance
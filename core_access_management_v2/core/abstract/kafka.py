@@ -1,5 +1,5 @@
 from kafka import KafkaConsumer
 
-def NewKafkaConsumer(topic: str, group_id : str, auto_offset_reset : str = 'earliest', enable_auto_commit : bool = True, *args, **kwargs) -> KafkaConsumer:
-    consumer = KafkaConsumer(**kwargs)
-    return consumer
\ No newline at end of file
+def NewKafkaConsumer(topic: str, group_id : str, auto_offset_reset : str = 'earliest', enable_auto_commit : bool = False, *args, **kwargs) -> KafkaConsumer:
+    consumer = KafkaConsumer(topic, group_id=group_id, auto_offset_reset=auto_offset_reset, enable_auto_commit=enable_auto_commit, **kwargs)
+    return consumer
@@ -0,0 +1,58 @@
+import ipaddress
+
+def normalize_ip(ip_str):
+    try:
+        ip = ipaddress.ip_address(ip_str)
+        # Convert IPv6 loopback (::1) to IPv4 loopback
+        if ip.is_loopback and ip.version == 6:
+            return "127.0.0.1"
+
+        # Convert IPv6-mapped IPv4 (::ffff:x.x.x.x) to x.x.x.x
+        if ip.version == 6 and ip.ipv4_mapped:
+            return str(ip.ipv4_mapped)
+
+        # Return the normalized IP string (IPv4 or IPv6)
+        return str(ip)
+    except ValueError:
+        # Invalid IP, return as-is
+        return ip_str
+
+def get_client_ip(request):
+    # Check for X-Forwarded-For header first (standard for proxies)
+    ip = request.META.get('HTTP_X_FORWARDED_FOR')
+    if ip:
+        # X-Forwarded-For can contain multiple IPs (client, proxy1, proxy2, ...)
+        # The first one is the original client IP
+        ips = [x.strip() for x in ip.split(',')]
+        if ips:
+            return ips[0]
+
+    # Try other common headers
+    ip = request.META.get('HTTP_X_REAL_IP')
+    if ip:
+        return ip
+
+    # Try X-Client-IP (used by some CDNs and proxies)
+    ip = request.META.get('HTTP_X_CLIENT_IP')
+    if ip:
+        return ip
+
+    # Use REMOTE_ADDR as fallback
+    remote_addr = request.META.get('REMOTE_ADDR')
+    if remote_addr:
+        # REMOTE_ADDR includes port, so we need to strip it
+        # The format is usually 'IP_ADDRESS:PORT'
+        if ':' in remote_addr:
+            try:
+                host, port = remote_addr.rsplit(':', 1)
+                # Check if it's an IPv6 address that includes colons
+                if '[' in host and ']' in host: # IPv6 literal
+                    return host.strip('[]')
+                else: # IPv4 or simple hostname
+                    return host
+            except ValueError:
+                # Fallback if splitting fails for some reason
+                return remote_addr
+        return remote_addr
+
+    return "unknown"
@@ -0,0 +1,128 @@
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from collections import OrderedDict
+from datetime import datetime
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+class KeysetPagination(BasePagination):
+    """Newest-first pages keyed on (Created, id).
+
+    The cursor is the (Created, id) of the last row served, so each page is
+    one index range scan of `WHERE (Created, id) < cursor ORDER BY Created
+    DESC, id DESC LIMIT n` no matter how deep the client pages, and rows
+    written meanwhile never shift a page. A view with `get_keyset()` can
+    lead with another key, e.g. ('Rank', 'Created', 'pk') for ranked search
+    results. A view with `older_rows(before, limit, since)` has rows kept
+    outside the queryset (the log archive) merged into its (Created, id)
+    pages; `since` bounds them to the span of a page the queryset filled.
+    """
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    page_size = 100
+    max_page_size = 1000
+    invalid_cursor_message = 'Invalid cursor'
+    default_keyset = ('Created', 'pk')
+    keyset_parsers = {'Created': parse_datetime, 'LastSeen': parse_datetime, 'Bucket': parse_datetime, 'pk': int, 'Rank': float}
+
+    def get_page_size(self, request) -> int:
+        try:
+            size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except (TypeError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def get_keyset(self, view) -> tuple:
+        return view.get_keyset() if hasattr(view, 'get_keyset') else self.default_keyset
+
+    def encode_cursor(self, instance) -> str:
+        values = [getattr(instance, key) for key in self.keyset]
+        text = '|'.join(value.isoformat() if isinstance(value, datetime) else repr(value) for value in values)
+        return urlsafe_b64encode(text.encode()).decode().rstrip('=')
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            parts = urlsafe_b64decode(encoded + '=' * (-len(encoded) % 4)).decode().split('|')
+            if len(parts) != len(self.keyset):
+                raise ValueError()
+            cursor = tuple(self.keyset_parsers[key](part) for key, part in zip(self.keyset, parts))
+        except (TypeError, ValueError, UnicodeDecodeError):
+            raise ValidationError({self.cursor_query_param: self.invalid_cursor_message})
+        if None in cursor:
+            raise ValidationError({self.cursor_query_param: self.invalid_cursor_message})
+        return cursor
+
+    def after_cursor(self, queryset, cursor: tuple):
+        # the plain bound on the leading key keeps the scan on the index (and prunes partitions); the ORs break ties
+        keys = self.keyset
+        condition = Q()
+        for index, key in enumerate(keys):
+            condition |= Q(**dict(zip(keys[:index], cursor[:index])), **{f'{key}__lt': cursor[index]})
+        return queryset.filter(**{f'{keys[0]}__lte': cursor[0]}).filter(condition)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.size = self.get_page_size(request)
+        self.keyset = self.get_keyset(view)
+        cursor = self.decode_cursor(request)
+        queryset = queryset.order_by(*[f'-{key}' for key in self.keyset])
+        if cursor is not None:
+            queryset = self.after_cursor(queryset, cursor)
+        rows = list(queryset[:self.size + 1])
+        older = getattr(view, 'older_rows', None)
+        if older is not None and self.keyset == KeysetPagination.default_keyset:
+            rows = self.merge(rows, older(cursor, self.size + 1, rows[-1].Created if len(rows) > self.size else None))
+        self.has_next = len(rows) > self.size
+        self.page = rows[:self.size]
+        return self.page
+
+    def merge(self, rows: list, others: list) -> list:
+        """The first page_size + 1 of `rows` and `others` together in (Created, id) order; a row in both is kept once."""
+        seen = {row.pk for row in rows}
+        merged = [*rows, *(row for row in others if row.pk not in seen)]
+        merged.sort(key=lambda row: (row.Created, row.pk), reverse=True)
+        return merged[:self.size + 1]
+
+    def get_next_link(self) -> str | None:
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.page[-1]))
+
+    def get_headers(self) -> dict:
+        next = self.get_next_link()
+        return {'Link': f'<{next}>; rel="next"'} if next else {}
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('results', data),
+        ]), headers=self.get_headers())
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+class LinkKeysetPagination(KeysetPagination):
+    """The default for AbstractModelViewSet lists: newest first on the primary key,
+    which every table indexes, with the page as the bare JSON array clients
+    already read and the next page in a `Link: <url>; rel="next"` header."""
+    default_keyset = ('pk',)
+
+    def get_paginated_response(self, data):
+        return Response(data, headers=self.get_headers())
+
+    def get_paginated_response_schema(self, schema):
+        return schema
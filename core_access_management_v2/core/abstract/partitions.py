@@ -0,0 +1,103 @@
+from datetime import date, datetime, timedelta
+from django.db import connection as default_connection, transaction
+from django.utils import timezone
+
+class DailyPartitions:
+    """Day partitions (UTC) of a PostgreSQL table partitioned BY RANGE on a timestamp column.
+
+    Partitions are named <table>_pYYYYMMDD. When the table has a <table>_default
+    partition, creating a day whose rows already landed in the default moves
+    them into the new partition before it is attached.
+    """
+
+    def __init__(self, table: str, column: str = 'Created', connection=None):
+        self.table = table
+        self.column = column
+        self.connection = connection or default_connection
+
+    def quote(self, name: str) -> str:
+        return self.connection.ops.quote_name(name)
+
+    def partition_name(self, day: date) -> str:
+        return f'{self.table}_p{day:%Y%m%d}'
+
+    @property
+    def default_name(self) -> str:
+        return f'{self.table}_default'
+
+    def bounds(self, day: date) -> tuple[str, str]:
+        return f'{day.isoformat()} 00:00:00+00', f'{(day + timedelta(days=1)).isoformat()} 00:00:00+00'
+
+    def partitions(self) -> dict[date, str]:
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT child.relname FROM pg_inherits '
+                'JOIN pg_class parent ON parent.oid = pg_inherits.inhparent '
+                'JOIN pg_class child ON child.oid = pg_inherits.inhrelid '
+                'WHERE parent.relname = %s',
+                [self.table]
+            )
+            names = [row[0] for row in cursor.fetchall()]
+        prefix = f'{self.table}_p'
+        return {datetime.strptime(name[len(prefix):], '%Y%m%d').date(): name for name in names if name.startswith(prefix)}
+
+    def has_default(self, cursor) -> bool:
+        cursor.execute('SELECT to_regclass(%s) IS NOT NULL', [self.quote(self.default_name)])
+        return cursor.fetchone()[0]
+
+    def default_days(self) -> list[date]:
+        """Days (UTC) with rows in the default partition, e.g. loaded before their partition existed."""
+        with self.connection.cursor() as cursor:
+            if not self.has_default(cursor):
+                return []
+            cursor.execute(f"SELECT DISTINCT ({self.quote(self.column)} AT TIME ZONE 'UTC')::date FROM {self.quote(self.default_name)}")
+            return [row[0] for row in cursor.fetchall()]
+
+    def create(self, day: date):
+        table, partition, column = self.quote(self.table), self.quote(self.partition_name(day)), self.quote(self.column)
+        start, end = self.bounds(day)
+        with transaction.atomic(using=self.connection.alias), self.connection.cursor() as cursor:
+            cursor.execute('SELECT to_regclass(%s) IS NOT NULL', [partition])
+            if cursor.fetchone()[0]:
+                return
+            moving = False
+            if self.has_default(cursor):
+                default = self.quote(self.default_name)
+                cursor.execute(f'SELECT EXISTS (SELECT 1 FROM {default} WHERE {column} >= %s AND {column} < %s)', [start, end])
+                moving = cursor.fetchone()[0]
+            if not moving:
+                cursor.execute(f'CREATE TABLE {partition} PARTITION OF {table} FOR VALUES FROM (%s) TO (%s)', [start, end])
+                return
+            cursor.execute(f'CREATE TABLE {partition} (LIKE {table} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)')
+            cursor.execute(
+                f'WITH moved AS (DELETE FROM {default} WHERE {column} >= %s AND {column} < %s RETURNING *) '
+                f'INSERT INTO {partition} SELECT * FROM moved',
+                [start, end]
+            )
+            cursor.execute(f'ALTER TABLE {table} ATTACH PARTITION {partition} FOR VALUES FROM (%s) TO (%s)', [start, end])
+
+    def ensure(self, days):
+        for day in sorted(set(days)):
+            self.create(day)
+
+    def ensure_ahead(self, days_ahead: int, today: date | None = None):
+        """Make sure today's partition and the next `days_ahead` exist."""
+        today = today or timezone.now().date()
+        self.ensure(today + timedelta(days=offset) for offset in range(days_ahead + 1))
+
+    def drop_before(self, before: date, detach_only: bool = False, on_remove=None) -> list[str]:
+        """Detach every day partition older than `before` and drop it unless `detach_only`,
+        which leaves it behind as a standalone table. `on_remove(day, name)` runs first for
+        each, e.g. to archive it; if it raises, the partition stays. Returns the partition names."""
+        removed = []
+        for day, name in sorted(self.partitions().items()):
+            if day >= before:
+                continue
+            if on_remove is not None:
+                on_remove(day, name)
+            with self.connection.cursor() as cursor:
+                cursor.execute(f'ALTER TABLE {self.quote(self.table)} DETACH PARTITION {self.quote(name)}')
+                if not detach_only:
+                    cursor.execute(f'DROP TABLE {self.quote(name)}')
+            removed.append(name)
+        return removed
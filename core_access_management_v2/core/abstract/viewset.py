@@ -7,6 +7,8 @@ from rest_framework.exceptions import NotFound, ValidationError as Validation2
 from django.core.exceptions import ObjectDoesNotExist, ValidationError
 from .serializers import AbstractModelSerializer
 from .models import AbstractManager
+from .filters import FilterPlan
+from .pagination import LinkKeysetPagination
 from .authenticationClasses import IsSiteManager, IsAdministrator, IsGrantee
 from pprint import pprint
 from django.db.utils import IntegrityError
@@ -16,6 +18,11 @@ class AbstractModelViewSet(ModelViewSet):
     permission_classes = (IsAuthenticatedOrReadOnly,)
     http_method_names = ['get', 'post', 'patch']
     serializer_class : AbstractModelSerializer = AbstractModelSerializer
+    pagination_class = LinkKeysetPagination
+    # query parameters filter through a FilterPlan, see core.abstract.filters
+    filter_indexed_only : bool = False
+    filter_exclude : tuple = ('password',)
+    filter_relations : tuple = ()
 
     def get_object(self):
         id = self.kwargs['pk']
@@ -26,36 +33,18 @@ class AbstractModelViewSet(ModelViewSet):
         self.check_object_permissions(self.request, obj)
         return obj
 
-    def get_query_keys(self) -> list[str]:
-        query_params = self.request.GET
-        query_list = list(query_params.keys())
-        return query_list
-
-    def get_model_attributes(self):
-        model_fields = self.serializer_class.Meta.model._meta.get_fields()
-        attribute_list = [field.name for field in model_fields if field.concrete]
-        return attribute_list
+    @classmethod
+    def filter_plan(cls) -> FilterPlan:
+        # compiled on first use and kept on the class; a subclass gets its own
+        plan = cls.__dict__.get('compiled_filter_plan')
+        if plan is None:
+            plan = FilterPlan(cls.serializer_class.Meta.model, cls.filter_indexed_only, cls.filter_exclude, cls.filter_relations)
+            cls.compiled_filter_plan = plan
+        return plan
 
     def get_queries(self) -> dict:
-        model_attributes = self.get_model_attributes()
-        key_words = {}
-        for query in self.get_query_keys() :
-            for attribute in model_attributes:
-                if attribute in query: 
-                    value = self.request.query_params.get(query)
-                    if "__in" in query:
-                        value = self.parse_unquoted_list(value)
-                    key_words[query] = value
-        return key_words
-    
-    def parse_unquoted_list(self, s:str):
-        # Remove square brackets and strip whitespace
-        s = s.strip("[]").strip()
-
-        # Split on comma and strip each part
-        elements = [item.strip() for item in s.split(",") if item.strip()]
-
-        return elements
+        return self.filter_plan().queries(self.request.query_params)
+
     def get_queryset(self):
         queries = self.get_queries()
         return self.serializer_class.Meta.model.objects.filter(**queries)
@@ -1,8 +1,28 @@
-from django.db import models
+from django.db import models, connections
+from django.db.models import F, Func, Value, Q
+from django.db.models.functions import Cast, Coalesce, Greatest
+from django.contrib.postgres.fields import DateTimeRangeField
+from django.contrib.postgres.indexes import GinIndex, GistIndex
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector, TrigramWordSimilarity
 from django.utils import timezone
+from datetime import datetime
+from functools import cache
+import re
+import uuid
 from core.abstract.models import AbstractManager, AbstractModel
+from core.abstract.partitions import DailyPartitions
 
-class PermissionsManager(AbstractManager):
+def permission_window() -> Func:
+    """The inclusive [StartTime, EndTime] window as a tstzrange, matching the GiST index on AbstractPermission."""
+    return Func(F('StartTime'), F('EndTime'), Value('[]'), function='tstzrange', output_field=DateTimeRangeField())
+
+class PermissionsQuerySet(models.QuerySet):
+
+    def active_at(self, ts: datetime | None = None):
+        ts = ts or timezone.now()
+        return self.alias(Window=permission_window()).filter(Window__contains=ts)
+
+class PermissionsManager(AbstractManager.from_queryset(PermissionsQuerySet)):
 
     pass
 
@@ -14,6 +34,13 @@ class AbstractPermission(AbstractModel):
     EndTime = models.DateTimeField()
 
     objects = PermissionsManager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['EndTime', 'StartTime'], name='abstractpermission_window_idx'),
+            GistIndex(permission_window(), name='abstractpermission_window_gist'),
+        ]
+
     @property
     def all_citizens(self):
         citizens : list[str] = []
@@ -33,20 +60,101 @@ class AbstractPermission(AbstractModel):
     def __str__(self):
         return f'\n\tName: {self.Name}, \n\tPermissionOpen: {self.permission_open}, \n\tCitizens: {self.Citizens}'
 
-class AbstractLogManager(AbstractManager):
-    
-    pass
+def log_search_vector() -> SearchVector:
+    """Message, Object and RecordId as one 'simple' tsvector, matching the GIN index on AbstractLogModel."""
+    return SearchVector('Message', 'Object', 'RecordId', config='simple')
+
+class ILike(Func):
+    """`column ILIKE pattern`, the form a pg_trgm GIN index serves (Django's icontains wraps the column in UPPER)."""
+    template = '%(expressions)s'
+    arg_joiner = ' ILIKE '
+    output_field = models.BooleanField()
+
+@cache
+def trigram_installed(alias: str) -> bool:
+    """Whether pg_trgm and so the trigram indexes of systemLog migration 0005 exist."""
+    with connections[alias].cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+        return cursor.fetchone() is not None
+
+def search_terms(q: str) -> tuple[list[str], list[str], bool]:
+    """The (positive terms, negated terms, whether `or` is used) of a web search query; a quoted phrase is one term."""
+    positive, negative, alternatives = [], [], False
+    for negated, phrase, word in re.findall(r'(-?)(?:"([^"]*)"?|(\S+))', q):
+        term = (phrase or word).strip()
+        if not term:
+            continue
+        if not negated and word.lower() == 'or':
+            alternatives = True
+        elif negated:
+            negative.append(term)
+        else:
+            positive.append(term)
+    return positive, negative, alternatives
+
+def like_pattern(term: str) -> Value:
+    return Value('%' + term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%')
+
+class LogQuerySet(models.QuerySet):
+
+    def search(self, q: str):
+        """Logs matching `q`, annotated with their Rank. `q` is a web search query (quoted phrases,
+        `or`, `-word`) matched against the tsvector index. With pg_trgm installed and no `or`, each
+        term of three or more characters may instead match as a substring of Object or RecordId;
+        every term must still match and negated terms exclude either way."""
+        query = SearchQuery(q, config='simple', search_type='websearch')
+        match = Q(Search=query)
+        rank = SearchRank(log_search_vector(), query)
+        positive, negative, alternatives = search_terms(q)
+        if not alternatives and any(len(term) >= 3 for term in positive) and trigram_installed(self.db):
+            match = Q()
+            for term in positive:
+                termMatch = Q(Search=SearchQuery(term, config='simple', search_type='phrase'))
+                if len(term) >= 3:
+                    pattern = like_pattern(term)
+                    termMatch |= Q(ILike(F('Object'), pattern)) | Q(ILike(F('RecordId'), pattern))
+                    rank = rank + Greatest(TrigramWordSimilarity(term, 'Object'), TrigramWordSimilarity(term, Coalesce('RecordId', Value(''))))
+                match &= termMatch
+            for term in negative:
+                match &= ~Q(Search=SearchQuery(term, config='simple', search_type='phrase'))
+                if len(term) >= 3:
+                    pattern = like_pattern(term)
+                    match &= ~Q(ILike(F('Object'), pattern)) & ~Q(ILike(Coalesce('RecordId', Value('')), pattern))
+        # double precision survives the keyset cursor exactly, ts_rank's real would not
+        return self.alias(Search=log_search_vector()).filter(match).annotate(Rank=Cast(rank, models.FloatField()))
+
+class AbstractLogManager(AbstractManager.from_queryset(LogQuerySet)):
+
+    @property
+    def day_partitions(self) -> DailyPartitions:
+        """The day partitions of this log table, see systemLog migration 0002."""
+        return DailyPartitions(self.model._meta.db_table)
 
 class AbstractLogModel(AbstractModel):
-    Citizen = models.ForeignKey(to='citizen.Citizen', on_delete=models.CASCADE)
+    # log tables are partitioned by Created, so PublicId can only be indexed per partition, not kept unique
+    PublicId = models.UUIDField(db_index=True, default=uuid.uuid4, editable=False)
+    # covered by the (Citizen, Created) index below
+    Citizen = models.ForeignKey(to='citizen.Citizen', on_delete=models.CASCADE, db_index=False)
     Method = models.CharField()
     Object = models.CharField()
     RecordId = models.CharField(null=True)
+    StatusCode = models.IntegerField(null=True)
     IpAddress = models.CharField(max_length=19)
     Message = models.CharField()
 
     objects : AbstractLogManager = AbstractLogManager()
 
+    class Meta:
+        abstract = True
+        # every filter column leads with Created trailing, so a filtered list is read in keyset order
+        indexes = [
+            models.Index(fields=['-Created', '-id'], name='%(class)s_created_idx'),
+            models.Index(fields=['Citizen', '-Created'], name='%(class)s_citizen_idx'),
+            models.Index(fields=['Method', '-Created'], name='%(class)s_method_idx'),
+            models.Index(fields=['Object', '-Created'], name='%(class)s_object_idx'),
+            GinIndex(log_search_vector(), name='%(class)s_search_idx'),
+        ]
+
     def __str__(self):
         return f'Log:: Citizen:{self.Citizen.UserName}, Method: {self.Method}, Record: {self.RecordId}, StatusCode: {self.StatusCode}'
     pass
\ No newline at end of file
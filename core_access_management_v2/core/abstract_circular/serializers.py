@@ -1,5 +1,6 @@
 from rest_framework import serializers
 from core.abstract.serializers import AbstractModelSerializer
+from core.abstract.identity import IdentityRelatedField
 from core.citizen.models import Citizen
 from core.citizen.serializers import PermissionCitizenSerializer
 from core.citizen.serializers import StaffCitizenSerializer
@@ -7,7 +8,7 @@ from .models import AbstractLogModel
 from .models import AbstractPermission
 
 class AbstractPermissionSerializer(AbstractModelSerializer):
-    Citizens = serializers.SlugRelatedField(queryset=Citizen.objects.all(), slug_field='PublicId', many=True)
+    Citizens = IdentityRelatedField(queryset=Citizen.objects.all(), many=True)
     PermissionOpen = serializers.SerializerMethodField()
 
     def get_PermissionOpen(self, permission : AbstractPermission):
@@ -26,7 +27,7 @@ class AbstractPermissionSerializer(AbstractModelSerializer):
 
 
 class AbstractLogSerializer(AbstractModelSerializer):
-    Citizen = serializers.SlugRelatedField(queryset=Citizen.objects.all(), slug_field="PublicId")
+    Citizen = IdentityRelatedField(queryset=Citizen.objects.all())
 
     def to_representation(self, instance):
         data = super().to_representation(instance)
@@ -36,8 +37,8 @@ class AbstractLogSerializer(AbstractModelSerializer):
     class Meta:
         model : AbstractLogModel = AbstractLogModel
         fields : list[str] = [
-            'id','Citizen', 'Method', 'Object', 'RecordId', 'Message', 'Created', 'Updated'
+            'id','Citizen', 'Method', 'Object', 'RecordId', 'StatusCode', 'Message', 'Created', 'Updated'
         ]
         read_only_fields : list[str] = [
-            'id','Citizen', 'Method', 'Object', 'RecordId', 'Message', 'Created', 'Updated'
+            'id','Citizen', 'Method', 'Object', 'RecordId', 'StatusCode', 'Message', 'Created', 'Updated'
         ]
@@ -1,10 +1,56 @@
 from core.abstract.viewset import AbstractAdministratorModelViewSet, AbstractSiteManagerModelViewSet, AbstractGranteeModelViewSet
+from core.abstract.pagination import KeysetPagination
+from core.abstract.export import ExportMixin
+from core.citizen.models import Citizen
+from core.systemLog.archive import archive, archive_filters
 
-class AdministratorLogViewSet(AbstractAdministratorModelViewSet):
+class LogQueryMixin:
+    """Log lists are keyset paginated newest first; time ranges filter with
+    Created__gte / Created__lt (ISO dates or datetimes) alongside filters on
+    the indexed fields only, which the day partitions and (field, Created)
+    indexes serve.
+    Pages merge in the log archive's rows on (Created, id).
+    `?q=` searches Message, Object and RecordId instead, best match first
+    (see LogQuerySet.search); searches cover the live rows only."""
+    pagination_class = KeysetPagination
+    filter_indexed_only = True
+    search_query_param = 'q'
+    export_related = {'Citizen': ('UserName', 'NationalId')}
+
+    def search_term(self) -> str:
+        return self.request.query_params.get(self.search_query_param, '').strip()
+
+    def get_keyset(self) -> tuple:
+        return ('Rank', 'Created', 'pk') if self.search_term() else ('Created', 'pk')
+
+    def get_queryset(self):
+        queryset = super().get_queryset().select_related('Citizen')
+        term = self.search_term()
+        return queryset.search(term) if term else queryset
+
+    def older_rows(self, before, limit: int, since=None) -> list:
+        model = self.serializer_class.Meta.model
+        translated = archive_filters(self.get_queries(), model)
+        if translated is None:
+            return []
+        filters, start, end = translated
+        if since is not None:
+            start = max(start, since) if start else since
+        rows = archive.query(model, filters, start, end, before, limit)
+        citizens = Citizen.objects.in_bulk({row.Citizen_id for row in rows})
+        # archived rows of since-deleted citizens are left out, as the cascade removed their live rows
+        kept = []
+        for row in rows:
+            if row.Citizen_id in citizens:
+                row.Citizen = citizens[row.Citizen_id]
+                kept.append(row)
+        return kept
+
+class AdministratorLogViewSet(LogQueryMixin, AbstractAdministratorModelViewSet):
     http_method_names = ('get')
 
-class SiteManagerLogViewSet(AbstractSiteManagerModelViewSet):
+class SiteManagerLogViewSet(LogQueryMixin, ExportMixin, AbstractSiteManagerModelViewSet):
     http_method_names = ('get')
 
-class GranteeLogViewSet(AbstractGranteeModelViewSet):
+class GranteeLogViewSet(LogQueryMixin, AbstractGranteeModelViewSet):
     http_method_names = ('get')
@@ -1,11 +1,12 @@
-from rest_framework.serializers import CharField, SlugRelatedField
+from rest_framework.serializers import CharField
 from django.contrib.auth.hashers import make_password
 from core.abstract.serializers import AbstractModelSerializer
+from core.abstract.identity import IdentityRelatedField
 from core.citizen.serializers import StaffCitizenSerializer, Citizen
 from .models import Administrator
 
 class AdministratorModelSerializer(AbstractModelSerializer):
-    Citizen = SlugRelatedField(queryset=Citizen.objects.all(), slug_field='PublicId')
+    Citizen = IdentityRelatedField(queryset=Citizen.objects.all())
     password = CharField(max_length=128, min_length=8, write_only=True, required=True)
 
     class Meta:
@@ -1,2 +1,3 @@
 from .register import RegisterCitizenSerializer
-from .login import LoginCitizenSerializer, LoginSiteManagerSerializer, LoginGranteeSerializer, LoginAdministratorSerializer, INVALID_DATA
\ No newline at end of file
+from .login import LoginCitizenSerializer, LoginSiteManagerSerializer, LoginGranteeSerializer, LoginAdministratorSerializer, INVALID_DATA
+from .authorize import AuthorizeSerializer, AuthorizeBulkSerializer
\ No newline at end of file
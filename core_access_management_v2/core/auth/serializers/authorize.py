@@ -0,0 +1,9 @@
+from rest_framework import serializers
+
+class AuthorizeSerializer(serializers.Serializer):
+    Service = serializers.UUIDField()
+    IpAddress = serializers.CharField(max_length=19, required=False)
+
+
+class AuthorizeBulkSerializer(serializers.Serializer):
+    Services = serializers.ListField(child=serializers.UUIDField(), allow_empty=False, max_length=500)
@@ -1,3 +1,4 @@
 from .login import LoginCitizenViewSet, LoginSiteManagerViewSet, LoginAdministratorViewSet, LoginGranteeViewSet
 from .register import RegisterViewSet
-from .refresh import RefreshViewSet
\ No newline at end of file
+from .refresh import RefreshViewSet
+from .authorize import AuthorizeViewSet
\ No newline at end of file
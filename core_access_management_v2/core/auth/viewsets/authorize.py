@@ -0,0 +1,57 @@
+from django.db.transaction import atomic
+from rest_framework.viewsets import ViewSet
+from rest_framework.decorators import action
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.status import HTTP_200_OK, HTTP_403_FORBIDDEN
+from rest_framework.response import Response
+from core.auth.serializers import AuthorizeSerializer, AuthorizeBulkSerializer
+from core.abstract.network import normalize_ip, get_client_ip
+from core.publicService.cache import decisions
+from core.publicService.access import PublicServiceAccessQuery
+from core.serviceSession.models import ServiceSession
+from core.serviceSession.serializers import AuthorizeServiceSessionSerializer
+
+class AuthorizeViewSet(ViewSet):
+    """Gateway decision endpoint: resolves the bearer's citizen, checks access to
+    the service and refreshes the (citizen, service, ip) session in one exchange."""
+    serializer_class = AuthorizeSerializer
+    permission_classes = (IsAuthenticated,)
+    http_method_names = ('post',)
+
+    @atomic
+    def create(self, request, *args, **kwargs):
+        serializer = self.serializer_class(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        citizen = request.user
+        serviceId = serializer.validated_data['Service']
+        ipAddress = normalize_ip(serializer.validated_data.get('IpAddress') or get_client_ip(request))
+        service = decisions.decide(citizen, serviceId)
+        data = {
+            'Citizen': citizen.PublicId.hex,
+            'Service': serviceId.hex,
+            'IpAddress': ipAddress,
+            'Allowed': service is not None,
+            'Session': None,
+        }
+        if service is None:
+            return Response(data, HTTP_403_FORBIDDEN)
+        session = ServiceSession.objects.upsert(Citizen=citizen, Service=service, IpAddress=ipAddress)
+        data['Session'] = AuthorizeServiceSessionSerializer(session).data
+        return Response(data, HTTP_200_OK)
+
+    @action(detail=False, methods=['post'], url_path='bulk')
+    def bulk(self, request, *args, **kwargs):
+        """Allow/deny for many services at once, each with the moment its answer can next change.
+        Read-only: no sessions are opened."""
+        serializer = AuthorizeBulkSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        serviceIds = serializer.validated_data['Services']
+        found = PublicServiceAccessQuery(request.user).decisions(serviceIds)
+        services = {}
+        for serviceId in serviceIds:
+            allowed, validUntil = found.get(serviceId, (False, None))
+            services[serviceId.hex] = {
+                'Allowed': allowed,
+                'ValidUntil': validUntil.isoformat() if validUntil else None,
+            }
+        return Response({'Citizen': request.user.PublicId.hex, 'Services': services}, HTTP_200_OK)
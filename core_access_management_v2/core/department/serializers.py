@@ -1,10 +1,10 @@
 from core.abstract.serializers import AbstractModelSerializer
-from rest_framework.serializers import SlugRelatedField
+from core.abstract.identity import IdentityRelatedField
 from core.administrator.models import Administrator
 from .models import Department
 
 class CitizenDepartmentSerializer(AbstractModelSerializer):
-    Administrator = SlugRelatedField(queryset=Administrator.objects.all(), slug_field="PublicId")
+    Administrator = IdentityRelatedField(queryset=Administrator.objects.all())
 
     class Meta:
         model : Department = Department
@@ -0,0 +1,19 @@
+# Generated by Django 5.1.5 on 2026-10-18 10:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('grant', '0002_alter_grant_grantee_alter_grant_request'),
+        ('grantee', '0005_alter_grantee_administrator_alter_grantee_citizen'),
+        ('request', '0002_alter_request_citizen_alter_request_publicservice'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='grant',
+            index=models.Index(fields=['Decline', 'StartDate', 'EndDate'], name='grant_status_idx'),
+        ),
+    ]
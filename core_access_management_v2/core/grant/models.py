@@ -1,10 +1,42 @@
 from django.db import models
+from django.db.models import Q, Case, When, Value
 from django.utils import timezone
 from datetime import datetime
 from core.abstract.models import AbstractManager, AbstractModel
 
+GRANT_GRANTED = 'Granted'
+GRANT_PENDING = 'Pending'
+GRANT_DECLINED = 'Declined'
+GRANT_EXPIRED = 'Expired'
+
+def grant_active(prefix: str = '', now: datetime | None = None) -> Q:
+    """SQL form of Grant.granted; `prefix` reaches a grant through a relation, e.g. 'grant__'."""
+    now = now or timezone.now()
+    return (
+        Q(**{f'{prefix}Decline': False, f'{prefix}StartDate__lte': now})
+        & (Q(**{f'{prefix}EndDate__isnull': True}) | Q(**{f'{prefix}EndDate__gte': now}))
+    )
+
+def grant_status(prefix: str = '', now: datetime | None = None) -> Case:
+    now = now or timezone.now()
+    return Case(
+        When(Q(**{f'{prefix}Decline': True}), then=Value(GRANT_DECLINED)),
+        When(Q(**{f'{prefix}StartDate__isnull': True}) | Q(**{f'{prefix}StartDate__gt': now}), then=Value(GRANT_PENDING)),
+        When(Q(**{f'{prefix}EndDate__lt': now}), then=Value(GRANT_EXPIRED)),
+        default=Value(GRANT_GRANTED),
+        output_field=models.CharField(),
+    )
+
 # Create your models here.
-class GrantManager(AbstractManager):
+class GrantQuerySet(models.QuerySet):
+
+    def with_status(self, now: datetime | None = None):
+        return self.annotate(Status=grant_status(now=now))
+
+    def active(self, now: datetime | None = None):
+        return self.filter(grant_active(now=now))
+
+class GrantManager(AbstractManager.from_queryset(GrantQuerySet)):
     pass
 
 class Grant(AbstractModel):
@@ -17,6 +49,11 @@ class Grant(AbstractModel):
 
     objects : GrantManager = GrantManager()
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['Decline', 'StartDate', 'EndDate'], name='grant_status_idx'),
+        ]
+
     @property
     def granted(self):
         now = timezone.now()
@@ -26,10 +63,10 @@ class Grant(AbstractModel):
             return False
         elif self.StartDate > now:
             return False
-        elif self.EndDate < now:
-            return False
         elif self.EndDate == None:
             return True
+        elif self.EndDate < now:
+            return False
         return True
 
     def __str__(self):
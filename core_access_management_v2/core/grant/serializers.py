@@ -1,6 +1,7 @@
 from rest_framework.serializers import SlugRelatedField, SerializerMethodField
 from pprint import pprint
 from core.abstract.serializers import AbstractModelSerializer
+from core.abstract.identity import IdentityRelatedField
 from core.request.models import Request
 from core.request.serializers import GrantRequestSerializer
 from core.grantee.models import Grantee
@@ -29,7 +30,7 @@ class CitizenGrantSerializer(AbstractModelSerializer):
         ]
     
 class GranteeGrantSerializer(CitizenGrantSerializer):
-    Grantee = SlugRelatedField(queryset=Grantee.objects.all(), slug_field="PublicId")
+    Grantee = IdentityRelatedField(queryset=Grantee.objects.all())
 
     def to_representation(self, instance):
         data = super().to_representation(instance)
@@ -19,6 +19,7 @@ class CitizenGrantViewSet(AbstractModelViewSet):
 class GranteeGrantViewSet(AbstractGranteeModelViewSet):
     serializer_class = GranteeGrantSerializer
     http_method_names = ('get', 'patch')
+    filter_relations = ('Request__PublicService', 'Request__Citizen')
 
     def get_queryset(self):
         if hasattr(self.request.user, 'grantee'):
@@ -39,6 +40,7 @@ class GranteeGrantViewSet(AbstractGranteeModelViewSet):
 class AdministratorGrantViewSet(AbstractAdministratorModelViewSet):
     serializer_class = AdministratorGrantSerializer
     http_method_names = ('get')
+    filter_relations = ('Request__PublicService', 'Request__Citizen')
 
     def get_queryset(self):
         if hasattr(self.request.user, 'administrator'):
@@ -54,4 +56,5 @@ class AdministratorGrantViewSet(AbstractAdministratorModelViewSet):
 class SiteManagerGrantViewSet(AbstractSiteManagerModelViewSet):
     serializer_class = SiteManagerGrantSerializer
     http_method_names = ('get')
+    filter_relations = ('Request__PublicService', 'Request__Citizen')
 
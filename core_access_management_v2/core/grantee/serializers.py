@@ -4,6 +4,7 @@ from rest_framework.utils import model_meta
 from rest_framework.exceptions import ValidationError
 from django.contrib.auth.hashers import make_password
 from core.abstract.serializers import AbstractModelSerializer
+from core.abstract.identity import IdentityRelatedField
 from core.citizen.serializers import StaffCitizenSerializer, Citizen
 from core.administrator.models import Administrator
 from core.association.models import Association
@@ -11,8 +12,8 @@ from core.association.serializers import GranteeAssociationSerializer
 from .models import Grantee
 
 class GranteeSerializer(AbstractModelSerializer):
-    Citizen = SlugRelatedField(queryset=Citizen.objects.all(), slug_field='PublicId')
-    Administrator = SlugRelatedField(queryset=Administrator.objects.all(), slug_field='PublicId')
+    Citizen = IdentityRelatedField(queryset=Citizen.objects.all())
+    Administrator = IdentityRelatedField(queryset=Administrator.objects.all())
     Association = SlugRelatedField(queryset=Association.objects.all(), slug_field='PublicId')
     password = CharField(max_length=128, min_length=8, write_only=True, required=True)
 
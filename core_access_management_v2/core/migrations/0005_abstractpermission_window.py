@@ -0,0 +1,25 @@
+# Generated by Django 5.1.5 on 2026-10-18 10:07
+
+import django.contrib.postgres.fields.ranges
+import django.contrib.postgres.indexes
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_alter_abstractlogmodel_citizen'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='abstractpermission',
+            index=models.Index(fields=['EndTime', 'StartTime'], name='abstractpermission_window_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='abstractpermission',
+            index=django.contrib.postgres.indexes.GistIndex(models.Func(models.F('StartTime'), models.F('EndTime'), models.Value('[]'), function='tstzrange', output_field=django.contrib.postgres.fields.ranges.DateTimeRangeField()), name='abstractpermission_window_gist'),
+        ),
+    ]
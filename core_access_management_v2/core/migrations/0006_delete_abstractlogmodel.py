@@ -0,0 +1,15 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_abstractpermission_window'),
+        ('systemLog', '0002_partition_logs_by_created'),
+    ]
+
+    operations = [
+        migrations.DeleteModel(
+            name='AbstractLogModel',
+        ),
+    ]
@@ -0,0 +1,111 @@
+from datetime import datetime
+from django.db.models import Q, F, Exists, OuterRef, QuerySet, Subquery, ExpressionWrapper, BooleanField
+from django.utils import timezone
+from core.servicePermissions.models import PublicServicePermission, AssociationPermission, DepartmentPermission
+from core.grant.models import Grant
+from .models import PublicService, ServiceAccess
+
+class PublicServiceAccessQuery:
+    """Answers "may this citizen use this service at this time" as a single
+    predicate over PublicService rows.
+
+    The predicate is a composition of correlated EXISTS subqueries so that a
+    listing, a single-service check or a bulk check is always one statement.
+    By default the permission and grant branches are answered from the
+    materialized ServiceAccess rows; `materialized=False` evaluates the same
+    rules directly against the permission and grant tables.
+    """
+
+    def __init__(self, citizen, at=None, materialized: bool = True):
+        self.citizen = citizen
+        self.at = at or timezone.now()
+        self.materialized = materialized
+
+    def unrestricted(self) -> Q:
+        return Q(Restricted=False, Visibility=True)
+
+    def by_materialized_access(self) -> Exists:
+        return Exists(ServiceAccess.objects.active(self.citizen, self.at).filter(Service=OuterRef('pk')))
+
+    def open_permissions(self, model) -> QuerySet:
+        return model.objects.active_at(self.at).filter(Citizens=self.citizen)
+
+    def by_service_permission(self) -> Exists:
+        return Exists(self.open_permissions(PublicServicePermission).filter(PublicService=OuterRef('pk')))
+
+    def by_association_permission(self) -> Exists:
+        return Exists(self.open_permissions(AssociationPermission).filter(Association=OuterRef('Association')))
+
+    def by_department_permission(self) -> Exists:
+        return Exists(self.open_permissions(DepartmentPermission).filter(Department=OuterRef('Association__Department')))
+
+    def by_grant(self) -> Exists:
+        grants = Grant.objects.active(self.at).filter(Request__Citizen=self.citizen, Request__PublicService=OuterRef('pk'))
+        return Exists(grants)
+
+    def granted(self) -> Q:
+        if self.materialized:
+            return Q(self.by_materialized_access())
+        return Q(self.by_service_permission()) | Q(self.by_association_permission()) | Q(self.by_department_permission()) | Q(self.by_grant())
+
+    def predicate(self) -> Q:
+        return self.unrestricted() | self.granted()
+
+    def filter(self, queryset: QuerySet | None = None) -> QuerySet:
+        """Services the citizen may use."""
+        queryset = PublicService.objects.all() if queryset is None else queryset
+        return queryset.filter(self.predicate())
+
+    def visible(self, queryset: QuerySet | None = None) -> QuerySet:
+        """Services the citizen may see in the catalog: every visible service plus any hidden one they may use."""
+        queryset = PublicService.objects.all() if queryset is None else queryset
+        return queryset.filter(Q(Visibility=True) | self.granted())
+
+    def valid_until(self) -> Subquery:
+        """Latest end among the citizen's open access rows for the service; NULL when one is open-ended."""
+        rows = ServiceAccess.objects.active(self.citizen, self.at).filter(Service=OuterRef('pk'))
+        return Subquery(rows.order_by(F('ValidUntil').desc(nulls_first=True)).values('ValidUntil')[:1])
+
+    def opens_at(self) -> Subquery:
+        """Earliest start among the citizen's access rows for the service that are not open yet."""
+        rows = ServiceAccess.objects.filter(Citizen=self.citizen, Service=OuterRef('pk'), ValidFrom__gt=self.at)
+        return Subquery(rows.order_by('ValidFrom').values('ValidFrom')[:1])
+
+    def annotate(self, queryset: QuerySet | None = None) -> QuerySet:
+        """Annotate services with Allowed, ValidUntil and OpensAt in one statement.
+        The two timestamps always come from the materialized rows."""
+        queryset = PublicService.objects.all() if queryset is None else queryset
+        return queryset.annotate(
+            Allowed=ExpressionWrapper(self.predicate(), output_field=BooleanField()),
+            ValidUntil=self.valid_until(),
+            OpensAt=self.opens_at(),
+        )
+
+    def changes_at(self, service: PublicService) -> datetime | None:
+        """The moment the Allowed answer of an annotated service can next change with time alone."""
+        if not service.Allowed:
+            return service.OpensAt
+        if self.unrestricted_service(service):
+            return None
+        return service.ValidUntil
+
+    def decision(self, service_id) -> tuple[PublicService | None, datetime | None]:
+        """The service when allowed (else None) and the moment that answer can next change with time alone."""
+        service = self.annotate().filter(PublicId=service_id).first()
+        if service is None:
+            return None, None
+        return (service if service.Allowed else None), self.changes_at(service)
+
+    def decisions(self, service_ids) -> dict:
+        """{PublicId: (allowed, changes_at)} for many services in one statement; unknown ids are left out."""
+        services = self.annotate(PublicService.objects.filter(PublicId__in=service_ids).only('PublicId', 'Restricted', 'Visibility'))
+        return {service.PublicId: (service.Allowed, self.changes_at(service)) for service in services}
+
+    def unrestricted_service(self, service: PublicService) -> bool:
+        return not service.Restricted and service.Visibility
+
+    def get(self, service_id) -> PublicService | None:
+        return self.filter().filter(PublicId=service_id).first()
+
+    def allows(self, service_id) -> bool:
+        return self.filter().filter(PublicId=service_id).exists()
@@ -5,3 +5,6 @@ class PublicserviceConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core.publicService'
     label = 'publicService'
+
+    def ready(self):
+        from . import signals
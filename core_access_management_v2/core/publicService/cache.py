@@ -0,0 +1,130 @@
+from collections import OrderedDict
+from datetime import datetime
+from threading import Lock
+import time
+from django.conf import settings
+from django.utils import timezone
+from prometheus_client import Counter, Gauge
+from .access import PublicServiceAccessQuery
+from .models import PublicService
+
+decision_cache_hits = Counter('core_access_decision_cache_hits_total', 'Authorization decisions answered from the in-process cache')
+decision_cache_misses = Counter('core_access_decision_cache_misses_total', 'Authorization decisions computed against the database')
+decision_cache_evictions = Counter('core_access_decision_cache_evictions_total', 'Decision cache entries dropped', ['reason'])
+decision_cache_size = Gauge('core_access_decision_cache_size', 'Entries held by the decision cache')
+
+class DecisionCache:
+    """Bounded TTL + LRU map of (citizen id, service PublicId) -> allowed PublicService or None.
+
+    An entry lives for at most `ttl` seconds and never past the moment its
+    decision changes by time alone (a window closing or opening). Signals on
+    the access tables drop entries by citizen or by service; the TTL bounds
+    staleness for writes made by other processes.
+    """
+
+    def __init__(self, maxsize: int = 10000, ttl: float = 30.0, clock=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.clock = clock
+        self.entries : OrderedDict = OrderedDict()
+        self.by_citizen : dict = {}
+        self.by_service : dict = {}
+        self.lock = Lock()
+        # bumped by every invalidation so a decision read before it is not stored after it
+        self.generation = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.maxsize > 0 and self.ttl > 0
+
+    def get(self, citizen_id, service_id) -> tuple[bool, PublicService | None]:
+        """(hit, service); a hit with service None is a cached denial."""
+        key = (citizen_id, service_id)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                decision_cache_misses.inc()
+                return False, None
+            deadline, service = entry
+            if deadline <= self.clock():
+                self._drop(key)
+                decision_cache_evictions.labels('expired').inc()
+                decision_cache_misses.inc()
+                return False, None
+            self.entries.move_to_end(key)
+            decision_cache_hits.inc()
+            return True, service
+
+    def set(self, citizen_id, service_id, service: PublicService | None, changes_at: datetime | None = None, generation: int | None = None):
+        if not self.enabled:
+            return
+        lifetime = self.ttl
+        if changes_at is not None:
+            lifetime = min(lifetime, (changes_at - timezone.now()).total_seconds())
+        if lifetime <= 0:
+            return
+        key = (citizen_id, service_id)
+        with self.lock:
+            if generation is not None and generation != self.generation:
+                return
+            if key in self.entries:
+                self._drop(key)
+            self.entries[key] = (self.clock() + lifetime, service)
+            self.by_citizen.setdefault(citizen_id, set()).add(key)
+            self.by_service.setdefault(service_id, set()).add(key)
+            while len(self.entries) > self.maxsize:
+                self._drop(next(iter(self.entries)))
+                decision_cache_evictions.labels('lru').inc()
+            decision_cache_size.set(len(self.entries))
+
+    def _drop(self, key):
+        self.entries.pop(key, None)
+        citizen_id, service_id = key
+        for index, value in ((self.by_citizen, citizen_id), (self.by_service, service_id)):
+            keys = index.get(value)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del index[value]
+        decision_cache_size.set(len(self.entries))
+
+    def _invalidate(self, index: dict, values):
+        with self.lock:
+            self.generation += 1
+            for value in values:
+                for key in list(index.get(value, ())):
+                    self._drop(key)
+                    decision_cache_evictions.labels('invalidated').inc()
+
+    def invalidate(self, citizen_id, service_id):
+        with self.lock:
+            self.generation += 1
+            if (citizen_id, service_id) in self.entries:
+                self._drop((citizen_id, service_id))
+                decision_cache_evictions.labels('invalidated').inc()
+
+    def invalidate_citizens(self, citizen_ids):
+        self._invalidate(self.by_citizen, citizen_ids)
+
+    def invalidate_services(self, service_ids):
+        self._invalidate(self.by_service, service_ids)
+
+    def clear(self):
+        with self.lock:
+            self.generation += 1
+            self.entries.clear()
+            self.by_citizen.clear()
+            self.by_service.clear()
+            decision_cache_size.set(0)
+
+    def decide(self, citizen, service_id) -> PublicService | None:
+        """The service when the citizen may use it now, else None."""
+        hit, service = self.get(citizen.pk, service_id)
+        if hit:
+            return service
+        generation = self.generation
+        service, changes_at = PublicServiceAccessQuery(citizen).decision(service_id)
+        self.set(citizen.pk, service_id, service, changes_at, generation)
+        return service
+
+decisions = DecisionCache(**getattr(settings, 'ACCESS_DECISION_CACHE', {}))
@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+from django.db.transaction import atomic
+from core.publicService.models import ServiceAccess
+
+
+class Command(BaseCommand):
+    help = "Rebuild the materialized citizen service access table from permissions and grants"
+
+    @atomic
+    def handle(self, *args, **options):
+        ServiceAccess.objects.rebuild_all()
+        self.stdout.write(self.style.SUCCESS(f'Service access rebuilt: {ServiceAccess.objects.count()} rows'))
@@ -0,0 +1,117 @@
+from datetime import datetime
+from itertools import groupby
+from threading import Lock
+import time
+from django.conf import settings
+from django.utils import timezone
+from core.abstract_circular.models import AbstractPermission
+from core.servicePermissions.models import PublicServicePermission, AssociationPermission, DepartmentPermission
+from core.citizen.models import Citizen
+from core.grant.models import Grant
+from .models import PublicService
+
+def bitset(ids) -> int:
+    """Pack citizen ids into an int with bit `id` set for each."""
+    ids = list(ids)
+    if not ids:
+        return 0
+    bits = bytearray((max(ids) >> 3) + 1)
+    for id in ids:
+        bits[id >> 3] |= 1 << (id & 7)
+    return int.from_bytes(bits, 'little')
+
+def bit_ids(bits: bytes) -> list[int]:
+    """The citizen ids set in a packed column."""
+    ids = []
+    for offset, byte in enumerate(bits):
+        if byte:
+            base = offset << 3
+            ids.extend(base + bit for bit in range(8) if byte >> bit & 1)
+    return ids
+
+class AccessMatrix:
+    """Citizen x service access at one moment, as one packed bit column per service.
+
+    Bit `citizen id` of a column is set when that citizen may use the service.
+    Columns are built with whole-int ORs from the permission citizen sets, the
+    association/department hierarchy and active grants, so a full recompute is
+    a handful of streaming queries rather than one access check per pair.
+    """
+
+    def __init__(self, at: datetime | None = None):
+        self.at = at or timezone.now()
+        self.columns : dict[int, bytes] = {}
+        self.built = None
+
+    def permission_bits(self, model) -> dict[int, int]:
+        """{target id: OR of the citizen sets of its open permissions} for one permission model."""
+        target = {
+            PublicServicePermission: 'PublicService_id',
+            AssociationPermission: 'Association_id',
+            DepartmentPermission: 'Department_id',
+        }[model]
+        targets = dict(model.objects.active_at(self.at).values_list('pk', target))
+        if not targets:
+            return {}
+        through = AbstractPermission.Citizens.through.objects.filter(abstractpermission_id__in=targets.keys())
+        rows = through.order_by('abstractpermission_id').values_list('abstractpermission_id', 'citizen_id').iterator(chunk_size=10000)
+        bits : dict[int, int] = {}
+        for permission_id, group in groupby(rows, key=lambda row: row[0]):
+            key = targets[permission_id]
+            bits[key] = bits.get(key, 0) | bitset(citizen for _, citizen in group)
+        return bits
+
+    def grant_bits(self) -> dict[int, int]:
+        rows = Grant.objects.active(self.at).order_by('Request__PublicService_id').values_list('Request__PublicService_id', 'Request__Citizen_id')
+        return {service: bitset(citizen for _, citizen in group) for service, group in groupby(rows.iterator(chunk_size=10000), key=lambda row: row[0])}
+
+    def build(self) -> 'AccessMatrix':
+        started = time.monotonic()
+        everyone = bitset(Citizen.objects.values_list('id', flat=True).iterator(chunk_size=10000))
+        by_service = self.permission_bits(PublicServicePermission)
+        by_association = self.permission_bits(AssociationPermission)
+        by_department = self.permission_bits(DepartmentPermission)
+        by_grant = self.grant_bits()
+        width = (everyone.bit_length() + 7) >> 3
+        services = PublicService.objects.values_list('id', 'Association_id', 'Association__Department_id', 'Restricted', 'Visibility')
+        for id, association, department, restricted, visibility in services:
+            if not restricted and visibility:
+                column = everyone
+            else:
+                column = by_service.get(id, 0) | by_association.get(association, 0) | by_department.get(department, 0) | by_grant.get(id, 0)
+                # drop ids of citizens deleted since the permission rows were read
+                column &= everyone
+            self.columns[id] = column.to_bytes(width, 'little')
+        self.built = time.monotonic() - started
+        return self
+
+    def allows(self, citizen_id: int, service_id: int) -> bool:
+        column = self.columns.get(service_id)
+        if column is None or (citizen_id >> 3) >= len(column):
+            return False
+        return bool(column[citizen_id >> 3] >> (citizen_id & 7) & 1)
+
+    def row(self, citizen_id: int) -> list[int]:
+        """Service ids the citizen may use."""
+        return [service for service in self.columns if self.allows(citizen_id, service)]
+
+    def column(self, service_id: int) -> list[int]:
+        """Citizen ids that may use the service."""
+        return bit_ids(self.columns.get(service_id, b''))
+
+    def count(self, service_id: int) -> int:
+        return int.from_bytes(self.columns.get(service_id, b''), 'little').bit_count()
+
+_current : AccessMatrix | None = None
+_current_at : float = 0.0
+_current_lock = Lock()
+
+def current_matrix(max_age: float | None = None) -> AccessMatrix:
+    """The process-wide matrix, rebuilt when older than ACCESS_MATRIX_MAX_AGE seconds."""
+    global _current, _current_at
+    max_age = getattr(settings, 'ACCESS_MATRIX_MAX_AGE', 300) if max_age is None else max_age
+    with _current_lock:
+        if _current is None or time.monotonic() - _current_at > max_age:
+            _current = AccessMatrix().build()
+            _current_at = time.monotonic()
+        return _current
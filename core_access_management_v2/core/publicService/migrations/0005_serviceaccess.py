@@ -0,0 +1,32 @@
+# Generated by Django 5.1.5 on 2026-10-18 10:01
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('publicService', '0004_alter_publicservice_association'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ServiceAccess',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('Source', models.CharField(choices=[('Service', 'Service'), ('Association', 'Association'), ('Department', 'Department'), ('Grant', 'Grant')])),
+                ('SourceId', models.BigIntegerField()),
+                ('ValidFrom', models.DateTimeField(null=True)),
+                ('ValidUntil', models.DateTimeField(null=True)),
+                ('Citizen', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+                ('Service', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='publicService.publicservice')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['Citizen', 'Service', 'ValidUntil'], name='serviceaccess_lookup_idx'), models.Index(fields=['Source', 'SourceId'], name='serviceaccess_source_idx')],
+                'constraints': [models.UniqueConstraint(fields=('Citizen', 'Service', 'Source', 'SourceId'), name='serviceaccess_unique_source')],
+            },
+        ),
+    ]
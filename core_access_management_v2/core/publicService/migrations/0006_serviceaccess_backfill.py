@@ -0,0 +1,22 @@
+from django.db import migrations
+
+
+def backfill_service_access(apps, schema_editor):
+    from core.publicService.models import rebuild_service_access
+    rebuild_service_access(apps)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('publicService', '0005_serviceaccess'),
+        ('servicePermissions', '0001_initial'),
+        ('grant', '0003_grant_status_idx'),
+        ('request', '0002_alter_request_citizen_alter_request_publicservice'),
+        ('association', '0003_alter_association_department'),
+        ('core', '0005_abstractpermission_window'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_service_access, migrations.RunPython.noop),
+    ]
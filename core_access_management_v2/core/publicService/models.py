@@ -1,7 +1,13 @@
+from django.apps import apps as django_apps
 from django.db import models
+from django.db.models import Q
+from django.utils import timezone
 from rest_framework.exceptions import ValidationError
 from django.contrib.postgres.fields import ArrayField
 from core.abstract.models import AbstractManager, AbstractModel
+from core.abstract_circular.models import AbstractPermission
+from core.servicePermissions.models import PublicServicePermission, AssociationPermission, DepartmentPermission
+from core.grant.models import Grant
 # from core.grantee.models import Grantee
 from pprint import pprint
 
@@ -57,3 +63,181 @@ class PublicService(AbstractModel):
     def __str__(self):
         return f'PublicService: \n\t{self.Title}, \n\tAssociation({self.Association}), \n\tEmail({self.Email}, \n\tGrantee({self.get_grantee}))'
 
+
+SERVICE_ACCESS_SERVICE = 'Service'
+SERVICE_ACCESS_ASSOCIATION = 'Association'
+SERVICE_ACCESS_DEPARTMENT = 'Department'
+SERVICE_ACCESS_GRANT = 'Grant'
+service_access_sources = [
+    (SERVICE_ACCESS_SERVICE, 'Service'),
+    (SERVICE_ACCESS_ASSOCIATION, 'Association'),
+    (SERVICE_ACCESS_DEPARTMENT, 'Department'),
+    (SERVICE_ACCESS_GRANT, 'Grant'),
+]
+PERMISSION_SOURCES = [SERVICE_ACCESS_SERVICE, SERVICE_ACCESS_ASSOCIATION, SERVICE_ACCESS_DEPARTMENT]
+
+class ServiceAccessManager(models.Manager):
+    """Keeps the materialized (Citizen, Service) access rows in step with the
+    permission, grant and hierarchy tables they are derived from."""
+
+    batch_size = 1000
+
+    def active(self, citizen, at=None):
+        at = at or timezone.now()
+        return self.filter(
+            Q(ValidFrom__isnull=True) | Q(ValidFrom__lte=at),
+            Q(ValidUntil__isnull=True) | Q(ValidUntil__gte=at),
+            Citizen=citizen,
+        )
+
+    def resolve_permission(self, permission: AbstractPermission) -> AbstractPermission | None:
+        if isinstance(permission, (PublicServicePermission, AssociationPermission, DepartmentPermission)):
+            return permission
+        for accessor in ('publicservicepermission', 'associationpermission', 'departmentpermission'):
+            if hasattr(permission, accessor):
+                return getattr(permission, accessor)
+        return None
+
+    def permission_source(self, permission: AbstractPermission) -> str:
+        if isinstance(permission, PublicServicePermission):
+            return SERVICE_ACCESS_SERVICE
+        if isinstance(permission, AssociationPermission):
+            return SERVICE_ACCESS_ASSOCIATION
+        return SERVICE_ACCESS_DEPARTMENT
+
+    def permission_services(self, permission: AbstractPermission) -> models.QuerySet:
+        if isinstance(permission, PublicServicePermission):
+            return PublicService.objects.filter(id=permission.PublicService_id)
+        if isinstance(permission, AssociationPermission):
+            return PublicService.objects.filter(Association_id=permission.Association_id)
+        return PublicService.objects.filter(Association__Department_id=permission.Department_id)
+
+    def _create_rows(self, permission: AbstractPermission, citizens, services):
+        source = self.permission_source(permission)
+        rows = [
+            self.model(
+                Citizen_id=citizen, Service_id=service, Source=source, SourceId=permission.pk,
+                ValidFrom=permission.StartTime, ValidUntil=permission.EndTime
+            )
+            for citizen in citizens for service in services
+        ]
+        self.bulk_create(rows, batch_size=self.batch_size, ignore_conflicts=True)
+
+    def rebuild_permission(self, permission: AbstractPermission, citizens=None):
+        """Re-derive the rows of one permission, optionally only for some citizens."""
+        permission = self.resolve_permission(permission)
+        if permission is None:
+            return
+        rows = self.filter(Source=self.permission_source(permission), SourceId=permission.pk)
+        if citizens is not None:
+            rows = rows.filter(Citizen_id__in=citizens)
+        rows.delete()
+        citizen_ids = permission.Citizens.values_list('id', flat=True)
+        if citizens is not None:
+            citizen_ids = citizen_ids.filter(id__in=citizens)
+        service_ids = list(self.permission_services(permission).values_list('id', flat=True))
+        self._create_rows(permission, list(citizen_ids), service_ids)
+
+    def remove_permission(self, permission: AbstractPermission, citizens=None):
+        permission = self.resolve_permission(permission)
+        if permission is None:
+            return
+        rows = self.filter(Source=self.permission_source(permission), SourceId=permission.pk)
+        if citizens is not None:
+            rows = rows.filter(Citizen_id__in=citizens)
+        rows.delete()
+
+    def rebuild_grant(self, grant: Grant):
+        self.filter(Source=SERVICE_ACCESS_GRANT, SourceId=grant.pk).delete()
+        if grant.Decline or grant.StartDate is None:
+            return
+        request = grant.Request
+        self.create(
+            Citizen_id=request.Citizen_id, Service_id=request.PublicService_id, Source=SERVICE_ACCESS_GRANT,
+            SourceId=grant.pk, ValidFrom=grant.StartDate, ValidUntil=grant.EndDate
+        )
+
+    def remove_grant(self, grant: Grant):
+        self.filter(Source=SERVICE_ACCESS_GRANT, SourceId=grant.pk).delete()
+
+    def rebuild_service(self, service: 'PublicService'):
+        """Re-derive the hierarchy rows of a service after it moved association."""
+        self.filter(Service=service, Source__in=[SERVICE_ACCESS_ASSOCIATION, SERVICE_ACCESS_DEPARTMENT]).delete()
+        permissions = [
+            *AssociationPermission.objects.filter(Association_id=service.Association_id),
+            *DepartmentPermission.objects.filter(Department__association__id=service.Association_id),
+        ]
+        for permission in permissions:
+            self._create_rows(permission, list(permission.Citizens.values_list('id', flat=True)), [service.id])
+
+    def rebuild_association(self, association):
+        for service in PublicService.objects.filter(Association=association):
+            self.rebuild_service(service)
+
+    def rebuild_citizen(self, citizen):
+        """Re-derive every permission row of a citizen, used when their permission set changed from the citizen side."""
+        citizen_id = getattr(citizen, 'pk', citizen)
+        self.filter(Citizen_id=citizen_id, Source__in=PERMISSION_SOURCES).delete()
+        for permission in AbstractPermission.objects.filter(Citizens__id=citizen_id):
+            permission = self.resolve_permission(permission)
+            if permission is None:
+                continue
+            service_ids = list(self.permission_services(permission).values_list('id', flat=True))
+            self._create_rows(permission, [citizen_id], service_ids)
+
+    def rebuild_all(self):
+        rebuild_service_access(django_apps, batch_size=self.batch_size)
+
+def rebuild_service_access(apps, batch_size: int = 1000):
+    """Re-derive every ServiceAccess row from the permissions and grants of `apps`,
+    the live registry or a migration's historical one, so only plain fields are used."""
+    ServiceAccess = apps.get_model('publicService', 'ServiceAccess')
+    Service = apps.get_model('publicService', 'PublicService')
+    ServiceAccess.objects.all().delete()
+    sources = (
+        ('PublicServicePermission', SERVICE_ACCESS_SERVICE, lambda permission: Q(id=permission.PublicService_id)),
+        ('AssociationPermission', SERVICE_ACCESS_ASSOCIATION, lambda permission: Q(Association_id=permission.Association_id)),
+        ('DepartmentPermission', SERVICE_ACCESS_DEPARTMENT, lambda permission: Q(Association__Department_id=permission.Department_id)),
+    )
+    for modelName, source, services in sources:
+        for permission in apps.get_model('servicePermissions', modelName).objects.all():
+            citizenIds = list(permission.Citizens.values_list('id', flat=True))
+            serviceIds = list(Service.objects.filter(services(permission)).values_list('id', flat=True))
+            ServiceAccess.objects.bulk_create([
+                ServiceAccess(
+                    Citizen_id=citizen, Service_id=service, Source=source, SourceId=permission.pk,
+                    ValidFrom=permission.StartTime, ValidUntil=permission.EndTime
+                )
+                for citizen in citizenIds for service in serviceIds
+            ], batch_size=batch_size, ignore_conflicts=True)
+    grants = apps.get_model('grant', 'Grant').objects.filter(Decline=False, StartDate__isnull=False).select_related('Request')
+    ServiceAccess.objects.bulk_create([
+        ServiceAccess(
+            Citizen_id=grant.Request.Citizen_id, Service_id=grant.Request.PublicService_id, Source=SERVICE_ACCESS_GRANT,
+            SourceId=grant.pk, ValidFrom=grant.StartDate, ValidUntil=grant.EndDate
+        )
+        for grant in grants
+    ], batch_size=batch_size, ignore_conflicts=True)
+
+class ServiceAccess(models.Model):
+    Citizen = models.ForeignKey(to='citizen.Citizen', on_delete=models.CASCADE)
+    Service = models.ForeignKey(to=PublicService, on_delete=models.CASCADE)
+    Source = models.CharField(choices=service_access_sources)
+    SourceId = models.BigIntegerField()
+    ValidFrom = models.DateTimeField(null=True)
+    ValidUntil = models.DateTimeField(null=True)
+
+    objects : ServiceAccessManager = ServiceAccessManager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['Citizen', 'Service', 'Source', 'SourceId'], name='serviceaccess_unique_source'),
+        ]
+        indexes = [
+            models.Index(fields=['Citizen', 'Service', 'ValidUntil'], name='serviceaccess_lookup_idx'),
+            models.Index(fields=['Source', 'SourceId'], name='serviceaccess_source_idx'),
+        ]
+
+    def __str__(self):
+        return f'ServiceAccess: Citizen({self.Citizen_id}), Service({self.Service_id}), {self.Source}({self.SourceId}), {self.ValidFrom} - {self.ValidUntil}'
+
@@ -2,6 +2,7 @@ from rest_framework.serializers import SlugRelatedField, raise_errors_on_nested_
 from rest_framework.exceptions import ValidationError
 from rest_framework.utils import model_meta
 from core.abstract.serializers import AbstractModelSerializer
+from core.abstract.identity import IdentityRelatedField
 from core.association.models import Association
 from core.association.serializers import PublicServiceAssociationSerializer
 from core.grantee.models import Grantee
@@ -61,7 +62,7 @@ class CitizenPublicServiceSerializer(AbstractModelSerializer):
         ]
 
 class GranteePublicServiceSerializer(CitizenPublicServiceSerializer):
-    Grantee = SlugRelatedField(queryset=Grantee.objects.all(), slug_field='PublicId', many=True)
+    Grantee = IdentityRelatedField(queryset=Grantee.objects.all(), many=True)
     Methods = SlugRelatedField(queryset=Methods.objects.all(), slug_field='name', many=True)
 
     def to_representation(self, instance):
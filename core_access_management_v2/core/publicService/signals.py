@@ -0,0 +1,138 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete, m2m_changed
+from django.dispatch import receiver
+from core.abstract_circular.models import AbstractPermission
+from core.servicePermissions.models import PublicServicePermission, AssociationPermission, DepartmentPermission
+from core.association.models import Association
+from core.grant.models import Grant
+from core.request.models import Request
+from .models import PublicService, ServiceAccess
+from .cache import decisions
+
+PERMISSION_MODELS = (PublicServicePermission, AssociationPermission, DepartmentPermission)
+
+def permission_saved(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    ServiceAccess.objects.rebuild_permission(instance)
+
+def permission_deleted(sender, instance, **kwargs):
+    ServiceAccess.objects.remove_permission(instance)
+
+for permission_model in PERMISSION_MODELS:
+    post_save.connect(permission_saved, sender=permission_model, dispatch_uid=f'service_access_saved_{permission_model.__name__}')
+    post_delete.connect(permission_deleted, sender=permission_model, dispatch_uid=f'service_access_deleted_{permission_model.__name__}')
+
+@receiver(m2m_changed, sender=AbstractPermission.Citizens.through, dispatch_uid='service_access_citizens_changed')
+def permission_citizens_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if reverse:
+        # instance is a Citizen whose permission set changed
+        ServiceAccess.objects.rebuild_citizen(instance)
+    elif action == 'post_add':
+        ServiceAccess.objects.rebuild_permission(instance, citizens=pk_set)
+    elif action == 'post_remove':
+        ServiceAccess.objects.remove_permission(instance, citizens=pk_set)
+    else:
+        ServiceAccess.objects.remove_permission(instance)
+
+@receiver(post_save, sender=Grant, dispatch_uid='service_access_grant_saved')
+def grant_saved(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    ServiceAccess.objects.rebuild_grant(instance)
+
+@receiver(post_delete, sender=Grant, dispatch_uid='service_access_grant_deleted')
+def grant_deleted(sender, instance, **kwargs):
+    ServiceAccess.objects.remove_grant(instance)
+
+@receiver(post_save, sender=Request, dispatch_uid='service_access_request_saved')
+def request_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    # a new request has no decided grant yet, an edited one may have changed citizen or service
+    if not created and hasattr(instance, 'grant'):
+        ServiceAccess.objects.rebuild_grant(instance.grant)
+
+@receiver(post_save, sender=PublicService, dispatch_uid='service_access_service_saved')
+def service_saved(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    ServiceAccess.objects.rebuild_service(instance)
+
+@receiver(post_save, sender=Association, dispatch_uid='service_access_association_saved')
+def association_saved(sender, instance, created, raw=False, **kwargs):
+    if not created and not raw:
+        ServiceAccess.objects.rebuild_association(instance)
+
+
+# Decision cache invalidation. Entries are dropped straight away and again on
+# commit, so a decision read from the old rows mid-transaction is not kept.
+# Windows opening or closing need no signal: every entry already expires at
+# the moment its answer changes with time alone.
+
+def invalidate_citizens(citizen_ids):
+    citizen_ids = list(citizen_ids)
+    decisions.invalidate_citizens(citizen_ids)
+    transaction.on_commit(lambda: decisions.invalidate_citizens(citizen_ids))
+
+def invalidate_services(service_ids):
+    service_ids = list(service_ids)
+    decisions.invalidate_services(service_ids)
+    transaction.on_commit(lambda: decisions.invalidate_services(service_ids))
+
+def invalidate_permission(permission):
+    permission = ServiceAccess.objects.resolve_permission(permission)
+    if permission is None:
+        return
+    invalidate_services(ServiceAccess.objects.permission_services(permission).values_list('PublicId', flat=True))
+    if permission.pk is not None:
+        invalidate_citizens(permission.Citizens.values_list('id', flat=True))
+
+def permission_changed_decisions(sender, instance, raw=False, **kwargs):
+    if not raw:
+        invalidate_permission(instance)
+
+for permission_model in PERMISSION_MODELS:
+    post_save.connect(permission_changed_decisions, sender=permission_model, dispatch_uid=f'decision_cache_saved_{permission_model.__name__}')
+    post_delete.connect(permission_changed_decisions, sender=permission_model, dispatch_uid=f'decision_cache_deleted_{permission_model.__name__}')
+
+@receiver(m2m_changed, sender=AbstractPermission.Citizens.through, dispatch_uid='decision_cache_citizens_changed')
+def permission_citizens_changed_decisions(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if reverse:
+        invalidate_citizens([instance.pk])
+    elif pk_set:
+        invalidate_citizens(pk_set)
+    else:
+        invalidate_permission(instance)
+
+def grant_changed_decisions(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    request = instance.Request
+    decisions.invalidate(request.Citizen_id, request.PublicService.PublicId)
+    transaction.on_commit(lambda: decisions.invalidate(request.Citizen_id, request.PublicService.PublicId))
+
+post_save.connect(grant_changed_decisions, sender=Grant, dispatch_uid='decision_cache_grant_saved')
+post_delete.connect(grant_changed_decisions, sender=Grant, dispatch_uid='decision_cache_grant_deleted')
+
+@receiver(post_save, sender=Request, dispatch_uid='decision_cache_request_saved')
+@receiver(post_delete, sender=Request, dispatch_uid='decision_cache_request_deleted')
+def request_changed_decisions(sender, instance, raw=False, **kwargs):
+    if not raw:
+        invalidate_citizens([instance.Citizen_id])
+
+@receiver(post_save, sender=PublicService, dispatch_uid='decision_cache_service_saved')
+@receiver(post_delete, sender=PublicService, dispatch_uid='decision_cache_service_deleted')
+def service_changed_decisions(sender, instance, raw=False, **kwargs):
+    if not raw:
+        invalidate_services([instance.PublicId])
+
+@receiver(post_save, sender=Association, dispatch_uid='decision_cache_association_saved')
+@receiver(post_delete, sender=Association, dispatch_uid='decision_cache_association_deleted')
+def association_changed_decisions(sender, instance, raw=False, **kwargs):
+    if not raw:
+        invalidate_services(PublicService.objects.filter(Association_id=instance.pk).values_list('PublicId', flat=True))
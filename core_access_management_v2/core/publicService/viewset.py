@@ -2,188 +2,51 @@ from django.shortcuts import render
 from django.db.transaction import atomic
 from django.core.exceptions import ObjectDoesNotExist, ValidationError as ValidationError_Django
 from rest_framework.exceptions import ValidationError, MethodNotAllowed, NotFound
+from rest_framework.decorators import action
+from rest_framework.response import Response
+from core.citizen.models import Citizen
 from core.association.models import Association
 from core.abstract.viewset import AbstractModelViewSet, AbstractGranteeModelViewSet, AbstractAdministratorModelViewSet, AbstractSiteManagerModelViewSet
 from core.association.serializers import AdministratorAssociationModelSerializer, SiteManagerAssociationModelSerializer
 from core.association.models import Association
 from core.grantee.serializers import AdministratorGranteeSerializer, SiteManagerGranteeSerializer
-from core.servicePermissions.models import AssociationPermission, DepartmentPermission, PublicServicePermission
-from core.serviceSession.serializers import SiteManagerServiceSessionSerializer
-from core.abstract.serializers import AbstractModelSerializer
-from core.request.models import Request
+from .access import PublicServiceAccessQuery
+from .matrix import current_matrix
 from .serializers import CitizenPublicServiceSerializer, GranteePublicServiceSerializer, AdministratorPublicServiceSerializer, SiteManagerPublicServiceSerializer
-from django.utils import timezone as djTimezone
-from django.db.utils import IntegrityError
-import ipaddress
 
 # Create your views here.
 class CitizenPublicServiceViewSet(AbstractModelViewSet):
     http_method_names : tuple[str] = ('get',)
     serializer_class = CitizenPublicServiceSerializer
+    filter_relations = ('Association__Department',)
 
     def get_object(self):
         id = self.kwargs['pk']
-        obj = None
-        for func in [self.getQ_PublicService_UnRestricted, self.getQ_PublicService_Granted, self.getQ_PublicService_Association, self.getQ_PublicService_Department, self.getQ_PublicService_Service]:
-            try:
-                obj = func().get(PublicId=id)
-                if obj:break
-            except (ObjectDoesNotExist, ValidationError_Django, ValueError, TypeError):
-                continue
-        if obj:
-            self.check_object_permissions(self.request, obj)
-            return obj
-        raise NotFound("Service Not Found")
-    
-    def createSessions(self, obj):
         try:
-            raw_ip = self.get_client_ip()
-            client_ip = self.normalize_ip(raw_ip)
-            dt = djTimezone.now()
-            formatted = dt.strftime('%Y-%m-%dT%H:%M:%S.%fZ')
-            data = {
-                "Citizen": self.request.user.PublicId.hex,
-                "Service": obj.PublicId.hex,
-                "IpAddress": client_ip,
-                "LastSeen": formatted,
-            }        
-            serializer : AbstractModelSerializer = SiteManagerServiceSessionSerializer(data=data)
-            serializer.is_valid(raise_exception=True)
-            self.perform_create(serializer=serializer)
-            print('created session')
-        except(IntegrityError):
-            raise ValidationError('Invalid Data: make sure that all referenced data follows the guidelines')
-
-        
-
-    def getQ_PublicService_Service(self):
-        publicServicePermissions = PublicServicePermission.objects.filter(Citizens=self.request.user)
-        publicServices = []
-        for permission in publicServicePermissions:
-            publicServices.append(permission.PublicId.hex)
-        queries = self.get_queries()
-        queries["PublicId__in"] = publicServices
-        objects = self.serializer_class.Meta.model.objects.filter(**queries)
-        return objects
-
-    def getQ_PublicService_Association(self):
-        associationPermission = AssociationPermission.objects.filter(Citizens=self.request.user)
-        associations = []
-        for permission in associationPermission:
-            associations.append(permission.Association)
-        queries = self.get_queries()
-        queries["Association__in"] = associations
-        objects = self.serializer_class.Meta.model.objects.filter(**queries)
-        return objects
-
-    def getQ_PublicService_Department(self):
-        departmentPermissions = DepartmentPermission.objects.filter(Citizens=self.request.user)
-        departments = []
-        for permission in departmentPermissions:
-            departments.append(permission.Department)
-        associations = Association.objects.filter(Department__in=departments)
-        queries = self.get_queries()
-        queries["Association__in"] = associations
-        objects = self.serializer_class.Meta.model.objects.filter(**queries)
-        return objects
+            obj = self.getQ_PublicService_Accessible().get(PublicId=id)
+        except (ObjectDoesNotExist, ValidationError_Django, ValueError, TypeError):
+            raise NotFound("Service Not Found")
+        self.check_object_permissions(self.request, obj)
+        return obj
     
-    def getQ_PublicService_UnRestricted(self):
+    def getQ_PublicService_Accessible(self):
         queries = self.get_queries()
-        queries['Restricted'] = False
-        queries['Visibility'] = True
-        objects = self.serializer_class.Meta.model.objects.filter(**queries)
-        return objects
+        objects = self.serializer_class.Meta.model.objects.filter(**queries).select_related('Association__Department')
+        return PublicServiceAccessQuery(self.request.user).filter(objects)
 
-    def getQ_PublicService_Restricted(self):
-        queries = self.get_queries()
-        queries['Restricted'] = True
-        queries['Visibility'] = True
-        return self.serializer_class.Meta.model.objects.filter(**queries)
-    
-    def getQ_PublicService_Granted(self):
-        requests = Request.objects.filter(Citizen__PublicId=self.request.user.PublicId.hex)
-        services = []
-        for req in requests:
-            if hasattr(req, 'grant'):
-                if req.grant.granted:
-                    services.append(req.PublicService.PublicId)
+    def getQ_PublicService_Visible(self):
         queries = self.get_queries()
-        queries['PublicId__in'] = services
-        return self.serializer_class.Meta.model.objects.filter(**queries)
+        objects = self.serializer_class.Meta.model.objects.filter(**queries).select_related('Association__Department')
+        return PublicServiceAccessQuery(self.request.user).visible(objects)
 
     def get_queryset(self):
-        by_association_permission = self.getQ_PublicService_Association()
-        by_department_permission = self.getQ_PublicService_Department()
-        by_service_permission = self.getQ_PublicService_Service()
-        by_publicity = self.getQ_PublicService_UnRestricted()
-        by_grant = self.getQ_PublicService_Granted()
-        objects =  by_publicity.union(by_department_permission).union(by_association_permission).union(by_service_permission).union(by_grant)
-        for obj in objects:
-            self.createSessions(obj)
-        by_restriction = self.getQ_PublicService_Restricted()
-        return objects.union(by_restriction)
-    
-    def normalize_ip(self, ip_str):
-        try:
-            ip = ipaddress.ip_address(ip_str)
-            # Convert IPv6 loopback (::1) to IPv4 loopback
-            if ip.is_loopback and ip.version == 6:
-                return "127.0.0.1"
-
-            # Convert IPv6-mapped IPv4 (::ffff:x.x.x.x) to x.x.x.x
-            if ip.version == 6 and ip.ipv4_mapped:
-                return str(ip.ipv4_mapped)
-
-            # Return the normalized IP string (IPv4 or IPv6)
-            return str(ip)
-        except ValueError:
-            # Invalid IP, return as-is
-            return ip_str
-
-    def get_client_ip(self):
-        # Check for X-Forwarded-For header first (standard for proxies)
-        ip = self.request.META.get('HTTP_X_FORWARDED_FOR')
-        if ip:
-            # X-Forwarded-For can contain multiple IPs (client, proxy1, proxy2, ...)
-            # The first one is the original client IP
-            ips = [x.strip() for x in ip.split(',')]
-            if ips:
-                return ips[0]
-
-        # Try other common headers
-        ip = self.request.META.get('HTTP_X_REAL_IP')
-        if ip:
-            return ip
-
-        # Try X-Client-IP (used by some CDNs and proxies)
-        ip = self.request.META.get('HTTP_X_CLIENT_IP')
-        if ip:
-            return ip
-
-        # Use REMOTE_ADDR as fallback
-        remote_addr = self.request.META.get('REMOTE_ADDR')
-        if remote_addr:
-            # REMOTE_ADDR includes port, so we need to strip it
-            # The format is usually 'IP_ADDRESS:PORT'
-            if ':' in remote_addr:
-                try:
-                    host, port = remote_addr.rsplit(':', 1)
-                    # Check if it's an IPv6 address that includes colons
-                    if '[' in host and ']' in host: # IPv6 literal
-                        return host.strip('[]')
-                    else: # IPv4 or simple hostname
-                        return host
-                except ValueError:
-                    # Fallback if splitting fails for some reason
-                    return remote_addr
-            return remote_addr
-
-        return "unknown"
+        return self.getQ_PublicService_Visible()
 
 
 class GranteePublicServiceViewSet(AbstractGranteeModelViewSet):
     http_method_names : tuple[str] = ('get',)
     serializer_class = GranteePublicServiceSerializer
+    filter_relations = ('Association__Department',)
 
     def get_queryset(self):
         queries = self.get_queries()
@@ -193,6 +56,7 @@ class GranteePublicServiceViewSet(AbstractGranteeModelViewSet):
 class AdministratorPublicServiceViewSet(AbstractAdministratorModelViewSet):
     http_method_names : tuple[str] = ('get', 'patch', 'post', 'delete')
     serializer_class = AdministratorPublicServiceSerializer
+    filter_relations = ('Association__Department',)
 
     def get_queryset(self):
         if hasattr(self.request.user.administrator, 'department'):
@@ -221,6 +85,7 @@ class AdministratorPublicServiceViewSet(AbstractAdministratorModelViewSet):
 class SiteManagerPublicServiceViewSet(AbstractSiteManagerModelViewSet):
     http_method_names : tuple[str] = ('get', 'patch', 'post', 'delete')
     serializer_class = SiteManagerPublicServiceSerializer
+    filter_relations = ('Association__Department',)
     @atomic
     def create(self, request, *args, **kwargs):
         association = request.data.pop('Association', False)
@@ -237,3 +102,29 @@ class SiteManagerPublicServiceViewSet(AbstractSiteManagerModelViewSet):
         request.data['Grantee'] = grantee
         return super().create(request, *args, **kwargs)
 
+
+    @action(detail=False, methods=['get'], url_path='access')
+    def access_report(self, request, *args, **kwargs):
+        """Citizens with access per service, filtered like the list (e.g. ?Association__Department__PublicId=).
+        With ?citizen=<PublicId> each row also says whether that citizen has access."""
+        matrix = current_matrix()
+        citizen = None
+        if 'citizen' in request.query_params:
+            citizen = Citizen.objects.filter(PublicId=request.query_params['citizen']).values_list('id', flat=True).first()
+            if citizen is None:
+                raise NotFound("Citizen Not Found")
+        report = []
+        for id, publicId, title in self.get_queryset().values_list('id', 'PublicId', 'Title'):
+            row = {'id': publicId.hex, 'Title': title, 'Citizens': matrix.count(id)}
+            if citizen is not None:
+                row['Allowed'] = matrix.allows(citizen, id)
+            report.append(row)
+        return Response({'At': matrix.at, 'Services': report})
+
+    @action(detail=True, methods=['get'], url_path='access')
+    def access_citizens(self, request, *args, **kwargs):
+        """PublicIds of every citizen with access to the service."""
+        service = self.get_object()
+        ids = current_matrix().column(service.id)
+        citizens = Citizen.objects.filter(id__in=ids).values_list('PublicId', flat=True)
+        return Response({'id': service.PublicId.hex, 'Citizens': [publicId.hex for publicId in citizens]})
@@ -2,7 +2,7 @@ from django.db import models
 from django.db.transaction import atomic
 from rest_framework.exceptions import APIException
 from core.abstract.models import AbstractManager, AbstractModel
-from core.grant.models import Grant
+from core.grant.models import Grant, grant_status
 
 # Create your models here.
 class RequestManager(AbstractManager):
@@ -19,7 +19,9 @@ class RequestManager(AbstractManager):
             return request
         except:
             raise APIException('Failed to create request')
-    pass
+
+    def with_grant_status(self, now=None):
+        return self.select_related('grant').annotate(GrantStatus=grant_status('grant__', now))
 
 class Request(AbstractModel):
     Subject = models.CharField(max_length=50)
@@ -1,22 +1,26 @@
-from rest_framework.serializers import SlugRelatedField
 from rest_framework.exceptions import APIException
 from core.abstract.serializers import AbstractModelSerializer
+from core.abstract.identity import IdentityRelatedField
 from core.citizen.models import Citizen
 from core.citizen.serializers import RequestCitizenSerializer
 from core.publicService.models import PublicService
 from core.publicService.serializers import RequestPublicServiceSerializer
+from core.grant.models import GRANT_GRANTED
 from .models import Request
 
 class CitizenRequestSerializer(AbstractModelSerializer):
-    Citizen = SlugRelatedField(queryset=Citizen.objects.all(), slug_field='PublicId')
-    PublicService = SlugRelatedField(queryset=PublicService.objects.all(), slug_field='PublicId')
+    Citizen = IdentityRelatedField(queryset=Citizen.objects.all())
+    PublicService = IdentityRelatedField(queryset=PublicService.objects.all())
 
     def to_representation(self, instance:Request):
         data = super().to_representation(instance)
         try:
             data['Citizen'] = RequestCitizenSerializer(instance.Citizen).data
             data['PublicService'] = RequestPublicServiceSerializer(instance.PublicService).data
-            if hasattr(instance, 'grant'):
+            if hasattr(instance, 'GrantStatus'):
+                data['Granted'] = instance.GrantStatus == GRANT_GRANTED
+                return data
+            elif hasattr(instance, 'grant'):
                 data['Granted'] = instance.grant.granted
                 return data
             else:
@@ -51,8 +55,8 @@ class SiteManagerRequestSerializer(AdministratorRequestSerializer):
     pass
 
 class GrantRequestSerializer(AbstractModelSerializer):
-    Citizen = SlugRelatedField(queryset=Citizen.objects.all(), slug_field='PublicId')
-    PublicService = SlugRelatedField(queryset=PublicService.objects.all(), slug_field='PublicId')
+    Citizen = IdentityRelatedField(queryset=Citizen.objects.all())
+    PublicService = IdentityRelatedField(queryset=PublicService.objects.all())
 
     def to_representation(self, instance):
         data = super().to_representation(instance)
@@ -3,13 +3,13 @@ from core.citizen.viewsets import CitizenViewSet, SiteManagerCitizenModelViewSet
 from core.siteManager.viewsets import SiteManagerModelViewSet
 from core.administrator.viewsets import SiteManagerAdministratorModelViewSet, AdministratorModelViewSet
 from core.grantee.viewset import AdministratorGranteeViewSet, GranteeModelsViewSet, SiteManagerGranteeViewSet
-from core.auth.viewsets import RegisterViewSet, LoginCitizenViewSet, RefreshViewSet, LoginSiteManagerViewSet, LoginAdministratorViewSet, LoginGranteeViewSet
+from core.auth.viewsets import RegisterViewSet, LoginCitizenViewSet, RefreshViewSet, LoginSiteManagerViewSet, LoginAdministratorViewSet, LoginGranteeViewSet, AuthorizeViewSet
 from core.department.viewsets import CitizenDepartmentViewSet, GranteeDepartmentViewSet, AdministratorDepartmentViewSet, SiteManagerDepartmentViewSet
 from core.association.viewsets import CitizenAssociationModelViewSet, GranteeAssociationModelViewSet, AdministratorAssociationModelViewSet, SiteManagerAssociationModelViewSet
 from core.publicService.viewset import CitizenPublicServiceViewSet, GranteePublicServiceViewSet, AdministratorPublicServiceViewSet, SiteManagerPublicServiceViewSet
 from core.request.viewsets import CitizenRequestViewSet, GranteeRequestViewSet, AdministratorRequestViewSet, SiteManagerRequestViewSet
 from core.grant.viewsets import CitizenGrantViewSet, GranteeGrantViewSet, AdministratorGrantViewSet, SiteManagerGrantViewSet
-from core.systemLog.viewsets import GranteeCitizenLogViewSet, AdministratorCitizenLogViewSet, AdministratorGranteeLogViewSet, SiteManagerCitizenLogViewSet, SiteManagerGranteeLogViewSet, SiteManagerAdministratorLogViewSet, SiteManagerManagerLogViewSet
+from core.systemLog.viewsets import GranteeCitizenLogViewSet, AdministratorCitizenLogViewSet, AdministratorGranteeLogViewSet, SiteManagerCitizenLogViewSet, SiteManagerGranteeLogViewSet, SiteManagerAdministratorLogViewSet, SiteManagerManagerLogViewSet, SiteManagerLogIngestViewSet, SiteManagerLogRollupViewSet, AdministratorLogRollupViewSet
 from core.serviceSession.viewset import SiteManagerServiceSessionViewSet, AdministratorServiceSessionViewSet, GranteeServiceSessionViewSet
 from core.servicePermissions.viewsets import (
     SiteManagerAssociationPermissionViewSet, SiteManagerPublicServicePermissionViewSet, SiteManagerDepartmentPermissionViewSet,
@@ -26,6 +26,7 @@ router.register(r'citizen', CitizenViewSet, basename='citizen')
 router.register(r'auth/register', RegisterViewSet, basename='auth-register')
 router.register(r'auth/login', LoginCitizenViewSet, basename='auth-login-citizen')
 router.register(r'auth/refresh', RefreshViewSet, basename='auth-refresh-citizen')
+router.register(r'authorize', AuthorizeViewSet, basename='authorize')
 router.register(r'department', CitizenDepartmentViewSet, basename='department')
 router.register(r'association', CitizenAssociationModelViewSet, basename='association')
 router.register(r'service', CitizenPublicServiceViewSet, basename='service')
@@ -49,6 +50,8 @@ router.register(r'manager/log/citizen', SiteManagerCitizenLogViewSet, basename='
 router.register(r'manager/log/grantee', SiteManagerGranteeLogViewSet, basename='manager-log-grantee')
 router.register(r'manager/log/administrator', SiteManagerAdministratorLogViewSet, basename='manager-log-administrator')
 router.register(r'manager/log/manager', SiteManagerManagerLogViewSet, basename='manager-log-manager')
+router.register(r'manager/log/bulk', SiteManagerLogIngestViewSet, basename='manager-log-bulk')
+router.register(r'manager/log/rollup', SiteManagerLogRollupViewSet, basename='manager-log-rollup')
 router.register(r'manager/permission/department', SiteManagerDepartmentPermissionViewSet, basename='manager-permission-department')
 router.register(r'manager/permission/association', SiteManagerAssociationPermissionViewSet, basename='manager-permission-association')
 router.register(r'manager/permission/service', SiteManagerPublicServicePermissionViewSet, basename='manager-permission-service')
@@ -67,6 +70,7 @@ router.register(r'admin/request', AdministratorRequestViewSet, basename='admin-r
 router.register(r'admin/grant', AdministratorGrantViewSet, basename='admin-grant')
 router.register(r'admin/log/citizen', AdministratorCitizenLogViewSet, basename='admin-log-citizen')
 router.register(r'admin/log/grantee', AdministratorGranteeLogViewSet, basename='admin-log-grantee')
+router.register(r'admin/log/rollup', AdministratorLogRollupViewSet, basename='admin-log-rollup')
 router.register(r'admin/permission/department', AdministratorDepartmentPermissionViewSet, basename='admin-permission-department')
 router.register(r'admin/permission/association', AdministratorAssociationPermissionViewSet, basename='admin-permission-association')
 router.register(r'admin/permission/service', AdministratorPublicServicePermissionViewSet, basename='admin-permission-service')
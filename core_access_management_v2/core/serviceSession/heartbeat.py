@@ -0,0 +1,105 @@
+from datetime import datetime
+from threading import Lock, Thread
+import atexit
+import logging
+import time
+from django.conf import settings
+from django.db import connection, close_old_connections
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+class HeartbeatBuffer:
+    """Write-behind LastSeen for ServiceSession.
+
+    Touches are coalesced per session id to the latest timestamp and written
+    every `interval` seconds (or once `max_pending` sessions are dirty) as one
+    UPDATE ... FROM (VALUES ...). Until then `last_seen` serves the buffered
+    value so expiry checks in this process never see an older LastSeen.
+    """
+
+    def __init__(self, interval: float = 5.0, max_pending: int = 5000):
+        self.interval = interval
+        self.max_pending = max_pending
+        self.pending : dict[int, datetime] = {}
+        self.seen : dict[int, datetime] = {}
+        self.lock = Lock()
+        self.worker : Thread | None = None
+
+    def __len__(self):
+        return len(self.pending)
+
+    def touch(self, session_id: int, at: datetime | None = None):
+        at = at or timezone.now()
+        with self.lock:
+            previous = self.pending.get(session_id)
+            if previous is None or previous < at:
+                self.pending[session_id] = at
+                self.seen[session_id] = at
+            due = len(self.pending) >= self.max_pending
+        if due:
+            self.flush()
+        else:
+            self.start()
+
+    def last_seen(self, session_id: int) -> datetime | None:
+        return self.seen.get(session_id)
+
+    def flush(self) -> int:
+        with self.lock:
+            pending, self.pending = self.pending, {}
+        if not pending:
+            return 0
+        from .models import ServiceSession, session_expires_at
+        table = connection.ops.quote_name(ServiceSession._meta.db_table)
+        values = ', '.join(['(%s::bigint, %s::timestamptz, %s::timestamptz)'] * len(pending))
+        params = [value for session_id, at in pending.items() for value in (session_id, at, session_expires_at(at))]
+        sql = (
+            f'UPDATE {table} SET "LastSeen" = GREATEST({table}."LastSeen", v.seen), '
+            f'"ExpiresAt" = GREATEST({table}."ExpiresAt", v.expires), "Updated" = %s '
+            f'FROM (VALUES {values}) AS v(id, seen, expires) WHERE {table}."id" = v.id'
+        )
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(sql, [timezone.now(), *params])
+        except Exception:
+            # put the touches back so the next flush retries them
+            with self.lock:
+                for session_id, at in pending.items():
+                    if self.pending.get(session_id, at) <= at:
+                        self.pending[session_id] = at
+            raise
+        with self.lock:
+            for session_id, at in pending.items():
+                # once written, the row is at least as new as the buffer
+                if self.seen.get(session_id) == at and session_id not in self.pending:
+                    del self.seen[session_id]
+        return len(pending)
+
+    def start(self):
+        if self.worker is not None or self.interval <= 0:
+            return
+        with self.lock:
+            if self.worker is not None:
+                return
+            self.worker = Thread(target=self.run, name='session-heartbeat', daemon=True)
+            self.worker.start()
+
+    def run(self):
+        while True:
+            time.sleep(self.interval)
+            try:
+                self.flush()
+            except Exception:
+                logger.exception('Session heartbeat flush failed')
+            finally:
+                close_old_connections()
+
+heartbeats = HeartbeatBuffer(**getattr(settings, 'SESSION_HEARTBEAT', {}))
+
+@atexit.register
+def flush_on_exit():
+    try:
+        heartbeats.flush()
+    except Exception:
+        logger.exception('Session heartbeat flush at exit failed')
@@ -0,0 +1,33 @@
+# Generated by Django 5.1.5 on 2026-10-18 10:03
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('publicService', '0005_serviceaccess'),
+        ('serviceSession', '0004_alter_servicesession_citizen_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        # keep only the most recently seen live session per (Citizen, Service, IpAddress)
+        migrations.RunSQL(
+            sql="""
+                DELETE FROM "serviceSession_servicesession" older
+                USING "serviceSession_servicesession" newer
+                WHERE NOT older."EnforceExpiry" AND NOT newer."EnforceExpiry"
+                  AND older."Citizen_id" = newer."Citizen_id"
+                  AND older."Service_id" = newer."Service_id"
+                  AND older."IpAddress" = newer."IpAddress"
+                  AND (COALESCE(older."LastSeen", older."Created"), older."id") < (COALESCE(newer."LastSeen", newer."Created"), newer."id")
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.AddConstraint(
+            model_name='servicesession',
+            constraint=models.UniqueConstraint(condition=models.Q(('EnforceExpiry', False)), fields=('Citizen', 'Service', 'IpAddress'), name='servicesession_live_unique'),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.1.5 on 2026-10-18 10:16
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import F
+
+
+def backfill_expires_at(apps, schema_editor):
+    from core.serviceSession.models import session_lifetime
+    lifetime = session_lifetime()
+    if lifetime is None:
+        return
+    ServiceSession = apps.get_model('serviceSession', 'ServiceSession')
+    ServiceSession.objects.filter(LastSeen__isnull=False).update(ExpiresAt=F('LastSeen') + lifetime)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('publicService', '0005_serviceaccess'),
+        ('serviceSession', '0005_servicesession_live_unique'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='servicesession',
+            name='ExpiresAt',
+            field=models.DateTimeField(null=True),
+        ),
+        migrations.RunPython(backfill_expires_at, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='servicesession',
+            index=models.Index(condition=models.Q(('EnforceExpiry', False)), fields=['Service', 'IpAddress', 'ExpiresAt'], name='servicesession_live_idx'),
+        ),
+    ]
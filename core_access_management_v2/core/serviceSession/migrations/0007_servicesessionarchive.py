@@ -0,0 +1,51 @@
+# Generated by Django 5.1.5 on 2026-10-18 10:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('serviceSession', '0006_servicesession_expiresat'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ServiceSessionArchive',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('PublicId', models.UUIDField()),
+                ('Created', models.DateTimeField()),
+                ('Updated', models.DateTimeField()),
+                ('IpAddress', models.CharField(max_length=19)),
+                ('LastSeen', models.DateTimeField(null=True)),
+                ('ExpiresAt', models.DateTimeField(null=True)),
+                ('EnforceExpiry', models.BooleanField(default=False)),
+                ('ArchivedAt', models.DateTimeField()),
+            ],
+            options={
+                'managed': False,
+            },
+        ),
+        migrations.RunSQL(
+            sql="""
+                CREATE TABLE "serviceSession_servicesessionarchive" (
+                    "id" bigint NOT NULL,
+                    "PublicId" uuid NOT NULL,
+                    "Created" timestamp with time zone NOT NULL,
+                    "Updated" timestamp with time zone NOT NULL,
+                    "Citizen_id" bigint NOT NULL,
+                    "Service_id" bigint NOT NULL,
+                    "IpAddress" varchar(19) NOT NULL,
+                    "LastSeen" timestamp with time zone NULL,
+                    "ExpiresAt" timestamp with time zone NULL,
+                    "EnforceExpiry" boolean NOT NULL,
+                    "ArchivedAt" timestamp with time zone NOT NULL,
+                    PRIMARY KEY ("id", "Created")
+                ) PARTITION BY RANGE ("Created");
+                CREATE INDEX "servicesessionarchive_citizen_idx" ON "serviceSession_servicesessionarchive" ("Citizen_id", "Created");
+                CREATE INDEX "servicesessionarchive_service_idx" ON "serviceSession_servicesessionarchive" ("Service_id", "Created");
+            """,
+            reverse_sql='DROP TABLE "serviceSession_servicesessionarchive";',
+        ),
+    ]
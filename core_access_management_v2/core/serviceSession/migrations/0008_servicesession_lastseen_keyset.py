@@ -0,0 +1,34 @@
+# Generated by Django 5.1.5 on 2026-10-18 11:38
+
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import F
+
+
+def backfill_last_seen(apps, schema_editor):
+    # sessions that never reported a heartbeat count as last seen when they opened
+    ServiceSession = apps.get_model('serviceSession', 'ServiceSession')
+    ServiceSession.objects.filter(LastSeen__isnull=True).update(LastSeen=F('Created'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('publicService', '0006_serviceaccess_backfill'),
+        ('serviceSession', '0007_servicesessionarchive'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_last_seen, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='servicesession',
+            name='LastSeen',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AddIndex(
+            model_name='servicesession',
+            index=models.Index(condition=models.Q(('EnforceExpiry', False)), fields=['-LastSeen', '-id'], name='servicesession_lastseen_idx'),
+        ),
+    ]
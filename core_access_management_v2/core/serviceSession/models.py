@@ -1,37 +1,244 @@
-from django.db import models
+from datetime import date, datetime, timedelta
+from django.db import models, connection, transaction
+from django.db.models import Q
 from django.conf import settings
 from django.utils import timezone
 from core.abstract.models import AbstractModel, AbstractManager
+from core.abstract.partitions import DailyPartitions
+from .heartbeat import heartbeats
+import uuid
+
+def session_lifetime() -> timedelta | None:
+    sessionHours : int | None = getattr(settings, "DEFAULT_SESSION_TIME", None)
+    return None if sessionHours is None else timedelta(hours=sessionHours)
+
+def session_expires_at(lastSeen: datetime | None) -> datetime | None:
+    lifetime = session_lifetime()
+    if lastSeen is None or lifetime is None:
+        return None
+    return lastSeen + lifetime
 
 # Create your models here.
-class ServiceSessionManager(AbstractManager):
+class ServiceSessionQuerySet(models.QuerySet):
+
+    def active(self, now: datetime | None = None):
+        """Live sessions: not force-expired and ExpiresAt still ahead.
+
+        Heartbeats still in the buffer are not consulted, so a session touched
+        just before it expired can drop out of lists for up to one flush interval.
+        """
+        queryset = self.filter(EnforceExpiry=False)
+        if session_lifetime() is None:
+            return queryset
+        return queryset.filter(ExpiresAt__gt=now or timezone.now())
+
+class ServiceSessionManager(AbstractManager.from_queryset(ServiceSessionQuerySet)):
+    upsert_fields = ('PublicId', 'Created', 'Updated', 'Citizen', 'Service', 'IpAddress', 'LastSeen', 'ExpiresAt', 'EnforceExpiry')
 
     def create(self, **kwargs):
-        kwargs['LastSeen'] = timezone.now()
-        return super().create(**kwargs)
+        if kwargs.get('EnforceExpiry', False):
+            kwargs['LastSeen'] = timezone.now()
+            kwargs['ExpiresAt'] = session_expires_at(kwargs['LastSeen'])
+            return super().create(**kwargs)
+        return self.upsert(kwargs['Citizen'], kwargs['Service'], kwargs['IpAddress'])
+
+    def upsert(self, Citizen, Service, IpAddress, LastSeen=None):
+        """Bump the live session of (Citizen, Service, IpAddress), opening it when there is none."""
+        ids = self.bulk_upsert([(Citizen.pk, Service.pk, IpAddress, LastSeen or timezone.now())])
+        session : ServiceSession = self.get(id=ids[0])
+        session.Citizen, session.Service = Citizen, Service
+        return session
+
+    def bulk_upsert(self, rows) -> list[int]:
+        """Write (citizen_id, service_id, ip_address, last_seen) rows with a single
+        INSERT ... ON CONFLICT against the live session constraint. Rows repeating a
+        (citizen_id, service_id, ip_address) are merged first, keeping the latest
+        last_seen, as one statement cannot update a row twice; returns the session ids."""
+        latest : dict[tuple, datetime] = {}
+        for citizen, service, ipAddress, lastSeen in rows:
+            key = (citizen, service, ipAddress)
+            if key not in latest or lastSeen > latest[key]:
+                latest[key] = lastSeen
+        rows = [(*key, lastSeen) for key, lastSeen in latest.items()]
+        if not rows:
+            return []
+        meta = self.model._meta
+        columns = ', '.join(connection.ops.quote_name(meta.get_field(name).column) for name in self.upsert_fields)
+        placeholders = '(' + ', '.join(['%s'] * len(self.upsert_fields)) + ')'
+        now = timezone.now()
+        params = []
+        for citizen, service, ipAddress, lastSeen in rows:
+            params.extend([uuid.uuid4(), now, now, citizen, service, ipAddress, lastSeen, session_expires_at(lastSeen), False])
+        table = connection.ops.quote_name(meta.db_table)
+        sql = (
+            f'INSERT INTO {table} ({columns}) VALUES {", ".join([placeholders] * len(rows))} '
+            f'ON CONFLICT ("Citizen_id", "Service_id", "IpAddress") WHERE NOT "EnforceExpiry" '
+            f'DO UPDATE SET "LastSeen" = GREATEST({table}."LastSeen", EXCLUDED."LastSeen"), '
+            f'"ExpiresAt" = GREATEST({table}."ExpiresAt", EXCLUDED."ExpiresAt"), "Updated" = EXCLUDED."Updated" '
+            f'RETURNING "id"'
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return [row[0] for row in cursor.fetchall()]
+
+    def touch(self, touches) -> dict[int, tuple]:
+        """Apply (PublicId, CitizenPublicId, ServicePublicId, IpAddress, seen) heartbeats in one UPDATE.
+        A touch names a session either by PublicId or by (Citizen, Service, IpAddress); the other fields are None.
+        Sessions that were no longer live at their observed time are left alone.
+        Returns {touch index: (session PublicId, ExpiresAt)} for the touches that hit a live session."""
+        if not touches:
+            return {}
+        meta = self.model._meta
+        table = connection.ops.quote_name(meta.db_table)
+        citizens = connection.ops.quote_name(meta.get_field('Citizen').related_model._meta.db_table)
+        services = connection.ops.quote_name(meta.get_field('Service').related_model._meta.db_table)
+        values = ', '.join(['(%s::int, %s::uuid, %s::uuid, %s::uuid, %s::varchar, %s::timestamptz)'] * len(touches))
+        params = [value for index, touch in enumerate(touches) for value in (index, *touch)]
+        sql = (
+            f'WITH v(idx, pid, citizen, service, ip, seen) AS (VALUES {values}), '
+            f'targets AS ('
+            f'SELECT s."id", v.idx, v.seen FROM {table} s JOIN v ON s."PublicId" = v.pid '
+            f'UNION ALL '
+            f'SELECT s."id", v.idx, v.seen FROM v '
+            f'JOIN {citizens} c ON c."PublicId" = v.citizen JOIN {services} p ON p."PublicId" = v.service '
+            f'JOIN {table} s ON s."Citizen_id" = c."id" AND s."Service_id" = p."id" AND s."IpAddress" = v.ip AND NOT s."EnforceExpiry"'
+            f'), '
+            f'touched AS (SELECT "id", MAX(seen) AS seen, ARRAY_AGG(idx) AS idxs FROM targets GROUP BY "id") '
+            f'UPDATE {table} SET "LastSeen" = GREATEST({table}."LastSeen", touched.seen), '
+            f'"ExpiresAt" = GREATEST({table}."ExpiresAt", touched.seen + %s::interval), "Updated" = %s '
+            f'FROM touched WHERE {table}."id" = touched."id" AND NOT {table}."EnforceExpiry" '
+            f'AND (%s::interval IS NULL OR {table}."ExpiresAt" >= touched.seen) '
+            f'RETURNING touched.idxs, {table}."PublicId", {table}."ExpiresAt"'
+        )
+        lifetime = session_lifetime()
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [*params, lifetime, timezone.now(), lifetime])
+            return {index: (publicId, expiresAt) for indexes, publicId, expiresAt in cursor.fetchall() for index in indexes}
 
-    pass
+    def expired_condition(self, before: datetime) -> tuple[str, list]:
+        """SQL for sessions that expired before `before`, by ExpiresAt or by being force-expired."""
+        condition, params = '("EnforceExpiry" AND "Updated" < %s)', [before]
+        if session_lifetime() is not None:
+            condition += ' OR "ExpiresAt" < %s OR ("ExpiresAt" IS NULL AND "Updated" < %s)'
+            params += [before, before]
+        return f'({condition})', params
+
+    def archive_expired(self, batch_size: int = 1000, max_batches: int = 100, before: datetime | None = None) -> int:
+        """Move sessions that expired before `before` into ServiceSessionArchive, one transaction per batch.
+        Returns the number of rows moved."""
+        before = before or timezone.now()
+        meta = self.model._meta
+        table = connection.ops.quote_name(meta.db_table)
+        archive = connection.ops.quote_name(ServiceSessionArchive._meta.db_table)
+        columns = ', '.join(connection.ops.quote_name(field.column) for field in meta.concrete_fields)
+        condition, params = self.expired_condition(before)
+        moved = 0
+        for _ in range(max_batches):
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.execute(
+                    f'SELECT "id", date_trunc(\'day\', "Created" AT TIME ZONE \'UTC\')::date FROM {table} '
+                    f'WHERE {condition} ORDER BY "id" LIMIT %s FOR UPDATE SKIP LOCKED',
+                    [*params, batch_size]
+                )
+                rows = cursor.fetchall()
+                if not rows:
+                    break
+                ServiceSessionArchive.objects.ensure_partitions({day for _, day in rows})
+                cursor.execute(
+                    f'WITH moved AS (DELETE FROM {table} WHERE "id" = ANY(%s) RETURNING {columns}) '
+                    f'INSERT INTO {archive} ({columns}, "ArchivedAt") SELECT {columns}, %s FROM moved',
+                    [[id for id, _ in rows], timezone.now()]
+                )
+                moved += cursor.rowcount
+            if len(rows) < batch_size:
+                break
+        return moved
 
 class ServiceSession(AbstractModel):
     Citizen = models.ForeignKey(to='citizen.Citizen', on_delete=models.CASCADE)
     Service = models.ForeignKey(to='publicService.PublicService', on_delete=models.CASCADE)
     IpAddress = models.CharField(max_length=19)
-    LastSeen = models.DateTimeField(null=True)
+    LastSeen = models.DateTimeField(default=timezone.now)
+    ExpiresAt = models.DateTimeField(null=True)
     EnforceExpiry = models.BooleanField(default=False)
 
     objects : ServiceSessionManager = ServiceSessionManager()
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['Citizen', 'Service', 'IpAddress'], condition=Q(EnforceExpiry=False), name='servicesession_live_unique'
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['Service', 'IpAddress', 'ExpiresAt'], condition=Q(EnforceExpiry=False), name='servicesession_live_idx'),
+            # the keyset of the live session lists, most recently seen first
+            models.Index(fields=['-LastSeen', '-id'], condition=Q(EnforceExpiry=False), name='servicesession_lastseen_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        self.ExpiresAt = session_expires_at(self.LastSeen)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'LastSeen' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'ExpiresAt'}
+        return super().save(*args, **kwargs)
+
+    @property
+    def last_seen(self):
+        """LastSeen including a heartbeat still buffered in this process."""
+        buffered = heartbeats.last_seen(self.pk)
+        if buffered is not None and (self.LastSeen is None or buffered > self.LastSeen):
+            return buffered
+        return self.LastSeen
+
+    @property
+    def expires_at(self):
+        """ExpiresAt including a heartbeat still buffered in this process."""
+        return session_expires_at(self.last_seen)
+
     @property
     def expired(self):
-        try:
-            sessionHours: int = getattr(settings, "DEFAULT_SESSION_TIME", None)
-
-            if self.EnforceExpiry:
-                return True
-            if sessionHours is None:
-                return False
-            
-            expiration_time = self.LastSeen + timezone.timedelta(hours=sessionHours)
-            return timezone.now() > expiration_time
-        except:
-            return True
\ No newline at end of file
+        if self.EnforceExpiry:
+            return True
+        if session_lifetime() is None:
+            return False
+        expiresAt = self.expires_at
+        return expiresAt is None or timezone.now() > expiresAt
+
+
+class ServiceSessionArchiveManager(models.Manager):
+    """Day partitions of the archive, range-partitioned on Created (UTC days)."""
+
+    @property
+    def day_partitions(self) -> DailyPartitions:
+        return DailyPartitions(self.model._meta.db_table)
+
+    def partitions(self) -> dict[date, str]:
+        return self.day_partitions.partitions()
+
+    def ensure_partitions(self, days):
+        self.day_partitions.ensure(days)
+
+    def drop_partitions(self, before: date) -> int:
+        """Drop whole day partitions older than `before`; returns how many were dropped."""
+        return len(self.day_partitions.drop_before(before))
+
+class ServiceSessionArchive(models.Model):
+    """Expired sessions moved out of the live table by the session sweeper.
+    The table is created by migration as a PostgreSQL table partitioned by Created day."""
+    id = models.BigIntegerField(primary_key=True)
+    PublicId = models.UUIDField()
+    Created = models.DateTimeField()
+    Updated = models.DateTimeField()
+    Citizen = models.ForeignKey(to='citizen.Citizen', on_delete=models.DO_NOTHING, db_constraint=False)
+    Service = models.ForeignKey(to='publicService.PublicService', on_delete=models.DO_NOTHING, db_constraint=False)
+    IpAddress = models.CharField(max_length=19)
+    LastSeen = models.DateTimeField(null=True)
+    ExpiresAt = models.DateTimeField(null=True)
+    EnforceExpiry = models.BooleanField(default=False)
+    ArchivedAt = models.DateTimeField()
+
+    objects : ServiceSessionArchiveManager = ServiceSessionArchiveManager()
+
+    class Meta:
+        managed = False
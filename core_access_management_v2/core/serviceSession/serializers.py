@@ -1,5 +1,6 @@
 from rest_framework import serializers
 from core.abstract.serializers import AbstractModelSerializer
+from core.abstract.identity import IdentityRelatedField
 from core.citizen.models import Citizen as CitizenModel
 from core.publicService.models import PublicService
 from core.citizen.serializers import ServiceSessionCitizenSerializer
@@ -8,8 +9,8 @@ from .models import ServiceSession
 
 class GranteeServiceSessionSerializer(AbstractModelSerializer):
 
-    Citizen = serializers.SlugRelatedField(queryset=CitizenModel.objects.all(), slug_field="PublicId")
-    Service = serializers.SlugRelatedField(queryset=PublicService.objects.all(), slug_field="PublicId")
+    Citizen = IdentityRelatedField(queryset=CitizenModel.objects.all())
+    Service = IdentityRelatedField(queryset=PublicService.objects.all())
     Expired = serializers.SerializerMethodField()
 
     def get_Expired(self, serviceSession : ServiceSession) -> bool:
@@ -17,6 +18,7 @@ class GranteeServiceSessionSerializer(AbstractModelSerializer):
 
     def to_representation(self, instance) -> dict:
         data = super().to_representation(instance)
+        data['LastSeen'] = self.fields['LastSeen'].to_representation(instance.last_seen) if instance.last_seen else None
         data['Citizen'] = ServiceSessionCitizenSerializer(instance.Citizen).data
         data['Service'] = ServiceSessionPublicServiceSerializer(instance.Service).data
         return data
@@ -49,4 +51,36 @@ class SiteManagerServiceSessionSerializer(GranteeServiceSessionSerializer):
         ]
         read_only_fields : list[str] = [
             'id', 'Created', 'Expired', 'Updated'
-        ]
\ No newline at end of file
+        ]
+        # creating a session for a live (Citizen, Service, IpAddress) refreshes it, see ServiceSessionManager.create
+        validators : list = []
+
+class AuthorizeServiceSessionSerializer(AbstractModelSerializer):
+    Expired = serializers.SerializerMethodField()
+
+    def get_Expired(self, serviceSession : ServiceSession) -> bool:
+        return serviceSession.expired
+
+    class Meta:
+        model : ServiceSession = ServiceSession
+        fields : list[str] = [
+            'id', "IpAddress", 'LastSeen', 'Expired', 'Created', 'Updated'
+        ]
+        read_only_fields : list[str] = [
+            'id', "IpAddress", 'LastSeen', 'Expired', 'Created', 'Updated'
+        ]
+
+class SessionTouchItemSerializer(serializers.Serializer):
+    id = serializers.UUIDField(required=False)
+    Citizen = serializers.UUIDField(required=False)
+    Service = serializers.UUIDField(required=False)
+    IpAddress = serializers.CharField(max_length=19, required=False)
+    At = serializers.DateTimeField(required=False)
+
+    def validate(self, attrs):
+        if 'id' not in attrs and not all(key in attrs for key in ('Citizen', 'Service', 'IpAddress')):
+            raise serializers.ValidationError('Either id or Citizen, Service and IpAddress is required')
+        return attrs
+
+class SessionTouchSerializer(serializers.Serializer):
+    Sessions = SessionTouchItemSerializer(many=True, allow_empty=False, max_length=5000)
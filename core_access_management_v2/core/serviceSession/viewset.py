@@ -1,29 +1,72 @@
 from django.shortcuts import render
+from rest_framework.response import Response
+from rest_framework.decorators import action
+from core.abstract.export import ExportMixin
 from core.abstract.viewset import AbstractAdministratorModelViewSet, AbstractGranteeModelViewSet, AbstractSiteManagerModelViewSet
-from .serializers import SiteManagerServiceSessionSerializer, AdministratorServiceSessionSerializer, GranteeServiceSessionSerializer
+from .serializers import SiteManagerServiceSessionSerializer, AdministratorServiceSessionSerializer, GranteeServiceSessionSerializer, SessionTouchSerializer
+from .models import ServiceSession
+from .heartbeat import heartbeats
 from datetime import datetime, timezone
 from django.utils import timezone as djTimezone
 
 
 # Create your views here.
-class GranteeServiceSessionViewSet(AbstractGranteeModelViewSet):
+class LiveSessionListMixin:
+    """Lists return live sessions only, most recently seen first; a session is still reachable by id after it expires."""
+
+    def get_keyset(self) -> tuple:
+        # served by servicesession_lastseen_idx; a session seen again between pages moves back to the first page
+        return ('LastSeen', 'pk')
+
+    def get_queryset(self):
+        queryset = super().get_queryset().select_related('Citizen', 'Service')
+        if self.action == 'list':
+            queryset = queryset.active()
+        return queryset
+
+class GranteeServiceSessionViewSet(LiveSessionListMixin, AbstractGranteeModelViewSet):
     serializer_class = GranteeServiceSessionSerializer
     http_method_names = ('get')
 
 
-class AdministratorServiceSessionViewSet(AbstractAdministratorModelViewSet):
+class AdministratorServiceSessionViewSet(LiveSessionListMixin, AbstractAdministratorModelViewSet):
     serializer_class = AdministratorServiceSessionSerializer
     http_method_names = ('get')
 
-class SiteManagerServiceSessionViewSet(AbstractSiteManagerModelViewSet):
+class SiteManagerServiceSessionViewSet(ExportMixin, LiveSessionListMixin, AbstractSiteManagerModelViewSet):
     serializer_class = SiteManagerServiceSessionSerializer
     http_method_names = ('get', 'post', 'patch')
+    export_related = {'Citizen': ('UserName', 'NationalId'), 'Service': ('Title', 'MachineName')}
+    export_extra_fields = ('ExpiresAt',)
 
     def update(self, request, *args, **kwargs):
-        dt = djTimezone.now()
-        formatted = dt.strftime('%Y-%m-%dT%H:%M:%S.%fZ')
         if request.data == {}:
-            request.data["LastSeen"] =  formatted
-        elif hasattr(request.data , "LastSeen"):
-            outcome = request.data.pop("LastSeen")
-        return super().update(request, *args, **kwargs)
\ No newline at end of file
+            # an empty PATCH is the gateway's heartbeat: buffer it instead of writing the row
+            session = self.get_object()
+            heartbeats.touch(session.pk)
+            return Response(self.get_serializer(session).data)
+        if "LastSeen" in request.data:
+            request.data.pop("LastSeen")
+        return super().update(request, *args, **kwargs)
+
+    @action(detail=False, methods=['post'], url_path='touch')
+    def touch(self, request, *args, **kwargs):
+        """Apply a batch of gateway heartbeats in one statement; each entry reports whether its session is still valid."""
+        serializer = SessionTouchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        now = djTimezone.now()
+        items = serializer.validated_data['Sessions']
+        touches = [
+            (item.get('id'), item.get('Citizen'), item.get('Service'), item.get('IpAddress'), min(item.get('At') or now, now))
+            for item in items
+        ]
+        touched = ServiceSession.objects.touch(touches)
+        results = []
+        for index, item in enumerate(items):
+            publicId, expiresAt = touched.get(index, (item.get('id'), None))
+            results.append({
+                'id': publicId.hex if publicId else None,
+                'Valid': index in touched,
+                'ExpiresAt': expiresAt.isoformat() if expiresAt else None,
+            })
+        return Response({'Sessions': results})
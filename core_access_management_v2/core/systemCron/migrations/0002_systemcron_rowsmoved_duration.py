@@ -0,0 +1,28 @@
+# Generated by Django 5.1.5 on 2026-10-18 10:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('systemCron', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='systemcron',
+            name='Duration',
+            field=models.DurationField(null=True),
+        ),
+        migrations.AddField(
+            model_name='systemcron',
+            name='RowsMoved',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AlterField(
+            model_name='systemcron',
+            name='CronName',
+            field=models.CharField(choices=[('SaveSystemLog', 'SaveSystemLog'), ('SweepSessions', 'SweepSessions')], default='SaveSystemLog'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.5 on 2026-10-18 10:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('systemCron', '0002_systemcron_rowsmoved_duration'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='systemcron',
+            name='CronName',
+            field=models.CharField(choices=[('SaveSystemLog', 'SaveSystemLog'), ('SweepSessions', 'SweepSessions'), ('LogPartitions', 'LogPartitions')], default='SaveSystemLog'),
+        ),
+    ]
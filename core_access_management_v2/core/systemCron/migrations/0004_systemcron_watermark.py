@@ -0,0 +1,27 @@
+# Generated by Django 5.1.5 on 2026-10-18 10:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('systemCron', '0003_systemcron_logpartitions'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='systemcron',
+            name='Watermark',
+            field=models.DateTimeField(null=True),
+        ),
+        migrations.AlterField(
+            model_name='systemcron',
+            name='CronName',
+            field=models.CharField(choices=[('SaveSystemLog', 'SaveSystemLog'), ('SweepSessions', 'SweepSessions'), ('LogPartitions', 'LogPartitions'), ('LogRollup', 'LogRollup')], default='SaveSystemLog'),
+        ),
+        migrations.AddIndex(
+            model_name='systemcron',
+            index=models.Index(fields=['CronName', '-Created'], name='systemcron_name_idx'),
+        ),
+    ]
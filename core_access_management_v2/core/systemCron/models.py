@@ -2,14 +2,23 @@ from django.db import models
 from core.abstract.models import AbstractManager, AbstractModel
 from django.utils  import timezone
 systemLog = 'SaveSystemLog'
+sweepSessions = 'SweepSessions'
+logPartitions = 'LogPartitions'
+logRollup = 'LogRollup'
 cron_choices = [
-    (systemLog, 'SaveSystemLog')
+    (systemLog, 'SaveSystemLog'),
+    (sweepSessions, 'SweepSessions'),
+    (logPartitions, 'LogPartitions'),
+    (logRollup, 'LogRollup'),
 ]
 
 # Create your models here.
 class SystemCronManager(AbstractManager):
 
-    pass
+    def watermark(self, cronName: str):
+        """Where the last successful run of an incremental cron stopped."""
+        last = self.filter(CronName=cronName, Success=True, Watermark__isnull=False).order_by('-Created').first()
+        return last.Watermark if last else None
 
 class SystemCron(AbstractModel):
     CronName = models.CharField(choices=cron_choices, default=systemLog)
@@ -17,13 +26,23 @@ class SystemCron(AbstractModel):
     FinishedAt = models.DateTimeField()
     Success = models.BooleanField(default=False)
     Failure = models.BooleanField(default=False)
+    RowsMoved = models.IntegerField(default=0)
+    Duration = models.DurationField(null=True)
+    # incremental crons record how far they got; the next run resumes from here
+    Watermark = models.DateTimeField(null=True)
 
-    objects : SystemCronManager = SystemCronManager
+    objects : SystemCronManager = SystemCronManager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['CronName', '-Created'], name='systemcron_name_idx'),
+        ]
 
     def finish(self):
         self.FinishedAt = timezone.now()
+        self.Duration = self.FinishedAt - self.Created
         self.save()
         return str(self)
     def __str__(self):
-        return f'Cron:: \n\t{self.CronName}, \n\tMessage: {self.Message}, \n\tStarted: {self.Created}, \n\tFinished:{self.FinishedAt}, \n\tSuccess: {self.Success}, \n\tFailure: {self.Failure}'
+        return f'Cron:: \n\t{self.CronName}, \n\tMessage: {self.Message}, \n\tStarted: {self.Created}, \n\tFinished:{self.FinishedAt}, \n\tSuccess: {self.Success}, \n\tFailure: {self.Failure}, \n\tRows Moved: {self.RowsMoved}, \n\tDuration: {self.Duration}'
 
@@ -1,10 +1,12 @@
-from django_cron import CronJobBase, Schedule
 from django.utils import timezone
 from django.conf import settings
 import logging
-from core.systemCron.models import SystemCron, systemLog
-from core.systemLog.serializers import CitizenLogSerializer, SiteManagerLogSerializer, AdministratorLogSerializer, GranteeLogSerializer
-from core.abstract_circular.serializers import AbstractLogSerializer
+from core.systemCron.models import SystemCron, systemLog, sweepSessions, logPartitions, logRollup
+from core.serviceSession.models import ServiceSession, ServiceSessionArchive
+from datetime import timedelta
+from core.systemLog.consumer import SystemLogConsumer
+from core.systemLog.archive import archive
+from core.systemLog.models import CitizenLog, GranteeLog, AdministratorLog, SiteManagerLog, LogRollup
 from core.abstract.kafka import NewKafkaConsumer
 from celery import shared_task
 
@@ -12,54 +14,110 @@ logger = logging.getLogger(__name__)
 
 
 @shared_task
-def system_log_cron(self):
-    current_time = timezone.now()
-    logger.info(f'System Logs Began Saving at {current_time}')
-    cron : SystemCron = SystemCron.objects.create(CronName=systemLog, failure=True)
-    kafka_settings : dict[str: str | function ] = getattr(settings, 'SYSTEM_LOG_KAFKA_SETTINGS', None)
+def system_log_cron():
+    """Drain the system log topic into the log tables, see SystemLogConsumer."""
+    logger.info(f'System Logs Began Saving at {timezone.now()}')
+    cron : SystemCron = SystemCron.objects.create(CronName=systemLog, FinishedAt=timezone.now())
+    kafka_settings : dict | None = getattr(settings, 'SYSTEM_LOG_KAFKA_SETTINGS', None)
 
-    if kafka_settings == None:
+    if kafka_settings is None:
         cron.Message = 'kafka_settings not found'
         cron.Failure = True
-        cron.finish()
-        # self.stdout.write(self.style.ERROR(cron))
-        return
-    consumer = NewKafkaConsumer(**kafka_settings)
-    limit = kafka_settings.pop('limit', 300)
-    count = 0
-    for message in consumer:
-        if count >= limit:
-            break
-        data : dict = message.value
-        administrator = data.pop('Administrator', None)
-        siteManager = data.pop('SiteManager', None)
-        grantee = data.pop('SiteManager', None)
-        if (administrator != None ):
-            data['Administrator'] = administrator
-            outcome  = self.createLog(data, AdministratorLogSerializer)
-        if (siteManager != None ):
-            data['SiteManager'] = siteManager
-            outcome = self.createLog(data, SiteManagerLogSerializer)
-        if (grantee != None ):
-            data['Grantee'] = grantee
-            outcome = self.createLog(data, GranteeLogSerializer)
-        else:
-            outcome = self.createLog(data, CitizenLogSerializer)
-        if not outcome:
-            # self.stdout.write(self.style.ERROR('failed to createLog: \n'+data+'\n'))
-            pass
+        logger.error(cron.finish())
+        return 0
+    kafka_settings = dict(kafka_settings)
+    limit = kafka_settings.pop('limit', None)
+    batch_size = kafka_settings.pop('batch_size', 500)
+    consumer = None
+    try:
+        consumer = SystemLogConsumer(NewKafkaConsumer(**kafka_settings), batch_size=batch_size)
+        cron.RowsMoved = consumer.run(limit)
+        cron.Success = True
+        cron.Message = 'System Log has Been Processed'
+    except Exception as error:
+        logger.exception('System log consumption failed')
+        cron.Failure = True
+        cron.Message = str(error)
+    finally:
+        if consumer is not None:
+            consumer.close()
+    logger.info(cron.finish())
+    return cron.RowsMoved
+
+
+@shared_task
+def sweep_service_sessions():
+    """Move sessions expired for longer than the grace period into the day-partitioned archive
+    and drop archive partitions past retention."""
+    sweep_settings : dict = getattr(settings, 'SESSION_SWEEP_SETTINGS', {})
+    now = timezone.now()
+    cron : SystemCron = SystemCron.objects.create(CronName=sweepSessions, FinishedAt=now)
+    try:
+        cron.RowsMoved = ServiceSession.objects.archive_expired(
+            batch_size=sweep_settings.get('batch_size', 1000),
+            max_batches=sweep_settings.get('max_batches', 100),
+            # heartbeats buffered in other processes are flushed well within the grace period
+            before=now - timedelta(minutes=sweep_settings.get('grace_minutes', 10)),
+        )
+        dropped = ServiceSessionArchive.objects.drop_partitions((now - timedelta(days=sweep_settings.get('retention_days', 90))).date())
+        cron.Success = True
+        cron.Message = f'Archived {cron.RowsMoved} sessions, dropped {dropped} archive partitions'
+    except Exception as error:
+        logger.exception('Session sweep failed')
+        cron.Failure = True
+        cron.Message = str(error)
+    logger.info(cron.finish())
+    return cron.RowsMoved
 
-    consumer.close()
-    cron.Success = True
-    cron.Message = 'System Log has Been Processed'
-    finished = cron.finish()
-    # self.stdout.write(self.style.SUCCESS(finished))
 
-def createLog(data:dict, serializer_class: AbstractLogSerializer):
+@shared_task
+def maintain_log_partitions():
+    """Create the log day partitions ahead of time, move rows left in the default partition
+    into their days, and drop the partitions past retention, writing each to a log archive
+    segment first when `archive` is set."""
+    partition_settings : dict = getattr(settings, 'LOG_PARTITION_SETTINGS', {})
+    now = timezone.now()
+    before = (now - timedelta(days=partition_settings.get('retention_days', 90))).date()
+    cron : SystemCron = SystemCron.objects.create(CronName=logPartitions, FinishedAt=now)
+    removed = 0
     try:
-        serializer : AbstractLogSerializer = serializer_class(data=data)
-        serializer.is_valid(raise_exception=True)
-        serializer.save()
-        return True
-    except:
-        return False
\ No newline at end of file
+        for model in (CitizenLog, GranteeLog, AdministratorLog, SiteManagerLog):
+            partitions = model.objects.day_partitions
+            partitions.ensure_ahead(partition_settings.get('ahead_days', 7))
+            # otherwise retention, which only sees day partitions, would never reach them
+            partitions.ensure(partitions.default_days())
+            write = (lambda day, name, model=model: archive.write(model, day, name)) if partition_settings.get('archive', False) else None
+            removed += len(partitions.drop_before(before, on_remove=write))
+        cron.Success = True
+        cron.Message = f'{"Archived and dropped" if partition_settings.get("archive", False) else "Dropped"} {removed} log partitions older than {before}'
+    except Exception as error:
+        logger.exception('Log partition maintenance failed')
+        cron.Failure = True
+        cron.Message = str(error)
+    logger.info(cron.finish())
+    return removed
+
+
+@shared_task
+def rollup_logs():
+    """Roll the logs written since the last run's watermark into LogRollup, catching up at most
+    `max_span_hours` per run, and prune minute rollups past `minute_retention_days`."""
+    rollup_settings : dict = getattr(settings, 'LOG_ROLLUP_SETTINGS', {})
+    now = timezone.now()
+    cron : SystemCron = SystemCron.objects.create(CronName=logRollup, FinishedAt=now)
+    try:
+        # rows are stamped with Created before they commit, so stay `lag_seconds` behind to let them land
+        end = (now - timedelta(seconds=rollup_settings.get('lag_seconds', 120))).replace(second=0, microsecond=0)
+        start = SystemCron.objects.watermark(logRollup) or end - timedelta(days=rollup_settings.get('backfill_days', 7))
+        end = min(end, start + timedelta(hours=rollup_settings.get('max_span_hours', 6)))
+        cron.RowsMoved = LogRollup.objects.refresh(start, end) if start < end else 0
+        cron.Watermark = max(start, end)
+        pruned = LogRollup.objects.prune(now - timedelta(days=rollup_settings.get('minute_retention_days', 14)))
+        cron.Success = True
+        cron.Message = f'Rolled up logs from {start} to {end}, pruned {pruned} minute rollups'
+    except Exception as error:
+        logger.exception('Log rollup failed')
+        cron.Failure = True
+        cron.Message = str(error)
+    logger.info(cron.finish())
+    return cron.RowsMoved
@@ -5,3 +5,8 @@ class SystemlogConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core.systemLog'
     label = 'systemLog'
+
+    def ready(self):
+        from prometheus_client import REGISTRY
+        from .metrics import LogRollupCollector
+        REGISTRY.register(LogRollupCollector())
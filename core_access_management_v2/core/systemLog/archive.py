@@ -0,0 +1,310 @@
+from bisect import bisect_left
+from collections import Counter
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from pathlib import Path
+from threading import Lock
+import json
+import mmap
+import os
+import struct
+import sys
+import uuid
+import zlib
+from array import array
+from django.conf import settings
+from django.db import connection
+from django.utils.dateparse import parse_date, parse_datetime
+
+MAGIC = b'CAMSEG1\n'
+EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+NULL_STATUS = -2 ** 31
+# fixed-width columns, stored raw so a mapped segment is read in place
+NUMERIC_COLUMNS = (('id', 'q'), ('Created', 'q'), ('Updated', 'q'), ('Citizen_id', 'q'), ('StatusCode', 'i'))
+# repetitive strings, stored as uint32 codes into a zlib-compressed dictionary
+CODED_COLUMNS = ('Method', 'Object', 'RecordId', 'IpAddress', 'Message')
+
+def micros(value: datetime) -> int:
+    return (value - EPOCH) // timedelta(microseconds=1)
+
+def from_micros(value: int) -> datetime:
+    return EPOCH + timedelta(microseconds=value)
+
+def align(offset: int) -> int:
+    return (offset + 7) & ~7
+
+class Segment:
+    """One closed day of one log table, memory-mapped.
+
+    Layout: magic, header length, JSON header, then 8-byte aligned column
+    blocks. Rows are sorted by (Created, id), so time ranges and cursors are
+    binary searches over the Created column; string filters are resolved to
+    dictionary codes once and compared as integers.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        with open(path, 'rb') as file:
+            self.map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self.map[:len(MAGIC)] != MAGIC:
+            raise ValueError(f'{path} is not a log segment')
+        (length,) = struct.unpack_from('<Q', self.map, len(MAGIC))
+        self.header = json.loads(self.map[len(MAGIC) + 8:len(MAGIC) + 8 + length])
+        if self.header['byteorder'] != sys.byteorder:
+            raise ValueError(f'{path} was written on a {self.header["byteorder"]}-endian host')
+        self.rows = self.header['rows']
+        self.columns : dict[str, memoryview] = {}
+        self.dictionaries : dict[str, list] = {}
+
+    def column(self, name: str) -> memoryview:
+        if name not in self.columns:
+            block = self.header['columns'][name]
+            view = memoryview(self.map)[block['offset']:block['offset'] + block['length']]
+            self.columns[name] = view.cast(block['type']) if block['type'] != 'uuid' else view
+        return self.columns[name]
+
+    def dictionary(self, name: str) -> list:
+        if name not in self.dictionaries:
+            block = self.header['dictionaries'][name]
+            self.dictionaries[name] = json.loads(zlib.decompress(self.map[block['offset']:block['offset'] + block['length']]))
+        return self.dictionaries[name]
+
+    def codes(self, name: str, values) -> set[int]:
+        wanted = set(values)
+        return {code for code, value in enumerate(self.dictionary(name)) if value in wanted}
+
+    def predicates(self, filters: dict) -> list | None:
+        """[(column, allowed values)] for equality filters, or None when the segment cannot match."""
+        tests = []
+        for name, values in filters.items():
+            if name in self.header['dictionaries']:
+                codes = self.codes(name, values)
+                if not codes:
+                    return None
+                tests.append((self.column(name), codes))
+            else:
+                tests.append((self.column(name), set(values)))
+        return tests
+
+    def bounds(self, start: datetime | None, end: datetime | None) -> tuple[int, int]:
+        created = self.column('Created')
+        low = bisect_left(created, micros(start)) if start else 0
+        high = bisect_left(created, micros(end)) if end else self.rows
+        return low, high
+
+    def select(self, filters: dict, start=None, end=None, before: tuple[datetime, int] | None = None, limit: int | None = None) -> list[int]:
+        """Row numbers matching `filters`, newest first, with Created in [start, end) and
+        (Created, id) < `before`."""
+        tests = self.predicates(filters)
+        if tests is None:
+            return []
+        low, high = self.bounds(start, end)
+        created, ids = self.column('Created'), self.column('id')
+        if before is not None:
+            cursor, cursorId = micros(before[0]), before[1]
+            high = min(high, bisect_left(created, cursor + 1))
+        found = []
+        for row in range(high - 1, low - 1, -1):
+            if before is not None and created[row] == cursor and ids[row] >= cursorId:
+                continue
+            if all(column[row] in allowed for column, allowed in tests):
+                found.append(row)
+                if limit is not None and len(found) >= limit:
+                    break
+        return found
+
+    def count_by(self, name: str, filters: dict, start=None, end=None) -> Counter:
+        """Matching rows per value of `name`."""
+        tests = self.predicates(filters)
+        if tests is None:
+            return Counter()
+        low, high = self.bounds(start, end)
+        column = self.column(name)
+        if tests:
+            counts = Counter(column[row] for row in range(low, high) if all(test[row] in allowed for test, allowed in tests))
+        else:
+            counts = Counter(column[low:high])
+        if name in self.header['dictionaries']:
+            values = self.dictionary(name)
+            return Counter({values[code]: count for code, count in counts.items()})
+        return counts
+
+    def record(self, row: int) -> dict:
+        data = {name: self.column(name)[row] for name, _ in NUMERIC_COLUMNS}
+        data['Created'], data['Updated'] = from_micros(data['Created']), from_micros(data['Updated'])
+        data['StatusCode'] = None if data['StatusCode'] == NULL_STATUS else data['StatusCode']
+        data['PublicId'] = uuid.UUID(bytes=bytes(self.column('PublicId')[row * 16:row * 16 + 16]))
+        for name in self.header['dictionaries']:
+            data[name] = self.dictionary(name)[self.column(name)[row]]
+        return data
+
+    def close(self):
+        self.columns.clear()
+        self.map.close()
+
+def write_segment(path: Path, table: str, day: date, actor: str | None = None) -> int:
+    """Copy `table` (a day partition) into a segment at `path`; returns the rows written.
+    The file is written beside the target and renamed into place once synced."""
+    quote = connection.ops.quote_name
+    coded = (*CODED_COLUMNS, *([actor] if actor else []))
+    numbers = {name: array(kind) for name, kind in NUMERIC_COLUMNS}
+    publicIds = bytearray()
+    codes = {name: array('I') for name in coded}
+    dictionaries : dict[str, dict] = {name: {} for name in coded}
+    columns = ', '.join(quote(name) for name in ('id', 'Created', 'Updated', 'Citizen_id', 'StatusCode', 'PublicId', *coded))
+    with connection.chunked_cursor() as cursor:
+        cursor.execute(f'SELECT {columns} FROM {quote(table)} ORDER BY "Created", "id"')
+        while rows := cursor.fetchmany(10000):
+            for id, created, updated, citizen, status, publicId, *strings in rows:
+                numbers['id'].append(id)
+                numbers['Created'].append(micros(created))
+                numbers['Updated'].append(micros(updated))
+                numbers['Citizen_id'].append(citizen)
+                numbers['StatusCode'].append(NULL_STATUS if status is None else status)
+                publicIds += uuid.UUID(str(publicId)).bytes
+                for name, value in zip(coded, strings):
+                    codes[name].append(dictionaries[name].setdefault(value, len(dictionaries[name])))
+
+    blocks = [(name, kind, numbers[name].tobytes()) for name, kind in NUMERIC_COLUMNS]
+    blocks += [('PublicId', 'uuid', bytes(publicIds))]
+    blocks += [(name, 'I', codes[name].tobytes()) for name in coded]
+    packed = [(name, zlib.compress(json.dumps(list(dictionaries[name])).encode(), 6)) for name in coded]
+    header = {'rows': len(numbers['id']), 'table': table, 'day': day.isoformat(), 'byteorder': sys.byteorder, 'columns': {}, 'dictionaries': {}}
+    # offsets depend on the header size, so lay out with a fixed-width placeholder first
+    placeholder = json.dumps({**header, 'columns': {name: {'type': kind, 'offset': 10 ** 15, 'length': 10 ** 15} for name, kind, _ in blocks},
+                              'dictionaries': {name: {'offset': 10 ** 15, 'length': 10 ** 15} for name, _ in packed}}).encode()
+    offset = align(len(MAGIC) + 8 + len(placeholder))
+    for name, kind, data in blocks:
+        header['columns'][name] = {'type': kind, 'offset': offset, 'length': len(data)}
+        offset = align(offset + len(data))
+    for name, data in packed:
+        header['dictionaries'][name] = {'offset': offset, 'length': len(data)}
+        offset = align(offset + len(data))
+    encoded = json.dumps(header).encode()
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    partial = path.with_suffix('.partial')
+    with open(partial, 'wb') as file:
+        file.write(MAGIC + struct.pack('<Q', len(encoded)) + encoded)
+        for data, block in [*((data, header['columns'][name]) for name, _, data in blocks), *((data, header['dictionaries'][name]) for name, data in packed)]:
+            file.write(b'\0' * (block['offset'] - file.tell()))
+            file.write(data)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(partial, path)
+    return header['rows']
+
+class LogArchive:
+    """Segments of closed log days under `directory`/<table>/<YYYYMMDD>.seg.
+
+    Written by maintain_log_partitions before a partition past retention is
+    dropped, and merged into the log viewsets' pages.
+    Mapped segments are kept open per process and reopened when replaced.
+    """
+
+    def __init__(self, directory: str | Path):
+        self.directory = Path(directory)
+        self.open : dict[Path, tuple[float, Segment]] = {}
+        self.lock = Lock()
+
+    def path(self, model, day: date) -> Path:
+        return self.directory / model._meta.db_table / f'{day:%Y%m%d}.seg'
+
+    def days(self, model) -> list[date]:
+        folder = self.directory / model._meta.db_table
+        if not folder.is_dir():
+            return []
+        return sorted(datetime.strptime(path.stem, '%Y%m%d').date() for path in folder.glob('*.seg'))
+
+    def segment(self, model, day: date) -> Segment:
+        path = self.path(model, day)
+        modified = path.stat().st_mtime
+        with self.lock:
+            cached = self.open.get(path)
+            if cached is None or cached[0] != modified:
+                if cached is not None:
+                    cached[1].close()
+                cached = self.open[path] = (modified, Segment(path))
+            return cached[1]
+
+    def write(self, model, day: date, table: str) -> int:
+        actor = next((field.column for field in model._meta.concrete_fields if field.column in ('Grantee', 'Administrator', 'SiteManager')), None)
+        path = self.path(model, day)
+        if path.exists():
+            # rows of an archived day that landed late: the rewritten segment keeps the earlier ones
+            self.restore(self.segment(model, day), table)
+        return write_segment(path, table, day, actor)
+
+    def restore(self, segment: Segment, table: str):
+        """Copy the rows of `segment` back into `table`, leaving out those of since-deleted citizens."""
+        from core.citizen.models import Citizen
+        records = [segment.record(row) for row in range(segment.rows)]
+        citizens = set(Citizen.objects.filter(pk__in={record['Citizen_id'] for record in records}).values_list('pk', flat=True))
+        records = [record for record in records if record['Citizen_id'] in citizens]
+        if not records:
+            return
+        quote = connection.ops.quote_name
+        names = list(records[0])
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f'INSERT INTO {quote(table)} ({", ".join(quote(name) for name in names)}) VALUES ({", ".join(["%s"] * len(names))}) ON CONFLICT DO NOTHING',
+                [[record[name] for name in names] for record in records]
+            )
+
+    def query(self, model, filters: dict, start=None, end=None, before=None, limit: int = 100) -> list:
+        """Unsaved `model` instances matching `filters` ({column: [values]}), newest first."""
+        found = []
+        for day in reversed(self.days(model)):
+            dayStart = datetime.combine(day, datetime.min.time(), dt_timezone.utc)
+            if (start and dayStart + timedelta(days=1) <= start) or (end and dayStart >= end) or (before and dayStart > before[0]):
+                continue
+            segment = self.segment(model, day)
+            for row in segment.select(filters, start, end, before, limit - len(found)):
+                found.append(model(**segment.record(row)))
+            if len(found) >= limit:
+                break
+        return found
+
+    def count_by(self, model, name: str, filters: dict, start=None, end=None) -> Counter:
+        counts = Counter()
+        for day in self.days(model):
+            counts.update(self.segment(model, day).count_by(name, filters, start, end))
+        return counts
+
+archive = LogArchive(**getattr(settings, 'LOG_ARCHIVE_SETTINGS', {'directory': Path(settings.BASE_DIR) / 'logArchive'}))
+
+def archive_filters(queries: dict, model) -> tuple[dict, datetime | None, datetime | None] | None:
+    """Translate viewset filters into archive filters and a [start, end) range,
+    or None when a filter has no archive equivalent (the archive is then skipped)."""
+    from core.citizen.models import Citizen
+    columns = {field.name: field.column for field in model._meta.concrete_fields}
+    filters : dict[str, list] = {}
+    start = end = None
+    for key, value in queries.items():
+        field, _, lookup = key.partition('__')
+        if field == 'Created' and lookup in ('gte', 'gt', 'lt', 'lte'):
+            moment = value if isinstance(value, datetime) else parse_datetime(value) or datetime.combine(parse_date(value), datetime.min.time(), dt_timezone.utc)
+            if moment.tzinfo is None:
+                moment = moment.replace(tzinfo=dt_timezone.utc)
+            if lookup in ('gt', 'lte'):
+                moment += timedelta(microseconds=1)
+            if lookup in ('gte', 'gt'):
+                start = max(start, moment) if start else moment
+            else:
+                end = min(end, moment) if end else moment
+        elif field == 'Citizen' and lookup in ('', 'PublicId', 'PublicId__in', 'id'):
+            lookupField = 'id' if lookup in ('', 'id') else lookup
+            try:
+                filters['Citizen_id'] = list(Citizen.objects.filter(**{lookupField: value}).values_list('id', flat=True))
+            except (ValueError, TypeError):
+                return None
+        elif lookup in ('', 'in') and field in columns and field not in ('id', 'PublicId', 'Created', 'Updated', 'Citizen'):
+            values = value if lookup == 'in' else [value]
+            if field == 'StatusCode':
+                try:
+                    values = [int(item) for item in values]
+                except ValueError:
+                    return None
+            filters[columns[field]] = values
+        else:
+            return None
+    return filters, start, end
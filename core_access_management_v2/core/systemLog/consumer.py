@@ -0,0 +1,58 @@
+import logging
+import time
+from prometheus_client import Counter, Histogram
+from .ingest import ingest_logs
+
+logger = logging.getLogger(__name__)
+
+system_log_messages = Counter('core_access_system_log_messages_total', 'System log messages consumed from Kafka', ['result'])
+system_log_batch_size = Histogram('core_access_system_log_batch_size', 'Messages per consumed system log batch', buckets=(1, 10, 50, 100, 250, 500, 1000, 2500))
+system_log_batch_seconds = Histogram('core_access_system_log_batch_seconds', 'Time to write one consumed system log batch')
+
+class SystemLogConsumer:
+    """Drains the system log topic in batches.
+
+    Each poll is written with ingest_logs (one bulk write per log table inside
+    one transaction) and the offsets are committed only after that transaction
+    succeeds, so a crash replays the batch instead of losing it. Messages that
+    fail validation are reported and committed past.
+    """
+
+    def __init__(self, consumer, batch_size: int = 500, poll_timeout_ms: int = 1000):
+        self.consumer = consumer
+        self.batch_size = batch_size
+        self.poll_timeout_ms = poll_timeout_ms
+
+    def poll(self) -> list:
+        batches = self.consumer.poll(timeout_ms=self.poll_timeout_ms, max_records=self.batch_size)
+        return [message for messages in batches.values() for message in messages]
+
+    def write(self, messages: list) -> dict:
+        started = time.monotonic()
+        result = ingest_logs([message.value for message in messages])
+        self.consumer.commit()
+        elapsed = time.monotonic() - started
+        created = sum(result['Created'].values())
+        system_log_batch_size.observe(len(messages))
+        system_log_batch_seconds.observe(elapsed)
+        system_log_messages.labels('created').inc(created)
+        system_log_messages.labels('rejected').inc(len(result['Rejected']))
+        for rejected in result['Rejected']:
+            message = messages[rejected['Index']]
+            logger.warning(f'Skipped system log {message.topic}[{message.partition}]@{message.offset}: {rejected["Error"]}')
+        logger.info(f'System log batch: {created} written, {len(result["Rejected"])} rejected in {elapsed:.3f}s ({len(messages) / elapsed if elapsed else 0:.0f} msg/s)')
+        return result
+
+    def run(self, limit: int | None = None) -> int:
+        """Consume until the topic is drained or `limit` messages were handled; returns the messages handled."""
+        handled = 0
+        while limit is None or handled < limit:
+            messages = self.poll()
+            if not messages:
+                break
+            self.write(messages)
+            handled += len(messages)
+        return handled
+
+    def close(self):
+        self.consumer.close(autocommit=False)
@@ -0,0 +1,101 @@
+import json
+import uuid
+from django.db import transaction
+from core.abstract.identity import identity
+from core.citizen.models import Citizen
+from .models import CitizenLog, GranteeLog, AdministratorLog, SiteManagerLog
+
+# the key that marks a log as a staff log, checked in this order; anything else is a citizen log
+LOG_KINDS = (
+    ('Administrator', AdministratorLog),
+    ('SiteManager', SiteManagerLog),
+    ('Grantee', GranteeLog),
+)
+LOG_FIELDS = ('Method', 'Object', 'IpAddress', 'Message')
+
+class LogIngestError(ValueError):
+    pass
+
+def parse_logs(body: bytes, content_type: str = '') -> list:
+    """Logs from a JSON array, a single JSON object or NDJSON (one object per line)."""
+    text = body.decode('utf-8')
+    if 'ndjson' in content_type or 'jsonlines' in content_type:
+        try:
+            return [json.loads(line) for line in text.splitlines() if line.strip()]
+        except json.JSONDecodeError as error:
+            raise LogIngestError(f'Invalid NDJSON: {error}')
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError as error:
+        raise LogIngestError(f'Invalid JSON: {error}')
+    return data if isinstance(data, list) else [data]
+
+def log_kind(log: dict) -> tuple[str, type]:
+    for key, model in LOG_KINDS:
+        if log.get(key):
+            return key, model
+    return 'Citizen', CitizenLog
+
+def validate_log(log) -> str | None:
+    if not isinstance(log, dict):
+        return 'Log must be an object'
+    missing = [field for field in ('Citizen', *LOG_FIELDS) if not isinstance(log.get(field), str) or not log.get(field)]
+    if missing:
+        return f'Missing or invalid: {", ".join(missing)}'
+    statusCode = log.get('StatusCode')
+    if statusCode is not None and (not isinstance(statusCode, int) or isinstance(statusCode, bool)):
+        return 'StatusCode must be an integer'
+    if len(log['IpAddress']) > 19:
+        return 'IpAddress is too long'
+    try:
+        uuid.UUID(log['Citizen'])
+    except ValueError:
+        return 'Citizen is not a valid id'
+    return None
+
+def ingest_logs(logs: list) -> dict:
+    """Validate and write a batch of mixed logs.
+
+    Citizens are resolved through the identity cache, with cached ones confirmed
+    to still exist so a citizen deleted elsewhere cannot fail the whole batch on
+    its foreign key. Each log table is written with one bulk_create; the day
+    partitions route the rows. Invalid logs are reported by index and skipped."""
+    rejected = []
+    valid = []
+    for index, log in enumerate(logs):
+        error = validate_log(log)
+        if error:
+            rejected.append({'Index': index, 'Error': error})
+        else:
+            valid.append((index, log))
+
+    citizenIds = set(uuid.UUID(log['Citizen']) for _, log in valid)
+    citizens = {publicId: citizen.pk for publicId, citizen in identity(Citizen).resolve_many(citizenIds, confirm=True).items()}
+    rows = []
+    for index, log in valid:
+        citizen = citizens.get(uuid.UUID(log['Citizen']))
+        if citizen is None:
+            rejected.append({'Index': index, 'Error': 'Citizen not found'})
+            continue
+        rows.append(log)
+
+    batches : dict[str, list] = {}
+    for log in rows:
+        key, model = log_kind(log)
+        batches.setdefault(key, []).append(model(
+            Citizen_id=citizens[uuid.UUID(log['Citizen'])], Method=log['Method'], Object=log['Object'],
+            RecordId=log.get('RecordId'), StatusCode=log.get('StatusCode'), IpAddress=log['IpAddress'], Message=log['Message'],
+            **({key: str(log[key])} if key != 'Citizen' else {})
+        ))
+    created = {'Citizen': 0, **{key: 0 for key, _ in LOG_KINDS}}
+    with transaction.atomic():
+        for key, model in (('Citizen', CitizenLog), *LOG_KINDS):
+            entries = batches.get(key)
+            if entries:
+                model.objects.bulk_create(entries, batch_size=1000)
+                created[key] = len(entries)
+    return {
+        'Received': len(logs),
+        'Created': created,
+        'Rejected': sorted(rejected, key=lambda entry: entry['Index']),
+    }
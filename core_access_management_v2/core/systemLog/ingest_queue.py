@@ -0,0 +1,123 @@
+from queue import Queue, Full, Empty
+from threading import Event, Lock, Thread
+import atexit
+import logging
+import time
+from django.conf import settings
+from django.db import close_old_connections
+from prometheus_client import Counter, Gauge, Histogram
+from .ingest import ingest_logs
+
+logger = logging.getLogger(__name__)
+
+log_queue_logs = Counter('core_access_log_queue_logs_total', 'Logs through the in-process ingestion queue', ['result'])
+log_queue_depth = Gauge('core_access_log_queue_depth', 'Logs waiting in the in-process ingestion queue')
+log_queue_flush_seconds = Histogram('core_access_log_queue_flush_seconds', 'Time to write one batch from the ingestion queue')
+log_queue_delay_seconds = Histogram('core_access_log_queue_delay_seconds', 'Time the oldest log of a batch waited in the queue before it was written')
+
+class LogQueue:
+    """Write-behind ingestion for single logs.
+
+    `put` only enqueues an already validated log; a daemon thread drains the
+    queue in batches of `batch_size` through ingest_logs. When `maxsize` logs
+    are waiting `put` refuses instead of blocking, and at exit the queue is
+    drained for up to `drain_timeout` seconds. Logs still queued when the
+    process dies are lost; the Kafka path is the durable one.
+    """
+
+    def __init__(self, enabled: bool = True, maxsize: int = 10000, batch_size: int = 500, interval: float = 0.5, drain_timeout: float = 10.0):
+        self.enabled = enabled
+        self.batch_size = batch_size
+        self.interval = interval
+        self.drain_timeout = drain_timeout
+        self.queue : Queue = Queue(maxsize)
+        self.stopping = Event()
+        self.lock = Lock()
+        self.worker : Thread | None = None
+        log_queue_depth.set_function(self.queue.qsize)
+
+    def __len__(self):
+        return self.queue.qsize()
+
+    def put(self, log: dict) -> bool:
+        try:
+            self.queue.put_nowait((time.monotonic(), log))
+        except Full:
+            log_queue_logs.labels('refused').inc()
+            return False
+        log_queue_logs.labels('queued').inc()
+        self.start()
+        return True
+
+    def take(self, timeout: float | None) -> list:
+        """Up to `batch_size` queued entries, waiting at most `timeout` for the first."""
+        try:
+            batch = [self.queue.get(timeout=timeout) if timeout else self.queue.get_nowait()]
+        except Empty:
+            return []
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self.queue.get_nowait())
+            except Empty:
+                break
+        return batch
+
+    def write(self, batch: list) -> int:
+        started = time.monotonic()
+        log_queue_delay_seconds.observe(started - batch[0][0])
+        try:
+            result = ingest_logs([log for _, log in batch])
+        except Exception:
+            log_queue_logs.labels('failed').inc(len(batch))
+            logger.exception(f'Dropped {len(batch)} queued logs')
+            return 0
+        log_queue_flush_seconds.observe(time.monotonic() - started)
+        written = sum(result['Created'].values())
+        log_queue_logs.labels('written').inc(written)
+        log_queue_logs.labels('rejected').inc(len(result['Rejected']))
+        for rejected in result['Rejected']:
+            logger.warning(f'Skipped queued log: {rejected["Error"]}')
+        return written
+
+    def flush(self) -> int:
+        """Write everything queued right now; returns the logs written."""
+        written = 0
+        while batch := self.take(None):
+            written += self.write(batch)
+        return written
+
+    def start(self):
+        if self.worker is not None or self.interval <= 0:
+            return
+        with self.lock:
+            if self.worker is not None:
+                return
+            self.worker = Thread(target=self.run, name='log-queue', daemon=True)
+            self.worker.start()
+
+    def run(self):
+        while not self.stopping.is_set():
+            batch = self.take(self.interval)
+            if batch:
+                self.write(batch)
+            close_old_connections()
+
+    def drain(self):
+        """Stop the flusher and write what is left, giving up after `drain_timeout` seconds."""
+        self.stopping.set()
+        if self.worker is not None:
+            self.worker.join(self.interval + 1)
+        deadline = time.monotonic() + self.drain_timeout
+        while time.monotonic() < deadline and (batch := self.take(None)):
+            self.write(batch)
+        if len(self):
+            logger.error(f'Log queue shut down with {len(self)} logs unwritten')
+
+logs = LogQueue(**getattr(settings, 'LOG_INGEST_QUEUE', {}))
+
+@atexit.register
+def drain_on_exit():
+    try:
+        logs.drain()
+    except Exception:
+        logger.exception('Draining the log queue at exit failed')
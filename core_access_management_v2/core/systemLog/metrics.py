@@ -0,0 +1,42 @@
+import logging
+from django.db import DatabaseError
+from django.db.models import Max, Sum
+from prometheus_client.core import GaugeMetricFamily
+from .models import LogRollup, minute
+
+logger = logging.getLogger(__name__)
+
+class LogRollupCollector:
+    """Exports the newest rolled-up minute at scrape time, summed over RecordId to keep the
+    label set bounded. Reading LogRollup here means every web process reports the numbers
+    the rollup_logs cron wrote, without touching the raw log tables."""
+
+    def families(self) -> tuple[GaugeMetricFamily, GaugeMetricFamily, GaugeMetricFamily]:
+        return (
+            GaugeMetricFamily('core_access_log_requests_per_minute', 'Logged requests in the newest rolled-up minute', labels=['object', 'method', 'actor']),
+            GaugeMetricFamily('core_access_log_errors_per_minute', 'Logged requests with StatusCode >= 400 in the newest rolled-up minute', labels=['object', 'method', 'actor']),
+            GaugeMetricFamily('core_access_log_rollup_bucket_timestamp_seconds', 'Start of the newest rolled-up minute'),
+        )
+
+    def describe(self):
+        # lets REGISTRY.register learn the names without querying the database
+        return list(self.families())
+
+    def collect(self):
+        requests, errors, bucket = self.families()
+        try:
+            last = LogRollup.objects.filter(Resolution=minute).aggregate(last=Max('Bucket'))['last']
+            rows = []
+            if last is not None:
+                rows = LogRollup.objects.filter(Resolution=minute, Bucket=last).values('Object', 'Method', 'Actor').annotate(requests=Sum('Requests'), errors=Sum('Errors'))
+                bucket.add_metric([], last.timestamp())
+            for row in rows:
+                labels = [row['Object'], row['Method'], row['Actor']]
+                requests.add_metric(labels, row['requests'])
+                errors.add_metric(labels, row['errors'])
+        except DatabaseError:
+            logger.exception('Reading log rollups for metrics failed')
+            return
+        yield requests
+        yield errors
+        yield bucket
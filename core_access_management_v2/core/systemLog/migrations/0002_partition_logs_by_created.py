@@ -0,0 +1,113 @@
+import uuid
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from core.abstract.partitions import DailyPartitions
+
+LOG_TABLES = (
+    ('systemLog_citizenlog', None),
+    ('systemLog_granteelog', 'Grantee'),
+    ('systemLog_administratorlog', 'Administrator'),
+    ('systemLog_sitemanagerlog', 'SiteManager'),
+)
+LOG_COLUMNS = ('id', 'PublicId', 'Created', 'Updated', 'Citizen_id', 'Method', 'Object', 'RecordId', 'IpAddress', 'Message')
+
+
+def log_fields(extra=None):
+    fields = [
+        ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+        ('PublicId', models.UUIDField(db_index=True, default=uuid.uuid4, editable=False)),
+        ('Created', models.DateTimeField(auto_now_add=True)),
+        ('Updated', models.DateTimeField(auto_now=True)),
+        ('Method', models.CharField()),
+        ('Object', models.CharField()),
+        ('RecordId', models.CharField(null=True)),
+        ('IpAddress', models.CharField(max_length=19)),
+        ('Message', models.CharField()),
+        ('Citizen', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+    ]
+    if extra:
+        fields.append((extra, models.CharField()))
+    return fields
+
+
+def partition_logs(apps, schema_editor):
+    """Move each log table off the shared core_abstractlogmodel parent into its
+    own table partitioned by day on Created, keeping the existing ids."""
+    connection = schema_editor.connection
+    quote = connection.ops.quote_name
+    ahead = getattr(settings, 'LOG_PARTITION_SETTINGS', {}).get('ahead_days', 7)
+    with connection.cursor() as cursor:
+        for table, extra in LOG_TABLES:
+            old = f'{table}_mti'
+            columns = [*LOG_COLUMNS, *([extra] if extra else [])]
+            cursor.execute(f'ALTER TABLE {quote(table)} RENAME TO {quote(old)}')
+            cursor.execute(f'''
+                CREATE TABLE {quote(table)} (
+                    "id" bigserial NOT NULL,
+                    "PublicId" uuid NOT NULL,
+                    "Created" timestamp with time zone NOT NULL,
+                    "Updated" timestamp with time zone NOT NULL,
+                    "Citizen_id" bigint NOT NULL,
+                    "Method" varchar NOT NULL,
+                    "Object" varchar NOT NULL,
+                    "RecordId" varchar NULL,
+                    "IpAddress" varchar(19) NOT NULL,
+                    "Message" varchar NOT NULL,
+                    {f'{quote(extra)} varchar NOT NULL,' if extra else ''}
+                    CONSTRAINT {quote(f'{table}_id_created_pk')} PRIMARY KEY ("id", "Created"),
+                    CONSTRAINT {quote(f'{table}_citizen_fk')} FOREIGN KEY ("Citizen_id")
+                        REFERENCES "citizen_citizen" ("id") DEFERRABLE INITIALLY DEFERRED
+                ) PARTITION BY RANGE ("Created")
+            ''')
+            cursor.execute(f'CREATE INDEX {quote(f"{table}_publicid_idx")} ON {quote(table)} ("PublicId")')
+            cursor.execute(f'CREATE INDEX {quote(f"{table}_citizen_idx")} ON {quote(table)} ("Citizen_id")')
+            cursor.execute(f'CREATE TABLE {quote(f"{table}_default")} PARTITION OF {quote(table)} DEFAULT')
+
+            cursor.execute(
+                f'SELECT DISTINCT (parent."Created" AT TIME ZONE \'UTC\')::date FROM {quote(old)} child '
+                f'JOIN "core_abstractlogmodel" parent ON parent."id" = child."abstractlogmodel_ptr_id"'
+            )
+            partitions = DailyPartitions(table, connection=connection)
+            partitions.ensure(day for day, in cursor.fetchall())
+            partitions.ensure_ahead(ahead)
+
+            select = ', '.join(f'parent.{quote(column)}' if column in LOG_COLUMNS else f'child.{quote(column)}' for column in columns)
+            cursor.execute(
+                f'INSERT INTO {quote(table)} ({", ".join(quote(column) for column in columns)}) '
+                f'SELECT {select} FROM {quote(old)} child '
+                f'JOIN "core_abstractlogmodel" parent ON parent."id" = child."abstractlogmodel_ptr_id"'
+            )
+            cursor.execute(f'DROP TABLE {quote(old)}')
+            # ids came from the shared parent sequence; continue past the largest one kept
+            cursor.execute(
+                f"SELECT setval(pg_get_serial_sequence(%s, 'id'), COALESCE((SELECT MAX(\"id\") FROM {quote(table)}), 0) + 1, false)",
+                [quote(table)]
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('systemLog', '0001_initial'),
+        ('core', '0005_abstractpermission_window'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.DeleteModel(name='AdministratorLog'),
+                migrations.DeleteModel(name='CitizenLog'),
+                migrations.DeleteModel(name='GranteeLog'),
+                migrations.DeleteModel(name='SiteManagerLog'),
+                migrations.CreateModel(name='AdministratorLog', fields=log_fields('Administrator'), options={'abstract': False}),
+                migrations.CreateModel(name='CitizenLog', fields=log_fields(), options={'abstract': False}),
+                migrations.CreateModel(name='GranteeLog', fields=log_fields('Grantee'), options={'abstract': False}),
+                migrations.CreateModel(name='SiteManagerLog', fields=log_fields('SiteManager'), options={'abstract': False}),
+            ],
+            database_operations=[
+                migrations.RunPython(partition_logs),
+            ],
+        ),
+    ]
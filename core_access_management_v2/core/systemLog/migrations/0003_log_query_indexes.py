@@ -0,0 +1,123 @@
+# Generated by Django 5.1.5 on 2026-10-18 10:29
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('systemLog', '0002_partition_logs_by_created'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        # the FK constraint stays as it is; only its single-column index goes, (Citizen, Created) replaces it
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AlterField(
+                    model_name='administratorlog',
+                    name='Citizen',
+                    field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL),
+                ),
+                migrations.AlterField(
+                    model_name='citizenlog',
+                    name='Citizen',
+                    field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL),
+                ),
+                migrations.AlterField(
+                    model_name='granteelog',
+                    name='Citizen',
+                    field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL),
+                ),
+                migrations.AlterField(
+                    model_name='sitemanagerlog',
+                    name='Citizen',
+                    field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL),
+                ),
+            ],
+            database_operations=[
+                migrations.RunSQL(
+                    sql=[f'DROP INDEX IF EXISTS "systemLog_{model}_citizen_idx"' for model in ('citizenlog', 'granteelog', 'administratorlog', 'sitemanagerlog')],
+                    reverse_sql=[f'CREATE INDEX "systemLog_{model}_citizen_idx" ON "systemLog_{model}" ("Citizen_id")' for model in ('citizenlog', 'granteelog', 'administratorlog', 'sitemanagerlog')],
+                ),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='administratorlog',
+            index=models.Index(fields=['-Created', '-id'], name='administratorlog_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='administratorlog',
+            index=models.Index(fields=['Citizen', '-Created'], name='administratorlog_citizen_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='administratorlog',
+            index=models.Index(fields=['Method', '-Created'], name='administratorlog_method_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='administratorlog',
+            index=models.Index(fields=['Object', '-Created'], name='administratorlog_object_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='administratorlog',
+            index=models.Index(fields=['Administrator', '-Created'], name='administratorlog_admin_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='citizenlog',
+            index=models.Index(fields=['-Created', '-id'], name='citizenlog_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='citizenlog',
+            index=models.Index(fields=['Citizen', '-Created'], name='citizenlog_citizen_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='citizenlog',
+            index=models.Index(fields=['Method', '-Created'], name='citizenlog_method_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='citizenlog',
+            index=models.Index(fields=['Object', '-Created'], name='citizenlog_object_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='granteelog',
+            index=models.Index(fields=['-Created', '-id'], name='granteelog_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='granteelog',
+            index=models.Index(fields=['Citizen', '-Created'], name='granteelog_citizen_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='granteelog',
+            index=models.Index(fields=['Method', '-Created'], name='granteelog_method_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='granteelog',
+            index=models.Index(fields=['Object', '-Created'], name='granteelog_object_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='granteelog',
+            index=models.Index(fields=['Grantee', '-Created'], name='granteelog_grantee_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='sitemanagerlog',
+            index=models.Index(fields=['-Created', '-id'], name='sitemanagerlog_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='sitemanagerlog',
+            index=models.Index(fields=['Citizen', '-Created'], name='sitemanagerlog_citizen_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='sitemanagerlog',
+            index=models.Index(fields=['Method', '-Created'], name='sitemanagerlog_method_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='sitemanagerlog',
+            index=models.Index(fields=['Object', '-Created'], name='sitemanagerlog_object_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='sitemanagerlog',
+            index=models.Index(fields=['SiteManager', '-Created'], name='sitemanagerlog_manager_idx'),
+        ),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 5.1.5 on 2026-10-18 10:32
+
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('systemLog', '0003_log_query_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='administratorlog',
+            name='StatusCode',
+            field=models.IntegerField(null=True),
+        ),
+        migrations.AddField(
+            model_name='citizenlog',
+            name='StatusCode',
+            field=models.IntegerField(null=True),
+        ),
+        migrations.AddField(
+            model_name='granteelog',
+            name='StatusCode',
+            field=models.IntegerField(null=True),
+        ),
+        migrations.AddField(
+            model_name='sitemanagerlog',
+            name='StatusCode',
+            field=models.IntegerField(null=True),
+        ),
+        migrations.CreateModel(
+            name='LogRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('PublicId', models.UUIDField(db_index=True, default=uuid.uuid4, editable=False, unique=True)),
+                ('Created', models.DateTimeField(auto_now_add=True)),
+                ('Updated', models.DateTimeField(auto_now=True)),
+                ('Resolution', models.CharField(choices=[('minute', 'minute'), ('hour', 'hour')])),
+                ('Bucket', models.DateTimeField()),
+                ('Actor', models.CharField()),
+                ('Object', models.CharField()),
+                ('RecordId', models.CharField(null=True)),
+                ('Method', models.CharField()),
+                ('Requests', models.BigIntegerField(default=0)),
+                ('Errors', models.BigIntegerField(default=0)),
+                ('Citizens', models.IntegerField(default=0)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['Resolution', 'Object', 'Bucket'], name='logrollup_object_idx')],
+                'constraints': [models.UniqueConstraint(fields=('Resolution', 'Bucket', 'Actor', 'Object', 'RecordId', 'Method'), name='logrollup_bucket_key', nulls_distinct=False)],
+            },
+        ),
+    ]
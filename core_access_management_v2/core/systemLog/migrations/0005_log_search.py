@@ -0,0 +1,58 @@
+# Generated by Django 5.1.5 on 2026-10-18 10:49
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.conf import settings
+from django.db import migrations
+
+LOG_MODELS = ('citizenlog', 'granteelog', 'administratorlog', 'sitemanagerlog')
+TRIGRAM_COLUMNS = ('Object', 'RecordId')
+
+def add_trigram_indexes(apps, schema_editor):
+    """Substring search over Object and RecordId. pg_trgm ships with PostgreSQL's contrib
+    modules; on a server without them search runs on the tsvector index alone."""
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+        if cursor.fetchone() is None:
+            return
+        cursor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        for model in LOG_MODELS:
+            for column in TRIGRAM_COLUMNS:
+                cursor.execute(
+                    f'CREATE INDEX IF NOT EXISTS "{model}_{column.lower()}_trgm_idx" '
+                    f'ON "systemLog_{model}" USING gin ("{column}" gin_trgm_ops)'
+                )
+
+def drop_trigram_indexes(apps, schema_editor):
+    with schema_editor.connection.cursor() as cursor:
+        for model in LOG_MODELS:
+            for column in TRIGRAM_COLUMNS:
+                cursor.execute(f'DROP INDEX IF EXISTS "{model}_{column.lower()}_trgm_idx"')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('systemLog', '0004_logrollup_statuscode'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='administratorlog',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.search.SearchVector('Message', 'Object', 'RecordId', config='simple'), name='administratorlog_search_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='citizenlog',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.search.SearchVector('Message', 'Object', 'RecordId', config='simple'), name='citizenlog_search_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='granteelog',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.search.SearchVector('Message', 'Object', 'RecordId', config='simple'), name='granteelog_search_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='sitemanagerlog',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.search.SearchVector('Message', 'Object', 'RecordId', config='simple'), name='sitemanagerlog_search_idx'),
+        ),
+        migrations.RunPython(add_trigram_indexes, drop_trigram_indexes),
+    ]
@@ -1,4 +1,6 @@
-from django.db import models
+from datetime import datetime
+from django.db import connection, models
+from core.abstract.models import AbstractManager, AbstractModel
 from core.abstract_circular.models import AbstractLogModel, AbstractLogManager
 
 # Create your models here.
@@ -19,6 +21,12 @@ class GranteeLog(AbstractLogModel):
 
     objects : GranteeLogManager = GranteeLogManager()
 
+    class Meta(AbstractLogModel.Meta):
+        indexes = [
+            *AbstractLogModel.Meta.indexes,
+            models.Index(fields=['Grantee', '-Created'], name='%(class)s_grantee_idx'),
+        ]
+
     def __str__(self):
         return f'LOG:: \n\tCitizen: {self.Citizen} \n\tGrantee: {self.Grantee.GranteeUserName}, \n\tObject: {self.Object} \n\tMethod: {self.Method}'
 
@@ -31,6 +39,12 @@ class AdministratorLog(AbstractLogModel):
     
     objects : AdministratorLogManager = AdministratorLogManager()
 
+    class Meta(AbstractLogModel.Meta):
+        indexes = [
+            *AbstractLogModel.Meta.indexes,
+            models.Index(fields=['Administrator', '-Created'], name='%(class)s_admin_idx'),
+        ]
+
     def __str__(self):
         return f'LOG:: \n\tCitizen: {self.Citizen.UserName} \n\tAdministrator: {self.Administrator}, \n\tObject: {self.Object} \n\tMethod: {self.Method}'
 
@@ -42,5 +56,89 @@ class SiteManagerLog(AbstractLogModel):
     SiteManager  = models.CharField()
     objects : SiteManagerLogManager = SiteManagerLogManager()
 
+    class Meta(AbstractLogModel.Meta):
+        indexes = [
+            *AbstractLogModel.Meta.indexes,
+            models.Index(fields=['SiteManager', '-Created'], name='%(class)s_manager_idx'),
+        ]
+
+    def __str__(self):
+        return f'LOG:: \n\tCitizen: {self.Citizen.UserName} \n\tManager: {self.SiteManager}, \n\tObject: {self.Object} \n\tMethod: {self.Method}'
+
+minute = 'minute'
+hour = 'hour'
+rollup_resolutions = [
+    (minute, 'minute'),
+    (hour, 'hour'),
+]
+
+class LogRollupManager(AbstractManager):
+
+    def log_tables(self) -> list[tuple[str, type]]:
+        return [('Citizen', CitizenLog), ('Grantee', GranteeLog), ('Administrator', AdministratorLog), ('SiteManager', SiteManagerLog)]
+
+    def refresh(self, start: datetime, end: datetime) -> int:
+        """Recount from the raw logs every minute and hour bucket that overlaps [start, end) and
+        is complete by `end`, and upsert them. Buckets are always recounted whole, so unique
+        citizen counts stay exact. Returns the minute rows written."""
+        quote = connection.ops.quote_name
+        written = 0
+        with connection.cursor() as cursor:
+            for resolution, _ in rollup_resolutions:
+                cursor.execute('SELECT date_trunc(%s, %s::timestamptz), date_trunc(%s, %s::timestamptz)', [resolution, start, resolution, end])
+                since, until = cursor.fetchone()
+                if since >= until:
+                    continue
+                logs = ' UNION ALL '.join(
+                    f'SELECT %s AS "Actor", "Citizen_id", "Object", "RecordId", "Method", "StatusCode", "Created" '
+                    f'FROM {quote(model._meta.db_table)} WHERE "Created" >= %s AND "Created" < %s'
+                    for _, model in self.log_tables()
+                )
+                params = [value for actor, _ in self.log_tables() for value in (actor, since, until)]
+                cursor.execute(
+                    f'INSERT INTO {quote(self.model._meta.db_table)} ("PublicId", "Created", "Updated", "Resolution", "Bucket", '
+                    f'"Actor", "Object", "RecordId", "Method", "Requests", "Errors", "Citizens") '
+                    f'SELECT gen_random_uuid(), now(), now(), %s, date_trunc(%s, logs."Created") AS bucket, logs."Actor", '
+                    f'logs."Object", logs."RecordId", logs."Method", count(*), count(*) FILTER (WHERE logs."StatusCode" >= 400), '
+                    f'count(DISTINCT logs."Citizen_id") FROM ({logs}) logs '
+                    f'GROUP BY bucket, logs."Actor", logs."Object", logs."RecordId", logs."Method" '
+                    f'ON CONFLICT ON CONSTRAINT "logrollup_bucket_key" DO UPDATE SET "Requests" = EXCLUDED."Requests", '
+                    f'"Errors" = EXCLUDED."Errors", "Citizens" = EXCLUDED."Citizens", "Updated" = EXCLUDED."Updated"',
+                    [resolution, resolution, *params]
+                )
+                if resolution == minute:
+                    written = cursor.rowcount
+        return written
+
+    def prune(self, before: datetime) -> int:
+        """Drop minute buckets older than `before`; hour buckets are kept."""
+        deleted, _ = self.filter(Resolution=minute, Bucket__lt=before).delete()
+        return deleted
+
+class LogRollup(AbstractModel):
+    """Log counts per (Object, RecordId, Method, actor) and minute or hour bucket, see LogRollupManager.refresh."""
+    Resolution = models.CharField(choices=rollup_resolutions)
+    Bucket = models.DateTimeField()
+    Actor = models.CharField()
+    Object = models.CharField()
+    RecordId = models.CharField(null=True)
+    Method = models.CharField()
+    Requests = models.BigIntegerField(default=0)
+    Errors = models.BigIntegerField(default=0)
+    Citizens = models.IntegerField(default=0)
+
+    objects : LogRollupManager = LogRollupManager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['Resolution', 'Bucket', 'Actor', 'Object', 'RecordId', 'Method'],
+                name='logrollup_bucket_key', nulls_distinct=False
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['Resolution', 'Object', 'Bucket'], name='logrollup_object_idx'),
+        ]
+
     def __str__(self):
-        return f'LOG:: \n\tCitizen: {self.Citizen.UserName} \n\tManager: {self.SiteManager}, \n\tObject: {self.Object} \n\tMethod: {self.Method}'
\ No newline at end of file
+        return f'Rollup:: \n\t{self.Resolution} {self.Bucket}, \n\tObject: {self.Object} {self.RecordId} \n\tMethod: {self.Method}, \n\tActor: {self.Actor}, \n\tRequests: {self.Requests}, Errors: {self.Errors}, Citizens: {self.Citizens}'
@@ -1,15 +1,24 @@
 from core.systemCron.models import SystemCron, systemLog
-from rest_framework.status import HTTP_201_CREATED
+from rest_framework.status import HTTP_201_CREATED, HTTP_202_ACCEPTED
 from core.systemLog.serializers import CitizenLogSerializer, SiteManagerLogSerializer, AdministratorLogSerializer, GranteeLogSerializer
 from core.abstract_circular.serializers import AbstractLogSerializer
 from core.abstract.kafka import NewKafkaConsumer
 from core.abstract_circular.viewsets import AdministratorLogViewSet, SiteManagerLogViewSet, GranteeLogViewSet
-from .serializers import CitizenLogSerializer, GranteeLogSerializer, AdministratorLogSerializer, SiteManagerLogSerializer
+from core.abstract.viewset import AbstractAdministratorModelViewSet, AbstractSiteManagerModelViewSet
+from .serializers import CitizenLogSerializer, GranteeLogSerializer, AdministratorLogSerializer, SiteManagerLogSerializer, LogRollupSerializer
+from .models import LogRollup, hour
+from datetime import timedelta
 from pprint import pprint
 from django.utils import timezone
 from threading import Thread
 from django.conf import settings
 from rest_framework.response import Response
+from rest_framework.viewsets import ViewSet
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.exceptions import ValidationError, Throttled
+from core.abstract.authenticationClasses import IsSiteManager
+from .ingest import parse_logs, ingest_logs, validate_log, LogIngestError
+from .ingest_queue import logs as logQueue
 import logging
 import json
 
@@ -47,7 +56,19 @@ class SiteManagerManagerLogViewSet(SiteManagerLogViewSet):
         except Exception as e:
             return False
 
+    def enqueue(self, data) -> Response:
+        """Validate without touching the database and leave the write to the log queue."""
+        log = data.dict() if hasattr(data, 'dict') else data
+        error = validate_log(log)
+        if error:
+            raise ValidationError(error)
+        if not logQueue.put(log):
+            raise Throttled(wait=1, detail='Log queue is full, retry shortly')
+        return Response({'Queued': True}, HTTP_202_ACCEPTED)
+
     def create(self, request, *args, **kwargs):
+        if logQueue.enabled:
+            return self.enqueue(request.data)
         data: dict = request.data
         administrator = data.pop('Administrator', None)
         siteManager = data.pop('SiteManager', None)
@@ -63,4 +84,50 @@ class SiteManagerManagerLogViewSet(SiteManagerLogViewSet):
             outcome = self.createLog(data, GranteeLogSerializer)
         else:
             outcome = self.createLog(data, CitizenLogSerializer)
-        return Response(outcome, HTTP_201_CREATED)
\ No newline at end of file
+        return Response(outcome, HTTP_201_CREATED)
+
+class SiteManagerLogIngestViewSet(ViewSet):
+    """Bulk log ingestion for the gateway: a JSON array or NDJSON body of mixed citizen and staff logs."""
+    permission_classes = (IsAuthenticated,)
+    http_method_names = ('post',)
+    max_logs = 10000
+
+    def get_authenticators(self):
+        return [IsSiteManager()]
+
+    def create(self, request, *args, **kwargs):
+        try:
+            logs = parse_logs(request.body, request.content_type or '')
+        except LogIngestError as error:
+            raise ValidationError(str(error))
+        if not logs:
+            raise ValidationError('No logs in request')
+        if len(logs) > self.max_logs:
+            raise ValidationError(f'At most {self.max_logs} logs per request')
+        return Response(ingest_logs(logs), HTTP_201_CREATED)
+
+class LogRollupQueryMixin:
+    """Pre-aggregated log counts for dashboards, newest bucket first. Resolution defaults to hour and,
+    without a Bucket filter, the last `default_window`; Object, RecordId, Method and Actor filter as usual."""
+    http_method_names = ('get',)
+    serializer_class = LogRollupSerializer
+    default_window = timedelta(days=1)
+
+    def get_queries(self) -> dict:
+        queries = super().get_queries()
+        queries.setdefault('Resolution', hour)
+        if not any(key.startswith('Bucket') for key in queries):
+            queries['Bucket__gte'] = timezone.now() - self.default_window
+        return queries
+
+    def get_keyset(self) -> tuple:
+        return ('Bucket', 'pk')
+
+    def get_queryset(self):
+        return LogRollup.objects.filter(**self.get_queries())
+
+class SiteManagerLogRollupViewSet(LogRollupQueryMixin, AbstractSiteManagerModelViewSet):
+    pass
+
+class AdministratorLogRollupViewSet(LogRollupQueryMixin, AbstractAdministratorModelViewSet):
+    pass
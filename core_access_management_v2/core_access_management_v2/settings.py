@@ -166,10 +166,29 @@ CELERY_RESULT_BACKEND = 'django-db'
 CELERY_TASK_DEFAULT_QUEUE = 'celery'
 CELERY_BEAT_SCHEDULE = {
     'system_log_cron': {
-        'task': 'myapp.tasks.system_log_cron',
+        'task': 'core.systemCron.tasks.system_log_cron',
         'schedule': crontab(minute='*/2'),
     },
+    'sweep_service_sessions': {
+        'task': 'core.systemCron.tasks.sweep_service_sessions',
+        'schedule': crontab(minute='*/15'),
+    },
+    'rollup_logs': {
+        'task': 'core.systemCron.tasks.rollup_logs',
+        'schedule': crontab(minute='*'),
+    },
+    'maintain_log_partitions': {
+        'task': 'core.systemCron.tasks.maintain_log_partitions',
+        'schedule': crontab(minute=10, hour=0),
+    },
 }
+# In-process (citizen, service) decision cache in front of /api/authorize/; maxsize 0 disables it
+ACCESS_DECISION_CACHE = {
+    'maxsize': 10000,
+    'ttl': 30,
+}
+# Seconds the citizen x service access matrix behind manager/service/access/ is reused before a rebuild
+ACCESS_MATRIX_MAX_AGE = 300
 # Topic for the Kafka system logs
 
 SYSTEM_LOG_KAFKA_SETTINGS = {
@@ -177,10 +196,68 @@ SYSTEM_LOG_KAFKA_SETTINGS = {
     "group_id": "systemLog",
     "auto_offset_reset": 'earliest',
     'value_deserializer': lambda v : json.loads(v.decode('utf-8')),
-    "enable_auto_commit": True
+    # offsets are committed by SystemLogConsumer after each batch is written
+    "enable_auto_commit": False,
+    "bootstrap_servers": os.environ.get('KAFKA_BOOTSTRAP_SERVERS', 'localhost:9092'),
+    "batch_size": 500,
+    "limit": 50000,
 }
 CORS_ALLOW_ALL_ORIGINS = True
+# list endpoints hand out the next page in a Link header
+CORS_EXPOSE_HEADERS = ['Link']
 DEFAULT_SESSION_TIME = 2 
+# Expired sessions are archived `grace_minutes` after expiry; archive day partitions are kept `retention_days`
+SESSION_SWEEP_SETTINGS = {
+    'batch_size': 1000,
+    'max_batches': 100,
+    'grace_minutes': 10,
+    'retention_days': 90,
+}
+# manager/log/manager/ validates, queues and answers 202; a background thread writes `batch_size` logs at a time.
+# A full queue answers 429 and at shutdown the queue is drained for up to `drain_timeout` seconds
+LOG_INGEST_QUEUE = {
+    'enabled': True,
+    'maxsize': 10000,
+    'batch_size': 500,
+    'interval': 0.5,
+    'drain_timeout': 10,
+}
+# export/ endpoints read `chunk_size` rows per server-side cursor fetch and write them out as one chunk
+EXPORT_SETTINGS = {
+    'chunk_size': 2000,
+}
+# PublicId -> pk lookups of serializer relations and log ingestion are cached per process: at most `maxsize`
+# entries per model, each kept `ttl` seconds. Saves and deletes drop the entry in the process that made them
+IDENTITY_CACHE = {
+    'maxsize': 50000,
+    'ttl': 300,
+}
+# Log tables are partitioned by day on Created: partitions are created `ahead_days` in advance and
+# dropped after `retention_days`, first written to a LOG_ARCHIVE_SETTINGS segment when `archive` is set
+LOG_PARTITION_SETTINGS = {
+    'ahead_days': 7,
+    'retention_days': 90,
+    'archive': False,
+}
+# Where archived log days are kept as memory-mapped column segments, read back by the log viewsets.
+# The Celery worker writes them and the web processes read them, so before turning `archive` on
+# point LOG_ARCHIVE_DIR at storage both mount
+LOG_ARCHIVE_SETTINGS = {
+    'directory': os.environ.get('LOG_ARCHIVE_DIR', str(BASE_DIR / 'logArchive')),
+}
+# Per-minute and per-hour log counts: rollup_logs stays `lag_seconds` behind now, catches up at most
+# `max_span_hours` per run, starts `backfill_days` back on its first run and keeps minute rows `minute_retention_days`
+LOG_ROLLUP_SETTINGS = {
+    'lag_seconds': 120,
+    'max_span_hours': 6,
+    'backfill_days': 7,
+    'minute_retention_days': 14,
+}
+# Write-behind LastSeen for service sessions: flushed every `interval` seconds or once `max_pending` sessions are dirty
+SESSION_HEARTBEAT = {
+    'interval': 5,
+    'max_pending': 5000,
+}
 ALLOWED_HOSTS = [
     'localhost',
     '127.0.0.1',
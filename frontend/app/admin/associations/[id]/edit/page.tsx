@@ -15,6 +15,7 @@ import { useToast } from "@/components/ui/use-toast"
 import { ArrowLeft, Building2 } from "lucide-react"
 import { Alert, AlertDescription } from "@/components/ui/alert"
 import Link from "next/link"
+import { fetchAllPages } from "@/lib/pagination"
 
 export default function AdminEditAssociationPage() {
   const params = useParams()
@@ -44,7 +45,7 @@ export default function AdminEditAssociationPage() {
 
   const fetchDepartments = async () => {
     try {
-      const response = await fetch(`${process.env.NEXT_PUBLIC_API_URL}/api/admin/department/`, {
+      const response = await fetchAllPages(`${process.env.NEXT_PUBLIC_API_URL}/api/admin/department/`, {
         headers: {
           Authorization: `Bearer ${localStorage.getItem("accessToken")}`,
         },
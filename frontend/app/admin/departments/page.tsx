@@ -17,6 +17,7 @@ import { Label } from "@/components/ui/label"
 import { Textarea } from "@/components/ui/textarea"
 import { Switch } from "@/components/ui/switch"
 import { DialogFooter } from "@/components/ui/dialog"
+import { fetchAllPages } from "@/lib/pagination"
 
 export default function AdminDepartmentsPage() {
   const { toast } = useToast()
@@ -112,7 +113,7 @@ export default function AdminDepartmentsPage() {
         const departmentsWithCounts = await Promise.all(
           data.map(async (department: any) => {
             try {
-              const associationsResponse = await fetch(
+              const associationsResponse = await fetchAllPages(
                 `${process.env.NEXT_PUBLIC_API_URL}/api/admin/association/?Department__PublicId=${department.id}`,
                 {
                   headers: {
@@ -30,6 +30,7 @@ import {
   AlertDialogHeader,
   AlertDialogTitle,
 } from "@/components/ui/alert-dialog"
+import { fetchAllPages } from "@/lib/pagination"
 
 export default function AdminPermissionsPage() {
   const { toast } = useToast()
@@ -88,7 +89,7 @@ export default function AdminPermissionsPage() {
 
   const fetchServices = async () => {
     try {
-      const response = await fetch(`${process.env.NEXT_PUBLIC_API_URL}/api/admin/service/`, {
+      const response = await fetchAllPages(`${process.env.NEXT_PUBLIC_API_URL}/api/admin/service/`, {
         headers: {
           Authorization: `Bearer ${localStorage.getItem("accessToken")}`,
         },
@@ -104,7 +105,7 @@ export default function AdminPermissionsPage() {
 
   const fetchDepartments = async () => {
     try {
-      const response = await fetch(`${process.env.NEXT_PUBLIC_API_URL}/api/admin/department/`, {
+      const response = await fetchAllPages(`${process.env.NEXT_PUBLIC_API_URL}/api/admin/department/`, {
         headers: {
           Authorization: `Bearer ${localStorage.getItem("accessToken")}`,
         },
@@ -120,7 +121,7 @@ export default function AdminPermissionsPage() {
 
   const fetchAssociations = async () => {
     try {
-      const response = await fetch(`${process.env.NEXT_PUBLIC_API_URL}/api/admin/association/`, {
+      const response = await fetchAllPages(`${process.env.NEXT_PUBLIC_API_URL}/api/admin/association/`, {
         headers: {
           Authorization: `Bearer ${localStorage.getItem("accessToken")}`,
         },
@@ -136,7 +137,7 @@ export default function AdminPermissionsPage() {
 
   const fetchCitizens = async () => {
     try {
-      const response = await fetch(`${process.env.NEXT_PUBLIC_API_URL}/api/admin/citizen/`, {
+      const response = await fetchAllPages(`${process.env.NEXT_PUBLIC_API_URL}/api/admin/citizen/`, {
         headers: {
           Authorization: `Bearer ${localStorage.getItem("accessToken")}`,
         },
@@ -259,7 +260,7 @@ export default function AdminPermissionsPage() {
     setIsLoading(true)
     try {
       // Fetch department permissions
-      const departmentResponse = await fetch(`${process.env.NEXT_PUBLIC_API_URL}/api/admin/permission/department/`, {
+      const departmentResponse = await fetchAllPages(`${process.env.NEXT_PUBLIC_API_URL}/api/admin/permission/department/`, {
         headers: {
           Authorization: `Bearer ${localStorage.getItem("accessToken")}`,
         },
@@ -270,7 +271,7 @@ export default function AdminPermissionsPage() {
       }
 
       // Fetch association permissions
-      const associationResponse = await fetch(`${process.env.NEXT_PUBLIC_API_URL}/api/admin/permission/association/`, {
+      const associationResponse = await fetchAllPages(`${process.env.NEXT_PUBLIC_API_URL}/api/admin/permission/association/`, {
         headers: {
           Authorization: `Bearer ${localStorage.getItem("accessToken")}`,
         },
@@ -281,7 +282,7 @@ export default function AdminPermissionsPage() {
       }
 
       // Fetch service permissions
-      const serviceResponse = await fetch(`${process.env.NEXT_PUBLIC_API_URL}/api/admin/permission/service/`, {
+      const serviceResponse = await fetchAllPages(`${process.env.NEXT_PUBLIC_API_URL}/api/admin/permission/service/`, {
         headers: {
           Authorization: `Bearer ${localStorage.getItem("accessToken")}`,
         },
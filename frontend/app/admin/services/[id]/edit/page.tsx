@@ -16,6 +16,7 @@ import { Alert, AlertDescription } from "@/components/ui/alert"
 import Link from "next/link"
 import { Select, SelectContent, SelectItem, SelectTrigger, SelectValue } from "@/components/ui/select"
 import { Switch } from "@/components/ui/switch"
+import { fetchAllPages } from "@/lib/pagination"
 
 export default function AdminEditServicePage() {
   const params = useParams()
@@ -90,7 +91,7 @@ export default function AdminEditServicePage() {
 
   const fetchAssociations = async () => {
     try {
-      const response = await fetch(`${process.env.NEXT_PUBLIC_API_URL}/api/admin/association/`, {
+      const response = await fetchAllPages(`${process.env.NEXT_PUBLIC_API_URL}/api/admin/association/`, {
         headers: {
           Authorization: `Bearer ${localStorage.getItem("accessToken")}`,
         },
@@ -114,7 +115,7 @@ export default function AdminEditServicePage() {
 
   const fetchGrantees = async () => {
     try {
-      const response = await fetch(`${process.env.NEXT_PUBLIC_API_URL}/api/admin/grantee/`, {
+      const response = await fetchAllPages(`${process.env.NEXT_PUBLIC_API_URL}/api/admin/grantee/`, {
         headers: {
           Authorization: `Bearer ${localStorage.getItem("accessToken")}`,
         },
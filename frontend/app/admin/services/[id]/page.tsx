@@ -12,6 +12,7 @@ import Link from "next/link"
 import { Tabs, TabsContent, TabsList, TabsTrigger } from "@/components/ui/tabs"
 import { Table, TableBody, TableCell, TableHead, TableHeader, TableRow } from "@/components/ui/table"
 import { Badge } from "@/components/ui/badge"
+import { fetchAllPages } from "@/lib/pagination"
 
 export default function AdminServiceDetailPage() {
   const params = useParams()
@@ -67,7 +68,7 @@ export default function AdminServiceDetailPage() {
   const fetchServiceRequests = async () => {
     try {
       // Use the proper filtering format with double underscores for related fields
-      const response = await fetch(
+      const response = await fetchAllPages(
         `${process.env.NEXT_PUBLIC_API_URL}/api/admin/request/?PublicService__PublicId=${serviceId}`,
         {
           headers: {
@@ -95,7 +96,7 @@ export default function AdminServiceDetailPage() {
   const fetchServiceGrants = async () => {
     try {
       // Use the proper filtering format with double underscores for related fields
-      const response = await fetch(
+      const response = await fetchAllPages(
         `${process.env.NEXT_PUBLIC_API_URL}/api/admin/grant/?Request__PublicService__PublicId=${serviceId}`,
         {
           headers: {
@@ -7,6 +7,7 @@ import { Input } from "@/components/ui/input"
 import { useToast } from "@/components/ui/use-toast"
 import { Building, Search, Mail, Globe } from "lucide-react"
 import { Table, TableBody, TableCell, TableHead, TableHeader, TableRow } from "@/components/ui/table"
+import { fetchAllPages } from "@/lib/pagination"
 
 export default function CitizenAssociationsPage() {
   const { toast } = useToast()
@@ -37,7 +38,7 @@ export default function CitizenAssociationsPage() {
   const fetchAssociations = async () => {
     setIsLoading(true)
     try {
-      const response = await fetch(`${process.env.NEXT_PUBLIC_API_URL}/api/association/`, {
+      const response = await fetchAllPages(`${process.env.NEXT_PUBLIC_API_URL}/api/association/`, {
         headers: {
           Authorization: `Bearer ${localStorage.getItem("accessToken")}`,
         },
@@ -16,6 +16,7 @@ import { Alert, AlertDescription } from "@/components/ui/alert"
 import Link from "next/link"
 import { ScrollArea } from "@/components/ui/scroll-area"
 import { Checkbox } from "@/components/ui/checkbox"
+import { fetchAllPages } from "@/lib/pagination"
 
 export default function EditPermissionPage() {
   const params = useParams()
@@ -59,7 +60,7 @@ export default function EditPermissionPage() {
 
   const fetchCitizens = async () => {
     try {
-      const response = await fetch(`${process.env.NEXT_PUBLIC_API_URL}/api/grantee/citizen/`, {
+      const response = await fetchAllPages(`${process.env.NEXT_PUBLIC_API_URL}/api/grantee/citizen/`, {
         headers: {
           Authorization: `Bearer ${localStorage.getItem("accessToken")}`,
         },
@@ -27,6 +27,7 @@ import * as z from "zod"
 import { Select, SelectContent, SelectItem, SelectTrigger, SelectValue } from "@/components/ui/select"
 import { Checkbox } from "@/components/ui/checkbox"
 import { directApi } from "@/lib/api-direct"
+import { fetchAllPages } from "@/lib/pagination"
 
 const createPermissionSchema = z.object({
   Name: z.string().min(1, "Permission name is required").max(100, "Name must be 100 characters or less"),
@@ -96,7 +97,7 @@ export default function GranteePermissionsPage() {
   const fetchPermissions = async () => {
     setIsLoading(true)
     try {
-      const response = await fetch(`${process.env.NEXT_PUBLIC_API_URL}/api/grantee/permission/service/`, {
+      const response = await fetchAllPages(`${process.env.NEXT_PUBLIC_API_URL}/api/grantee/permission/service/`, {
         headers: {
           Authorization: `Bearer ${localStorage.getItem("accessToken")}`,
         },
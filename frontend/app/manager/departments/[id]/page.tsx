@@ -26,6 +26,7 @@ import Link from "next/link"
 import { Tabs, TabsContent, TabsList, TabsTrigger } from "@/components/ui/tabs"
 import { Table, TableBody, TableCell, TableHead, TableHeader, TableRow } from "@/components/ui/table"
 import { Badge } from "@/components/ui/badge"
+import { fetchAllPages } from "@/lib/pagination"
 
 export default function DepartmentDetailPage() {
   const params = useParams()
@@ -65,7 +66,7 @@ export default function DepartmentDetailPage() {
       setDepartment(data)
 
       // Fetch associations for this department
-      const associationsResponse = await fetch(
+      const associationsResponse = await fetchAllPages(
         `${process.env.NEXT_PUBLIC_API_URL}/api/manager/association/?Department__PublicId=${departmentId}`,
         {
           headers: {
@@ -81,7 +82,7 @@ export default function DepartmentDetailPage() {
         const associationsWithServiceCounts = await Promise.all(
           associationsData.map(async (association: any) => {
             try {
-              const servicesResponse = await fetch(
+              const servicesResponse = await fetchAllPages(
                 `${process.env.NEXT_PUBLIC_API_URL}/api/manager/service/?Association__PublicId=${association.id}`,
                 {
                   headers: {
@@ -118,7 +119,7 @@ export default function DepartmentDetailPage() {
       }
 
       // Fetch administrators for this department
-      const adminsResponse = await fetch(
+      const adminsResponse = await fetchAllPages(
         `${process.env.NEXT_PUBLIC_API_URL}/api/manager/administrator/?department__PublicId=${departmentId}`,
         {
           headers: {
@@ -136,7 +137,7 @@ export default function DepartmentDetailPage() {
       }
 
       // Fetch permissions for this department
-      const permissionsResponse = await fetch(
+      const permissionsResponse = await fetchAllPages(
         `${process.env.NEXT_PUBLIC_API_URL}/api/manager/permission/department/?Department__PublicId=${departmentId}`,
         {
           headers: {
@@ -168,7 +169,7 @@ export default function DepartmentDetailPage() {
     if (tab === "associations" && (!department?.associations || department.associations.length === 0)) {
       setIsAssociationsLoading(true)
       try {
-        const response = await fetch(
+        const response = await fetchAllPages(
           `${process.env.NEXT_PUBLIC_API_URL}/api/manager/association/?Department__PublicId=${departmentId}`,
           {
             headers: {
@@ -184,7 +185,7 @@ export default function DepartmentDetailPage() {
           const associationsWithServiceCounts = await Promise.all(
             associationsData.map(async (association: any) => {
               try {
-                const servicesResponse = await fetch(
+                const servicesResponse = await fetchAllPages(
                   `${process.env.NEXT_PUBLIC_API_URL}/api/manager/service/?Association__PublicId=${association.id}`,
                   {
                     headers: {
@@ -229,7 +230,7 @@ export default function DepartmentDetailPage() {
     if (tab === "administrators" && (!department?.administrators || department.administrators.length === 0)) {
       setIsAdministratorsLoading(true)
       try {
-        const response = await fetch(
+        const response = await fetchAllPages(
           `${process.env.NEXT_PUBLIC_API_URL}/api/manager/administrator/?department__PublicId=${departmentId}`,
           {
             headers: {
@@ -255,7 +256,7 @@ export default function DepartmentDetailPage() {
     if (tab === "permissions" && (!department?.permissions || department.permissions.length === 0)) {
       setIsPermissionsLoading(true)
       try {
-        const response = await fetch(
+        const response = await fetchAllPages(
           `${process.env.NEXT_PUBLIC_API_URL}/api/manager/permission/department/?Department__PublicId=${departmentId}`,
           {
             headers: {
@@ -282,7 +283,7 @@ export default function DepartmentDetailPage() {
       setIsServicesLoading(true)
       try {
         // First get all associations for this department
-        const associationsResponse = await fetch(
+        const associationsResponse = await fetchAllPages(
           `${process.env.NEXT_PUBLIC_API_URL}/api/manager/association/?Department__PublicId=${departmentId}`,
           {
             headers: {
@@ -298,7 +299,7 @@ export default function DepartmentDetailPage() {
           if (associationsData && associationsData.length > 0) {
             const associationIds = associationsData.map((assoc) => assoc.id).join(",")
 
-            const servicesResponse = await fetch(
+            const servicesResponse = await fetchAllPages(
               `${process.env.NEXT_PUBLIC_API_URL}/api/manager/service/?Association__PublicId__in=[${associationIds}]`,
               {
                 headers: {
@@ -25,6 +25,7 @@ import { Label } from "@/components/ui/label"
 import { Textarea } from "@/components/ui/textarea"
 import { Switch } from "@/components/ui/switch"
 import { Select, SelectContent, SelectItem, SelectTrigger, SelectValue } from "@/components/ui/select"
+import { fetchAllPages } from "@/lib/pagination"
 
 export default function ManagerDepartmentsPage() {
   const { toast } = useToast()
@@ -78,7 +79,7 @@ export default function ManagerDepartmentsPage() {
         const departmentsWithCounts = await Promise.all(
           data.map(async (department: any) => {
             try {
-              const associationsResponse = await fetch(
+              const associationsResponse = await fetchAllPages(
                 `${process.env.NEXT_PUBLIC_API_URL}/api/manager/association/?Department__PublicId=${department.id}`,
                 {
                   headers: {
@@ -1,6 +1,8 @@
 // Direct API client that doesn't use hooks
 // This can be safely used in any context, including nested functions
 
+import { fetchAllPages, withAllPages } from "./pagination"
+
 const API_BASE_URL = process.env.NEXT_PUBLIC_API_URL || "http://localhost:8000"
 
 // Helper function to check if response is HTML
@@ -48,10 +50,12 @@ export const fetchWithAuth = async (endpoint: string, options: RequestInit = {})
   try {
     console.log(`Making API request to: ${url}`)
 
-    const response = await fetch(url, {
-      ...options,
-      headers,
-    })
+    const request = { ...options, headers }
+    // List endpoints are paginated: a read follows every rel="next" page and answers with all rows
+    const response =
+      !options.method || options.method === "GET"
+        ? await withAllPages(await fetch(url, request), (next) => fetch(next, request))
+        : await fetch(url, request)
 
     if (options.method === "POST") {
       console.log(`POST Response from ${url}:`, response)
@@ -415,7 +419,7 @@ export const directApi = {
       },
     },
     getAssociations: async () => {
-      return await fetch(`${process.env.NEXT_PUBLIC_API_URL}/api/manager/association/`, {
+      return await fetchAllPages(`${process.env.NEXT_PUBLIC_API_URL}/api/manager/association/`, {
         method: "GET",
         headers: {
           "Content-Type": "application/json",
@@ -694,7 +698,7 @@ export const directApi = {
             .join("&")
         : ""
 
-      return await fetch(`${process.env.NEXT_PUBLIC_API_URL}/api/admin/service/${queryParams}`, {
+      return await fetchAllPages(`${process.env.NEXT_PUBLIC_API_URL}/api/admin/service/${queryParams}`, {
         method: "GET",
         headers: {
           Authorization: `Bearer ${getToken()}`,
@@ -710,7 +714,7 @@ export const directApi = {
             .join("&")
         : ""
 
-      return await fetch(`${process.env.NEXT_PUBLIC_API_URL}/api/admin/grantee/${queryParams}`, {
+      return await fetchAllPages(`${process.env.NEXT_PUBLIC_API_URL}/api/admin/grantee/${queryParams}`, {
         method: "GET",
         headers: {
           Authorization: `Bearer ${getToken()}`,
@@ -726,7 +730,7 @@ export const directApi = {
             .join("&")
         : ""
 
-      return await fetch(`${process.env.NEXT_PUBLIC_API_URL}/api/admin/association/${queryParams}`, {
+      return await fetchAllPages(`${process.env.NEXT_PUBLIC_API_URL}/api/admin/association/${queryParams}`, {
         method: "GET",
         headers: {
           Authorization: `Bearer ${getToken()}`,
@@ -736,7 +740,7 @@ export const directApi = {
     // Get services and associations related to a grantee
     getGranteeServices: async (id: string) => {
       // This uses the proper filtering format for related models
-      return await fetch(`${process.env.NEXT_PUBLIC_API_URL}/api/admin/service/?Grantee__PublicId=${id}`, {
+      return await fetchAllPages(`${process.env.NEXT_PUBLIC_API_URL}/api/admin/service/?Grantee__PublicId=${id}`, {
         method: "GET",
         headers: {
           Authorization: `Bearer ${getToken()}`,
@@ -745,7 +749,7 @@ export const directApi = {
     },
     getGranteeAssociations: async (id: string) => {
       // Use the proper filter format to get associations where this grantee is a member
-      return await fetch(`${process.env.NEXT_PUBLIC_API_URL}/api/admin/association/?grantee__PublicId=${id}`, {
+      return await fetchAllPages(`${process.env.NEXT_PUBLIC_API_URL}/api/admin/association/?grantee__PublicId=${id}`, {
         method: "GET",
         headers: {
           Authorization: `Bearer ${getToken()}`,
@@ -1,6 +1,7 @@
 "use client"
 
 import { useAuth } from "./auth-context"
+import { withAllPages } from "./pagination"
 
 // Base API URL - ensure it doesn't end with /api
 const API_BASE_URL = process.env.NEXT_PUBLIC_API_URL || "http://localhost:8000"
@@ -11,7 +12,16 @@ const isHtmlResponse = (text: string) => {
 }
 
 // Helper function to retry a fetch operation
-const retryFetch = async (url: string, options: RequestInit, maxRetries = 3, delay = 1000) => {
+const retryFetch = async (url: string, options: RequestInit, maxRetries = 3, delay = 1000): Promise<Response> => {
+  // List endpoints are paginated: a read follows every rel="next" page and answers with all rows
+  if (!options.method || options.method === "GET") {
+    return withAllPages(await retryPage(url, options, maxRetries, delay), (next) => retryPage(next, options, maxRetries, delay))
+  }
+  return retryPage(url, options, maxRetries, delay)
+}
+
+// Helper function to retry a single fetch
+const retryPage = async (url: string, options: RequestInit, maxRetries = 3, delay = 1000) => {
   let lastError
 
   for (let attempt = 0; attempt < maxRetries; attempt++) {
@@ -0,0 +1,52 @@
+// List endpoints answer one page as a JSON array and point at the next page in a
+// `Link: <url>; rel="next"` header. These helpers follow that header to the last page.
+
+// The rel="next" URL of a paginated response, if there is one
+export const nextPageUrl = (response: Response): string | null => {
+  const link = response.headers.get("Link")
+  if (!link) return null
+  for (const part of link.split(",")) {
+    const match = part.match(/<([^>]+)>\s*;\s*rel="?next"?/)
+    if (match) return match[1]
+  }
+  return null
+}
+
+// Read every page after `response` and answer with a single response holding all the rows,
+// so callers keep reading a plain array. Anything that is not a paginated array passes through,
+// and a failing page is returned as is rather than a silently shortened list.
+export const withAllPages = async (
+  response: Response,
+  fetchPage: (url: string) => Promise<Response>,
+): Promise<Response> => {
+  let next = nextPageUrl(response)
+  if (!response.ok || !next) return response
+
+  const rows = await response
+    .clone()
+    .json()
+    .catch(() => null)
+  if (!Array.isArray(rows)) return response
+
+  while (next) {
+    const page = await fetchPage(next)
+    if (!page.ok) return page
+    const pageRows = await page.json()
+    if (!Array.isArray(pageRows)) break
+    rows.push(...pageRows)
+    next = nextPageUrl(page)
+  }
+
+  const headers = new Headers(response.headers)
+  headers.delete("Link")
+  headers.delete("Content-Length")
+  return new Response(JSON.stringify(rows), {
+    status: response.status,
+    statusText: response.statusText,
+    headers,
+  })
+}
+
+// fetch() for list endpoints: the same request repeated for every page
+export const fetchAllPages = async (url: string, options: RequestInit = {}) =>
+  withAllPages(await fetch(url, options), (next) => fetch(next, options))